@@ -3,5 +3,10 @@
 set -e
 trap "kill 0" SIGINT SIGTERM
 
+# Discard metrics recorded by processes from a previous container run
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"/*
+fi
+
 nginx &
 exec keystone-api "$@"
@@ -97,7 +97,7 @@ class Command(BaseCommand):
         """Start a Celery worker."""
 
         subprocess.Popen(['redis-server'])
-        subprocess.Popen(['celery', '-A', 'keystone_api.apps.scheduler', 'worker'])
+        subprocess.Popen(['celery', '-A', 'keystone_api.apps.scheduler', 'worker', '-Q', 'celery,email'])
         subprocess.Popen(['celery', '-A', 'keystone_api.apps.scheduler', 'beat',
                           '--scheduler', 'django_celery_beat.schedulers:DatabaseScheduler'])
 
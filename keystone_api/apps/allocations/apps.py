@@ -0,0 +1,20 @@
+"""Application level configuration and setup.
+
+Application configuration objects are used to override Django's default
+application setup.
+"""
+
+from django.apps import AppConfig
+
+__all__ = ['AllocationsAppConfig']
+
+
+class AllocationsAppConfig(AppConfig):
+    """General application configuration and metadata."""
+
+    name = 'apps.allocations'
+
+    def ready(self) -> None:
+        """Connect application specific signal handlers."""
+
+        from . import signals
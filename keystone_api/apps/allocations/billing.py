@@ -0,0 +1,45 @@
+"""Conversion of raw TRES usage into service units.
+
+Service units are calculated by weighting the usage of each trackable resource
+(TRES) using the weights configured on the corresponding `Cluster` record.
+Conversions operate on NumPy arrays so that thousands of usage records can be
+converted in a single vectorized operation.
+"""
+
+import numpy as np
+
+from apps.allocations.models import Cluster
+
+__all__ = ['TRES_NAMES', 'cluster_weights', 'to_service_units']
+
+# Order of TRES columns in all usage and weight arrays
+TRES_NAMES = ('cpu', 'mem', 'gres/gpu')
+
+
+def cluster_weights(cluster: Cluster) -> np.ndarray:
+    """Return the TRES weights for a cluster as an array of service units per TRES second.
+
+    Memory weights are configured per GB and converted to a weight per MB.
+
+    Args:
+        cluster: The cluster to return weights for.
+
+    Returns:
+        A one-dimensional array of weights ordered according to `TRES_NAMES`.
+    """
+
+    return np.array([cluster.cpu_weight, cluster.mem_weight / 1024, cluster.gpu_weight], dtype=np.float64) / 3600
+
+
+def to_service_units(tres_seconds: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Convert raw TRES usage into service units.
+
+    Args:
+        tres_seconds: A two-dimensional array of TRES usage with one row per record and columns ordered by `TRES_NAMES`.
+        weights: Weights returned by `cluster_weights`, either as a single row applied to all records or one row per record.
+
+    Returns:
+        A one-dimensional array of service units for each record.
+    """
+
+    return (np.atleast_2d(tres_seconds) * weights).sum(axis=1)
@@ -0,0 +1,119 @@
+"""Forecasting of service unit burn rates and allocation exhaustion dates.
+
+Burn rates are estimated by fitting a least squares line to the total usage
+recorded in each account's usage snapshots. Regressions for every
+(team, cluster) series are evaluated simultaneously using grouped NumPy
+reductions instead of fitting each series individually.
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from django.utils import timezone
+
+from apps.allocations.models import UsageSnapshot
+
+__all__ = ['fit_burn_rates', 'forecast_exhaustion', 'project_exhaustion']
+
+SECONDS_PER_DAY = 86_400
+
+# Forecasts further into the future than this are treated as "never"
+MAX_HORIZON_DAYS = 3650
+
+
+def fit_burn_rates(series: np.ndarray, times: np.ndarray, usage: np.ndarray, num_series: int) -> np.ndarray:
+    """Fit a linear burn rate to each of several usage series in a single pass.
+
+    Args:
+        series: Integer index of the series each observation belongs to.
+        times: Observation times in days.
+        usage: Observed total usage values.
+        num_series: The total number of series.
+
+    Returns:
+        The fitted slope of each series in usage per day, or `nan` for series with fewer than two distinct times.
+    """
+
+    # Center times on each series' mean to avoid precision loss for large timestamps
+    n = np.bincount(series, minlength=num_series).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_t = np.bincount(series, weights=times, minlength=num_series) / n
+        mean_u = np.bincount(series, weights=usage, minlength=num_series) / n
+
+    dt = times - mean_t[series]
+    du = usage - mean_u[series]
+    sxx = np.bincount(series, weights=dt * dt, minlength=num_series)
+    sxy = np.bincount(series, weights=dt * du, minlength=num_series)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(sxx > 0, sxy / sxx, np.nan)
+
+
+def project_exhaustion(remaining: np.ndarray, rates: np.ndarray) -> np.ndarray:
+    """Project the number of days until each account exhausts its remaining service units.
+
+    Args:
+        remaining: Remaining service units for each account.
+        rates: Burn rates for each account in service units per day.
+
+    Returns:
+        Days until exhaustion, with `nan` for accounts that are not projected to run out.
+    """
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        days = np.where(remaining <= 0, 0.0, remaining / rates)
+
+    # Accounts that are not consuming service units never run out
+    days[(remaining > 0) & ~(rates > 0)] = np.nan
+    days[days > MAX_HORIZON_DAYS] = np.nan
+    return days
+
+
+def forecast_exhaustion(since: datetime) -> dict[tuple[int, int], date | None]:
+    """Forecast the date on which each account will exhaust its service units.
+
+    Burn rates are fit to snapshots recorded on or after the given time.
+    Remaining service units are calculated from each account's most recent snapshot.
+
+    Args:
+        since: Only fit burn rates using snapshots recorded on or after this time.
+
+    Returns:
+        A dictionary mapping `(team ID, cluster ID)` tuples to the projected exhaustion date, or `None`.
+    """
+
+    rows = list(
+        UsageSnapshot.objects.filter(recorded__gte=since)
+        .order_by('recorded', 'id')
+        .values_list('team_id', 'cluster_id', 'recorded', 'total_usage', 'limit')
+    )
+
+    if not rows:
+        return dict()
+
+    keys = np.array([(team_id, cluster_id) for team_id, cluster_id, *_ in rows], dtype=np.int64)
+    times = np.array([row[2].timestamp() for row in rows], dtype=np.float64) / SECONDS_PER_DAY
+    values = np.array([row[3:] for row in rows], dtype=np.float64)
+
+    unique_keys, series = np.unique(keys, axis=0, return_inverse=True)
+    series = series.reshape(-1)
+    num_series = len(unique_keys)
+
+    # Rows are ordered by time, so the largest row index in each series is its latest snapshot
+    latest = np.zeros(num_series, dtype=np.int64)
+    np.maximum.at(latest, series, np.arange(len(rows)))
+
+    rates = fit_burn_rates(series, times, values[:, 0], num_series)
+    remaining = values[latest, 1] - values[latest, 0]
+    days = project_exhaustion(remaining, rates)
+
+    forecasts = dict()
+    for (team_id, cluster_id), index, days_left in zip(unique_keys.tolist(), latest.tolist(), days.tolist()):
+        if np.isnan(days_left):
+            forecasts[(team_id, cluster_id)] = None
+
+        else:
+            recorded = timezone.localtime(rows[index][2])
+            forecasts[(team_id, cluster_id)] = (recorded + timedelta(days=days_left)).date()
+
+    return forecasts
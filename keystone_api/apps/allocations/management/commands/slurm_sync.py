@@ -0,0 +1,41 @@
+"""A Django management command for synchronizing teams against Slurm accounts.
+
+New teams are created for Slurm accounts as necessary and team memberships are
+updated to reflect the user associations of each account.
+"""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from apps.allocations.tasks import sync_slurm_accounts
+
+
+class Command(BaseCommand):
+    """Create/update teams and team memberships to reflect Slurm accounts."""
+
+    help = 'Create/update teams and team memberships to reflect Slurm accounts.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add command-line arguments to the parser.
+
+        Args:
+          parser: The argument parser instance
+        """
+
+        parser.add_argument('--prune', action='store_true', help='Remove team members no longer associated with the Slurm account.')
+
+    def handle(self, *args, **options) -> None:
+        """Handle the command execution."""
+
+        try:
+            results = sync_slurm_accounts(prune=options['prune'])
+
+        except KeyboardInterrupt:
+            return
+
+        self.stdout.write(
+            f"Created {results['teams_created']} team(s). "
+            f"Created {results['memberships_created']}, updated {results['memberships_updated']}, "
+            f"and deleted {results['memberships_deleted']} membership(s)."
+        )
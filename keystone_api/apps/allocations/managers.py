@@ -6,17 +6,20 @@ every database model. Managers are commonly exposed as an attribute of the
 associated model class called `objects`.
 """
 
-from datetime import date
-from typing import TYPE_CHECKING
+from datetime import date, datetime, timedelta
+from typing import Iterable, TYPE_CHECKING
 
-from django.db.models import Manager, QuerySet, Sum
+from django.apps import apps
+from django.db.models import Manager, Max, Q, QuerySet, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
 
 from apps.users.models import Team
 
 if TYPE_CHECKING:  # pragma: nocover
     from apps.allocations.models import Cluster
 
-__all__ = ['AllocationManager']
+__all__ = ['AllocationManager', 'DailyUsageManager', 'DirtyAccountManager', 'UsageSnapshotManager']
 
 
 class AllocationManager(Manager):
@@ -74,6 +77,23 @@ class AllocationManager(Manager):
             final=None, request__expire__lte=date.today()
         ).order_by("request__expire")
 
+    def cluster_expiring_allocations(self, cluster: 'Cluster') -> QuerySet:
+        """Retrieve all expiring allocations for every account on a specific cluster.
+
+         Expiring allocations have been approved and have passed their expiration date
+         but do not yet have a final usage value set.
+
+        Args:
+            cluster: object representing the cluster.
+
+        Returns:
+            A queryset of expired Allocation objects ordered by expiration date.
+        """
+
+        return self.filter(
+            cluster=cluster, request__status='AP', final=None, request__expire__lte=date.today()
+        ).order_by("request__expire")
+
     def active_service_units(self, account: Team, cluster: 'Cluster') -> int:
         """Calculate the total service units across all active allocations for an account and cluster.
 
@@ -123,3 +143,196 @@ class AllocationManager(Manager):
         return self.approved_allocations(account, cluster).filter(
             request__expire__lte=date.today()
         ).aggregate(Sum("final"))['final__sum'] or 0
+
+    def service_unit_ledger(self, cluster: 'Cluster', accounts: Iterable[Team] | None = None) -> dict[int, dict[str, int]]:
+        """Calculate active, expiring, and historical service units for every account on a cluster.
+
+        All values are calculated in a single grouped query using conditional aggregation.
+        Values are equivalent to those returned by the `active_service_units`,
+        `expiring_service_units`, and `historical_usage` methods.
+
+        Args:
+            cluster: object representing the cluster.
+            accounts: Optionally limit the calculation to the given accounts.
+
+        Returns:
+            A dictionary mapping team IDs to their `active`, `expiring`, and `historical` service units.
+        """
+
+        today = date.today()
+        queryset = self.filter(cluster=cluster, request__status='AP')
+        if accounts is not None:
+            queryset = queryset.filter(request__team__in=accounts)
+
+        records = queryset.values('request__team').annotate(
+            active=Sum('awarded', filter=Q(request__active__lte=today, request__expire__gt=today), default=0),
+            expiring=Sum('awarded', filter=Q(final=None, request__expire__lte=today), default=0),
+            historical=Sum('final', filter=Q(request__expire__lte=today), default=0),
+        ).order_by()
+
+        return {
+            record['request__team']: {
+                'active': record['active'],
+                'expiring': record['expiring'],
+                'historical': record['historical'],
+            } for record in records
+        }
+
+    def rollover_accounts(self, since: date) -> set[tuple[int, int]]:
+        """Return accounts with approved allocations that started or expired since the given date.
+
+        Accounts with expired allocations that have not yet been closed out are always included.
+
+        Args:
+            since: Include allocations with an activation or expiration date on or after this date.
+
+        Returns:
+            A set of `(team ID, cluster ID)` tuples.
+        """
+
+        today = date.today()
+        queryset = self.filter(request__status='AP').filter(
+            Q(final=None, request__expire__lte=today) |
+            Q(request__active__gte=since, request__active__lte=today) |
+            Q(request__expire__gte=since, request__expire__lte=today)
+        ).values_list('request__team', 'cluster').distinct()
+
+        return set(queryset)
+
+
+class DailyUsageManager(Manager):
+    """Custom manager for the `DailyUsage` model.
+
+    Provides query methods for summarizing per-user resource usage.
+    """
+
+    def user_totals(
+        self,
+        account: Team,
+        cluster: 'Cluster | None' = None,
+        start: date | None = None,
+        end: date | None = None,
+        service_units: bool = False
+    ) -> dict[str, int | float]:
+        """Return the total usage of each user in a Slurm account.
+
+        Args:
+            account: The account to summarize usage for.
+            cluster: Optionally only include usage on the given cluster.
+            start: Optionally only include usage on or after the given date.
+            end: Optionally only include usage on or before the given date.
+            service_units: Total usage in weighted service units instead of TRES billing seconds.
+
+        Returns:
+            A dictionary mapping usernames to total usage, ordered from highest to lowest usage.
+        """
+
+        query = self.filter(team=account)
+        if cluster is not None:
+            query = query.filter(cluster=cluster)
+
+        if start is not None:
+            query = query.filter(date__gte=start)
+
+        if end is not None:
+            query = query.filter(date__lte=end)
+
+        totals = query.values('username').annotate(total=Sum('service_units' if service_units else 'billing_seconds')).order_by('-total', 'username')
+        return {row['username']: row['total'] for row in totals}
+
+
+class DirtyAccountManager(Manager):
+    """Custom manager for the `DirtyAccount` model.
+
+    Provides methods for recording and retrieving Slurm accounts with pending limit updates.
+    """
+
+    def mark(self, accounts: Iterable[tuple[int, int]]) -> None:
+        """Flag the given accounts as requiring a limits update.
+
+        Accounts referencing teams or clusters that no longer exist are ignored.
+        Accounts that are already flagged have their timestamp refreshed.
+
+        Args:
+            accounts: An iterable of `(team ID, cluster ID)` tuples.
+        """
+
+        accounts = set(accounts)
+        team_ids = set(Team.objects.filter(pk__in={t for t, _ in accounts}).values_list('pk', flat=True))
+        cluster_ids = set(
+            apps.get_model('allocations', 'Cluster').objects
+            .filter(pk__in={c for _, c in accounts})
+            .values_list('pk', flat=True)
+        )
+
+        now = timezone.now()
+        self.bulk_create(
+            [
+                self.model(team_id=team_id, cluster_id=cluster_id, marked=now)
+                for team_id, cluster_id in accounts if team_id in team_ids and cluster_id in cluster_ids
+            ],
+            update_conflicts=True,
+            unique_fields=['team', 'cluster'],
+            update_fields=['marked']
+        )
+
+    def pending(self, rollover_days: int = 1) -> dict[int, set[int]]:
+        """Return all accounts requiring a limits update grouped by cluster.
+
+        Includes accounts flagged as dirty and accounts with allocations that
+        started or expired within the given number of days.
+
+        Args:
+            rollover_days: How many days to look back for allocation start/end dates.
+
+        Returns:
+            A dictionary mapping cluster IDs to a set of team IDs.
+        """
+
+        since = date.today() - timedelta(days=rollover_days)
+        accounts = set(self.values_list('team', 'cluster'))
+        accounts |= apps.get_model('allocations', 'Allocation').objects.rollover_accounts(since)
+
+        pending = dict()
+        for team_id, cluster_id in accounts:
+            pending.setdefault(cluster_id, set()).add(team_id)
+
+        return pending
+
+
+class UsageSnapshotManager(Manager):
+    """Custom manager for the `UsageSnapshot` model.
+
+    Provides methods for downsampling historical usage snapshots.
+    """
+
+    def rollup(self, resolution: str, before: datetime) -> int:
+        """Downsample snapshots recorded before the given time to an hourly or daily resolution.
+
+        Within each team, cluster, and interval, only the most recently created snapshot is retained.
+        Snapshots already stored at a coarser resolution are left unchanged.
+
+        Args:
+            resolution: The target resolution (`HR` for hourly or `DY` for daily).
+            before: Only downsample snapshots recorded before this time.
+
+        Returns:
+            The number of deleted snapshots.
+        """
+
+        choices = self.model.ResolutionChoices
+        truncate = {choices.HOURLY: TruncHour, choices.DAILY: TruncDay}[resolution]
+        resolutions = {choices.HOURLY: [choices.RAW, choices.HOURLY], choices.DAILY: [choices.RAW, choices.HOURLY, choices.DAILY]}
+
+        candidates = self.filter(recorded__lt=before, resolution__in=resolutions[resolution])
+        latest = (
+            candidates.annotate(interval=truncate('recorded'))
+            .values('team', 'cluster', 'interval')
+            .annotate(latest=Max('id'))
+            .values('latest')
+            .order_by()
+        )
+
+        deleted, _ = candidates.exclude(pk__in=latest).delete()
+        candidates.exclude(resolution=resolution).update(resolution=resolution)
+        return deleted
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocations', '0011_rename_allocationrequestreview_allocationreview'),
+        ('users', '0009_team_teammembership_team_users_delete_researchgroup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marked', models.DateTimeField()),
+                ('cluster', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='allocations.cluster')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.team')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('team', 'cluster'), name='unique_dirty_team_cluster')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:30
+
+import apps.allocations.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocations', '0012_dirtyaccount'),
+        ('users', '0009_team_teammembership_team_users_delete_researchgroup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_ingested', models.DateTimeField()),
+                ('cluster', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='allocations.cluster')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('username', models.CharField(max_length=150)),
+                ('jobs', models.PositiveIntegerField(default=0)),
+                ('billing_seconds', models.PositiveBigIntegerField(default=0)),
+                ('cluster', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='allocations.cluster')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.team')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'username', 'team', 'cluster'), name='unique_daily_usage')],
+            },
+            bases=(apps.allocations.models.TeamModelInterface, models.Model),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocations', '0013_dailyusage_usagecursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cluster',
+            name='cpu_weight',
+            field=models.FloatField(default=1.0),
+        ),
+        migrations.AddField(
+            model_name='cluster',
+            name='gpu_weight',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='cluster',
+            name='mem_weight',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='dailyusage',
+            name='cpu_seconds',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dailyusage',
+            name='gpu_seconds',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dailyusage',
+            name='mem_seconds',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:35
+
+import apps.allocations.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocations', '0014_tres_weights'),
+        ('users', '0009_team_teammembership_team_users_delete_researchgroup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recorded', models.DateTimeField(default=django.utils.timezone.now)),
+                ('resolution', models.CharField(choices=[('RW', 'Raw'), ('HR', 'Hourly'), ('DY', 'Daily')], default='RW', max_length=2)),
+                ('total_usage', models.PositiveIntegerField()),
+                ('current_usage', models.PositiveIntegerField()),
+                ('historical_usage', models.PositiveIntegerField()),
+                ('limit', models.PositiveIntegerField()),
+                ('cluster', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='allocations.cluster')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='users.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', 'cluster', 'recorded'], name='allocations_team_id_3661c2_idx')],
+            },
+            bases=(apps.allocations.models.TeamModelInterface, models.Model),
+        ),
+    ]
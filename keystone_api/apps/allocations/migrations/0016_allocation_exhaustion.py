@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocations', '0015_usagesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='allocation',
+            name='exhaustion',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocations', '0016_allocation_exhaustion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyusage',
+            name='service_units',
+            field=models.FloatField(default=0),
+        ),
+    ]
@@ -13,9 +13,10 @@ from datetime import date
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.template.defaultfilters import truncatechars
 
-from apps.allocations.managers import AllocationManager
+from apps.allocations.managers import AllocationManager, DailyUsageManager, DirtyAccountManager, UsageSnapshotManager
 from apps.users.models import Team, User
 
 __all__ = [
@@ -24,7 +25,11 @@ __all__ = [
     'AllocationReview',
     'Attachment',
     'Cluster',
+    'DailyUsage',
+    'DirtyAccount',
     'TeamModelInterface',
+    'UsageCursor',
+    'UsageSnapshot',
 ]
 
 
@@ -42,6 +47,7 @@ class Allocation(TeamModelInterface, models.Model):
     requested = models.PositiveIntegerField()
     awarded = models.PositiveIntegerField(null=True, blank=True)
     final = models.PositiveIntegerField(null=True, blank=True)
+    exhaustion = models.DateField(null=True, blank=True, db_index=True)
 
     cluster: Cluster = models.ForeignKey('Cluster', on_delete=models.CASCADE)
     request: AllocationRequest = models.ForeignKey('AllocationRequest', on_delete=models.CASCADE)
@@ -157,7 +163,118 @@ class Cluster(models.Model):
     description = models.TextField(max_length=150, null=True, blank=True)
     enabled = models.BooleanField(default=True)
 
+    # Service units charged per hour of each TRES (memory is weighted per GB)
+    cpu_weight = models.FloatField(default=1.0)
+    mem_weight = models.FloatField(default=0.0)
+    gpu_weight = models.FloatField(default=0.0)
+
     def __str__(self) -> str:  # pragma: nocover
         """Return the cluster name as a string."""
 
         return str(self.name)
+
+
+class DailyUsage(TeamModelInterface, models.Model):
+    """Resource usage aggregated by user, Slurm account, cluster, and day.
+
+    Usage is attributed to the day on which each job ended and is recorded in
+    TRES billing seconds (billing weight multiplied by job runtime). Raw CPU,
+    memory (in MB), and GPU usage are recorded in TRES seconds and converted
+    into service units at ingestion using the TRES weights of the cluster.
+    """
+
+    class Meta:
+        """Database model settings."""
+
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'username', 'team', 'cluster'], name='unique_daily_usage')
+        ]
+
+    date = models.DateField()
+    username = models.CharField(max_length=150)
+    jobs = models.PositiveIntegerField(default=0)
+    billing_seconds = models.PositiveBigIntegerField(default=0)
+    cpu_seconds = models.PositiveBigIntegerField(default=0)
+    mem_seconds = models.PositiveBigIntegerField(default=0)
+    gpu_seconds = models.PositiveBigIntegerField(default=0)
+    service_units = models.FloatField(default=0)
+
+    team: Team = models.ForeignKey(Team, on_delete=models.CASCADE)
+    cluster: Cluster = models.ForeignKey(Cluster, on_delete=models.CASCADE)
+
+    objects = DailyUsageManager()
+
+    def get_team(self) -> Team:
+        """Return the user team tied to the current record."""
+
+        return self.team
+
+    def __str__(self) -> str:  # pragma: nocover
+        """Return a human-readable summary of the usage record."""
+
+        return f'{self.username} usage for {self.team} on {self.cluster} ({self.date})'
+
+
+class DirtyAccount(models.Model):
+    """A Slurm account with allocation changes that have not yet been applied to its usage limits."""
+
+    class Meta:
+        """Database model settings."""
+
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'cluster'], name='unique_dirty_team_cluster')
+        ]
+
+    marked = models.DateTimeField()
+
+    team: Team = models.ForeignKey(Team, on_delete=models.CASCADE)
+    cluster: Cluster = models.ForeignKey(Cluster, on_delete=models.CASCADE)
+
+    objects = DirtyAccountManager()
+
+
+class UsageCursor(models.Model):
+    """Tracks how far job accounting records have been ingested for each cluster."""
+
+    last_ingested = models.DateTimeField()
+
+    cluster: Cluster = models.OneToOneField(Cluster, on_delete=models.CASCADE)
+
+
+class UsageSnapshot(TeamModelInterface, models.Model):
+    """Point in time record of account usage captured while updating Slurm limits.
+
+    Older snapshots are downsampled into hourly or daily rollups that retain the
+    latest snapshot recorded within each interval.
+    """
+
+    class ResolutionChoices(models.TextChoices):
+        """Enumerated choices for the `resolution` field."""
+
+        RAW = 'RW', 'Raw'
+        HOURLY = 'HR', 'Hourly'
+        DAILY = 'DY', 'Daily'
+
+    class Meta:
+        """Database model settings."""
+
+        indexes = [
+            models.Index(fields=['team', 'cluster', 'recorded'])
+        ]
+
+    recorded = models.DateTimeField(default=timezone.now)
+    resolution = models.CharField(max_length=2, choices=ResolutionChoices.choices, default=ResolutionChoices.RAW)
+    total_usage = models.PositiveIntegerField()
+    current_usage = models.PositiveIntegerField()
+    historical_usage = models.PositiveIntegerField()
+    limit = models.PositiveIntegerField()
+
+    team: Team = models.ForeignKey(Team, on_delete=models.CASCADE)
+    cluster: Cluster = models.ForeignKey(Cluster, on_delete=models.CASCADE)
+
+    objects = UsageSnapshotManager()
+
+    def get_team(self) -> Team:
+        """Return the user team tied to the current record."""
+
+        return self.team
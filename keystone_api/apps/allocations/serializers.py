@@ -40,6 +40,7 @@ class AllocationSerializer(serializers.ModelSerializer):
 
         model = Allocation
         fields = '__all__'
+        extra_kwargs = {'exhaustion': {'read_only': True}}  # Exhaustion dates are forecast by a background task
 
 
 class AllocationRequestSerializer(serializers.ModelSerializer):
@@ -5,32 +5,35 @@ redirecting URLs, issuing notifications, and handling HTTP responses.
 """
 
 import logging
+from typing import Iterable
 
-from apps.allocations.models import AllocationRequest
+from apps.allocations.models import AllocationRequest, Cluster
 from apps.notifications.models import Notification
-from apps.notifications.shortcuts import send_notification_template
-from apps.users.models import User
+from apps.notifications.shortcuts import render_notification_templates, send_notification_batch, send_notification_template_batch
+from apps.users.models import Team, User
 
 log = logging.getLogger(__name__)
 
 
-def send_notification_upcoming_expiration(user: User, request: AllocationRequest) -> None:
-    """Send a notification to alert a user their allocation request will expire soon.
+def render_notification_upcoming_expiration(users: Iterable[User], request: AllocationRequest) -> list[tuple[Notification, str]]:
+    """Render notifications alerting users their allocation request will expire soon.
+
+    Request details are rendered once and shared by all users.
 
     Args:
-        user: The user to notify.
-        request: The allocation request to notify the user about.
-    """
+        users: The users to notify.
+        request: The allocation request to notify the users about.
 
-    log.info(f'Sending notification to user "{user.username}" on upcoming expiration for request {request.id}.')
+    Returns:
+        An unsaved notification record and the rendered HTML content for each user.
+    """
 
     days_until_expire = request.get_days_until_expire()
-    send_notification_template(
-        user=user,
+    return render_notification_templates(
+        users=users,
         subject=f'You have an allocation expiring on {request.expire}',
         template='upcoming_expiration_email.html',
         context={
-            'user': user,
             'request': request,
             'days_to_expire': days_until_expire
         },
@@ -42,21 +45,36 @@ def send_notification_upcoming_expiration(user: User, request: AllocationRequest
     )
 
 
-def send_notification_past_expiration(user: User, request: AllocationRequest) -> None:
-    """Send a notification to alert a user their allocation request has expired.
+def send_notification_upcoming_expiration(user: User, request: AllocationRequest) -> None:
+    """Send a notification to alert a user their allocation request will expire soon.
 
     Args:
         user: The user to notify.
         request: The allocation request to notify the user about.
     """
 
-    log.info(f'Sending notification to user "{user.username}" on expiration of request {request.id}.')
-    send_notification_template(
-        user=user,
+    log.info(f'Sending notification to user "{user.username}" on upcoming expiration for request {request.id}.')
+    send_notification_batch(render_notification_upcoming_expiration([user], request))
+
+
+def render_notification_past_expiration(users: Iterable[User], request: AllocationRequest) -> list[tuple[Notification, str]]:
+    """Render notifications alerting users their allocation request has expired.
+
+    Request details are rendered once and shared by all users.
+
+    Args:
+        users: The users to notify.
+        request: The allocation request to notify the users about.
+
+    Returns:
+        An unsaved notification record and the rendered HTML content for each user.
+    """
+
+    return render_notification_templates(
+        users=users,
         subject='One of your allocations has expired',
         template='past_expiration_email.html',
         context={
-            'user': user,
             'request': request
         },
         notification_type=Notification.NotificationType.request_expired,
@@ -64,3 +82,57 @@ def send_notification_past_expiration(user: User, request: AllocationRequest) ->
             'request_id': request.id
         }
     )
+
+
+def send_notification_past_expiration(user: User, request: AllocationRequest) -> None:
+    """Send a notification to alert a user their allocation request has expired.
+
+    Args:
+        user: The user to notify.
+        request: The allocation request to notify the user about.
+    """
+
+    log.info(f'Sending notification to user "{user.username}" on expiration of request {request.id}.')
+    send_notification_batch(render_notification_past_expiration([user], request))
+
+
+def send_notification_usage_threshold(
+    users: Iterable[User],
+    team: Team,
+    cluster: Cluster,
+    usage_percentage: int,
+    threshold: int
+) -> None:
+    """Send a notification to alert users their team's allocations on a cluster have crossed a usage threshold.
+
+    Usage is tracked by Slurm per account, so all active allocations of a team on a cluster share
+    a single utilization value. Notification content is rendered once and notifications for all
+    users are saved using a single bulk insert.
+
+    Args:
+        users: The users to notify.
+        team: The team owning the allocations.
+        cluster: The cluster the allocations were awarded on.
+        usage_percentage: The current utilization of the team's active allocations in percent.
+        threshold: The usage threshold crossed by the allocations in percent.
+    """
+
+    users = list(users)
+    log.info(f'Sending notification to {len(users)} user(s) on {threshold}% usage of team {team.name} on {cluster.name}.')
+    send_notification_template_batch(
+        users=users,
+        subject=f'Your allocations on {cluster.name} have reached {threshold}% usage',
+        template='usage_threshold_email.html',
+        context={
+            'team': team,
+            'cluster': cluster,
+            'usage_percentage': usage_percentage
+        },
+        notification_type=Notification.NotificationType.usage_threshold,
+        notification_metadata={
+            'team_id': team.id,
+            'cluster_id': cluster.id,
+            'usage_percentage': usage_percentage,
+            'threshold': threshold
+        }
+    )
@@ -0,0 +1,40 @@
+"""Signal handlers for reacting to changes in application database models.
+
+Signal handlers are connected when the application is loaded and are used to
+track allocation changes that require the corresponding Slurm account limits
+to be recalculated.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import *
+
+__all__ = ['mark_allocation_dirty', 'mark_request_dirty']
+
+
+def _mark_on_commit(accounts: set[tuple[int, int]]) -> None:
+    """Flag the given `(team ID, cluster ID)` tuples as dirty once the current transaction commits."""
+
+    if accounts:
+        transaction.on_commit(lambda: DirtyAccount.objects.mark(accounts))
+
+
+@receiver(post_save, sender=Allocation)
+@receiver(post_delete, sender=Allocation)
+def mark_allocation_dirty(sender, instance: Allocation, **kwargs) -> None:
+    """Flag the Slurm account affected by a modified allocation as dirty."""
+
+    team_id = AllocationRequest.objects.filter(pk=instance.request_id).values_list('team', flat=True).first()
+    if team_id is not None:
+        _mark_on_commit({(team_id, instance.cluster_id)})
+
+
+@receiver(post_save, sender=AllocationRequest)
+@receiver(pre_delete, sender=AllocationRequest)
+def mark_request_dirty(sender, instance: AllocationRequest, **kwargs) -> None:
+    """Flag all Slurm accounts affected by a modified allocation request as dirty."""
+
+    cluster_ids = instance.allocation_set.values_list('cluster', flat=True)
+    _mark_on_commit({(instance.team_id, cluster_id) for cluster_id in cluster_ids})
@@ -5,5 +5,7 @@ asynchronously from the rest of the application and log their results in the
 application database.
 """
 
+from .accounts import *
 from .limits import *
 from .notifications import *
+from .usage import *
@@ -0,0 +1,100 @@
+"""Background tasks for synchronizing teams and team memberships against Slurm accounts."""
+
+import logging
+
+from celery import shared_task
+from django.db import transaction
+
+from apps.allocations.models import *
+from apps.users.models import *
+from plugins.scheduler import get_scheduler_backend
+
+__all__ = ['sync_slurm_accounts']
+
+log = logging.getLogger(__name__)
+
+
+@shared_task()
+def sync_slurm_accounts(prune: bool = False) -> dict[str, int]:
+    """Create teams and team memberships reflecting the Slurm accounts on all enabled clusters.
+
+    Associations are fetched from each cluster using the configured scheduler
+    backend and combined across clusters before being compared against the database. A team is
+    created for every Slurm account and users associated with an account are added
+    as team members. Account PIs are assigned the owner role. Associations for
+    usernames without a Keystone user account are skipped.
+
+    Only teams corresponding to a Slurm account are modified. Admin roles assigned
+    in Keystone are preserved. Pruning removes members added in Keystone without a
+    Slurm association and demotes owners who are not the account PI, so it is
+    disabled unless explicitly requested. Admin memberships are never pruned.
+
+    Args:
+        prune: Remove non-admin memberships for users no longer associated with the account and demote owners who are not the account PI.
+
+    Returns:
+        The number of created teams and created, updated, and deleted memberships.
+    """
+
+    # Combine associations from all clusters so users are not removed from teams they use on a different cluster
+    backend = get_scheduler_backend()
+    associations, pis = dict(), dict()
+    for cluster_name in Cluster.objects.filter(enabled=True).values_list('name', flat=True):
+        for account_name, usernames in backend.get_associations(cluster_name).items():
+            associations.setdefault(account_name, set()).update(usernames)
+
+        pis.update(backend.get_principal_investigators(cluster_name))
+
+    pis = {name: pi for name, pi in pis.items() if name in associations}
+    usernames = set(pis.values()).union(*associations.values())
+    users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+    if missing := sorted(usernames - users.keys()):
+        log.warning(f"No existing user for {len(missing)} Slurm username(s), skipping for now: {', '.join(missing)}")
+
+    with transaction.atomic():
+        existing_teams = set(Team.objects.filter(name__in=associations).values_list('name', flat=True))
+        Team.objects.bulk_create([Team(name=name) for name in associations.keys() - existing_teams], ignore_conflicts=True)
+        teams = dict(Team.objects.filter(name__in=associations).values_list('name', 'id'))
+
+        # Determine the role of each user in each Slurm managed team
+        desired = dict()
+        for account_name, account_users in associations.items():
+            for username in account_users & users.keys():
+                desired[(teams[account_name], users[username])] = TeamMembership.Role.MEMBER
+
+            if users.get(pis.get(account_name)):
+                desired[(teams[account_name], users[pis[account_name]])] = TeamMembership.Role.OWNER
+
+        updated, deleted = [], []
+        for membership in TeamMembership.objects.filter(team__in=teams.values()).select_for_update():
+            role = desired.pop((membership.team_id, membership.user_id), None)
+            if role is None:
+                if membership.role != TeamMembership.Role.ADMIN:
+                    deleted.append(membership.pk)
+
+            elif role == TeamMembership.Role.OWNER and membership.role != role:
+                membership.role = role
+                updated.append(membership)
+
+            elif prune and role == TeamMembership.Role.MEMBER and membership.role == TeamMembership.Role.OWNER:
+                membership.role = role
+                updated.append(membership)
+
+        created = [TeamMembership(team_id=team_id, user_id=user_id, role=role) for (team_id, user_id), role in desired.items()]
+        TeamMembership.objects.bulk_create(created, ignore_conflicts=True)
+        TeamMembership.objects.bulk_update(updated, ['role'])
+        if prune:
+            TeamMembership.objects.filter(pk__in=deleted).delete()
+
+        else:
+            deleted = []
+
+    results = {
+        'teams_created': len(associations.keys() - existing_teams),
+        'memberships_created': len(created),
+        'memberships_updated': len(updated),
+        'memberships_deleted': len(deleted),
+    }
+
+    log.info(f"Synchronized {len(teams)} Slurm account(s): {results}")
+    return results
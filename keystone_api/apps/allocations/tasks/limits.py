@@ -1,65 +1,320 @@
 """Background tasks for updating/enforcing slurm usage limits."""
 
 import logging
+from collections import defaultdict
+from math import ceil
 
-from celery import shared_task
+from celery import chord, group, shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
 from apps.allocations.models import *
+from apps.scheduler.locks import LeaseLock
 from apps.users.models import *
-from plugins import slurm
+from plugins.scheduler import get_scheduler_backend
 
-__all__ = ['update_limits', 'update_limit_for_account', 'update_limits_for_cluster']
+__all__ = [
+    'summarize_limit_updates',
+    'update_limits',
+    'update_limit_for_account',
+    'update_limits_for_cluster',
+    'update_limits_for_clusters'
+]
 
 log = logging.getLogger(__name__)
 
+EMPTY_LEDGER = {'active': 0, 'expiring': 0, 'historical': 0}
+
+
+@shared_task()
+def update_limits(incremental: bool = False) -> None:
+    """Adjust TRES billing limits for Slurm accounts on all enabled clusters.
+
+    Clusters are processed in parallel by dispatching a group of subtasks, with
+    the number of concurrent subtasks capped by the `LIMITS_MAX_CONCURRENCY`
+    setting. Each subtask processes its clusters one after another, and an
+    error on one cluster does not prevent the remaining clusters from being
+    updated. Results from each cluster are aggregated by the
+    `summarize_limit_updates` callback once all subtasks have finished.
+
+    In incremental mode, only accounts flagged as dirty or with allocations
+    that recently started/expired are processed. Otherwise, all accounts are
+    processed and reconciled against Slurm.
+
+    Args:
+        incremental: Only process accounts with pending allocation changes.
+    """
+
+    cluster_ids = list(Cluster.objects.filter(enabled=True).values_list('id', flat=True))
+    if incremental:
+        pending = DirtyAccount.objects.pending()
+        subtask_args = [(cluster_id, True, sorted(pending[cluster_id])) for cluster_id in cluster_ids if cluster_id in pending]
+
+    else:
+        subtask_args = [(cluster_id,) for cluster_id in cluster_ids]
+
+    if not subtask_args:
+        return
+
+    # Distribute clusters across at most `LIMITS_MAX_CONCURRENCY` subtasks
+    chunk_size = ceil(len(subtask_args) / max(settings.LIMITS_MAX_CONCURRENCY, 1))
+    chunks = [subtask_args[i:i + chunk_size] for i in range(0, len(subtask_args), chunk_size)]
+    chord(group(update_limits_for_clusters.s(chunk) for chunk in chunks))(summarize_limit_updates.s())
+
+
+@shared_task()
+def update_limits_for_clusters(subtask_args: list[list]) -> list[dict[str, int]]:
+    """Run `update_limits_for_cluster` for several clusters one after another.
+
+    Errors are logged and reported per cluster so that one failing cluster
+    does not prevent limits from being updated on the remaining clusters.
+
+    Args:
+        subtask_args: Positional arguments for each call to `update_limits_for_cluster`.
+
+    Returns:
+        The results of each cluster update, with an `errors` count of `1` for clusters that raised an error.
+    """
+
+    results = []
+    for args in subtask_args:
+        try:
+            results.append(update_limits_for_cluster(*args))
+
+        except Exception as error:
+            log.exception(f"Error updating limits for cluster {args[0]}: {error}")
+            results.append({'written': 0, 'skipped': 0, 'failed': 0, 'errors': 1})
+
+    return results
+
 
 @shared_task()
-def update_limits() -> None:
-    """Adjust TRES billing limits for all Slurm accounts on all enabled clusters."""
+def summarize_limit_updates(chunk_results: list[list[dict[str, int]]]) -> dict[str, int]:
+    """Aggregate the results of multiple `update_limits_for_cluster` subtasks.
 
-    for cluster in Cluster.objects.filter(enabled=True).all():
-        update_limits_for_cluster(cluster)
+    Args:
+        chunk_results: Lists of results returned by each chunk of cluster subtasks.
+
+    Returns:
+        The total number of written, skipped, and failed limit updates and failed clusters across all clusters.
+    """
+
+    totals = {'written': 0, 'skipped': 0, 'failed': 0, 'errors': 0}
+    for cluster_results in chunk_results:
+        for result in cluster_results:
+            for key, value in result.items():
+                totals[key] += value
+
+    return totals
 
 
 @shared_task()
-def update_limits_for_cluster(cluster: Cluster) -> None:
-    """Adjust TRES billing limits for all Slurm accounts on a given Slurm cluster.
+def update_limits_for_cluster(
+    cluster_id: int,
+    batch: bool = True,
+    account_ids: list[int] | None = None
+) -> dict[str, int]:
+    """Adjust TRES billing limits for Slurm accounts on a given Slurm cluster.
 
     The Slurm accounts for `root` and any that are missing from Keystone are automatically ignored.
+    Current limits and usage values are fetched for all accounts at once and cached in memory.
+    Expired allocations are closed out for all accounts in a single atomic database update.
+    Limits are only written to Slurm for accounts where the updated value differs from the current one.
+    By default, updated limits are collected and written to Slurm in a single batch operation.
+    Slurm is accessed through the scheduler backend configured by the `SCHEDULER_BACKEND` setting.
+
+    A usage snapshot is recorded for every processed account.
+    Processed accounts are cleared from the set of dirty accounts awaiting a limits update.
+
+    Updates for the same cluster never overlap. Each run holds a per-cluster lease lock
+    that is renewed in the background, and runs started while the lock is held exit
+    without doing any work. Accounts skipped this way remain flagged as dirty and are
+    picked up by the next incremental update.
 
     Args:
-        cluster: The name of the Slurm cluster.
+        cluster_id: The primary key of the Slurm cluster.
+        batch: Write updated limits in a single batch instead of one account at a time.
+        account_ids: Optionally restrict updates to the given team IDs instead of all Slurm accounts.
+
+    Returns:
+        The number of written, skipped, and failed limit updates.
     """
 
-    for account_name in slurm.get_slurm_account_names(cluster.name):
-        if account_name in ['root']:
-            continue
+    lock = LeaseLock(f'update_limits:{cluster_id}')
+    if not lock.acquire():
+        log.info(f"Skipping limits update for cluster {cluster_id}: An update for this cluster is already running")
+        return {'written': 0, 'skipped': 0, 'failed': 0}
 
-        try:
-            account = Team.objects.get(name=account_name)
+    with lock:
+        return _update_limits_for_cluster(cluster_id, batch, account_ids, lock)
 
-        except Team.DoesNotExist:
-            log.warning(f"No existing team for account {account_name} on {cluster.name}, skipping for now")
-            continue
 
-        update_limit_for_account(account, cluster)
+def _update_limits_for_cluster(cluster_id: int, batch: bool, account_ids: list[int] | None, lock: LeaseLock) -> dict[str, int]:
+    """Adjust TRES billing limits for Slurm accounts on a given Slurm cluster while holding the cluster lock.
+
+    See `update_limits_for_cluster` for details.
+    """
+
+    started = timezone.now()
+    scheduler = get_scheduler_backend()
+    cluster = Cluster.objects.get(pk=cluster_id)
+    limits = scheduler.get_limits(cluster.name)
+    usages = scheduler.get_usages(cluster.name)
+
+    # Resolve Slurm account names to Keystone teams using a single query
+    if account_ids is None:
+        accounts = None
+        account_names = scheduler.get_account_names(cluster.name) - {'root'}
+        teams = {team.name: team for team in Team.objects.filter(name__in=account_names)}
+        if missing := sorted(account_names - teams.keys()):
+            log.warning(f"No existing team for {len(missing)} account(s) on {cluster.name}, skipping for now: {', '.join(missing)}")
+
+    else:
+        accounts = Team.objects.filter(pk__in=account_ids)
+        teams = {team.name: team for team in accounts if team.name in limits}
+
+    ledger = Allocation.objects.service_unit_ledger(cluster, accounts)
+    expiring_query = Allocation.objects.cluster_expiring_allocations(cluster).select_related('request')
+    if accounts is not None:
+        expiring_query = expiring_query.filter(request__team__in=accounts)
+
+    # Close out expired allocations before updating Slurm so a failed write is corrected on the next run
+    with transaction.atomic():
+        # Lock expiring allocations so they cannot be closed out concurrently by `update_limit_for_account`
+        expiring_allocations = defaultdict(list)
+        for allocation in expiring_query.select_for_update(of=('self',)):
+            expiring_allocations[allocation.request.team_id].append(allocation)
+
+        updated_limits = dict()
+        closed_allocations = []
+        snapshots = []
+        skipped = 0
+        for account_name, account in teams.items():
+            current_limit = limits.get(account_name, 0)
+            snapshot = _calculate_account_limit(
+                account,
+                cluster,
+                current_limit=current_limit,
+                total_usage=usages.get(account_name, 0),
+                service_units=ledger.get(account.id, EMPTY_LEDGER),
+                expiring_allocations=expiring_allocations[account.id]
+            )
+
+            snapshot.recorded = started
+            snapshots.append(snapshot)
+            closed_allocations.extend(expiring_allocations[account.id])
+            if snapshot.limit == current_limit:
+                skipped += 1
+
+            else:
+                updated_limits[account_name] = snapshot.limit
+
+        Allocation.objects.bulk_update(closed_allocations, ['final'])
+        UsageSnapshot.objects.bulk_create(snapshots)
+
+    # Another run may have started if the lease expired, in which case it is responsible for updating Slurm
+    if lock.lost:
+        log.error(f"Lost lock while updating limits on {cluster.name}, skipping {len(updated_limits)} limit update(s)")
+        return {'written': 0, 'skipped': skipped, 'failed': len(updated_limits)}
+
+    if batch:
+        results = scheduler.set_limits(cluster.name, updated_limits)
+
+    else:
+        results = dict()
+        for account_name, limit in updated_limits.items():
+            try:
+                scheduler.set_limit(account_name, cluster.name, limit)
+                results[account_name] = True
+
+            except RuntimeError:
+                results[account_name] = False
+
+    if failed := sorted(name for name, success in results.items() if not success):
+        log.error(f"Failed to update limits on {cluster.name} for {len(failed)} account(s): {', '.join(failed)}")
+
+    # Clear dirty flags for processed accounts, ignoring any changes made while the update was running
+    dirty_accounts = DirtyAccount.objects.filter(cluster=cluster, marked__lte=started).exclude(team__name__in=failed)
+    if account_ids is not None:
+        dirty_accounts = dirty_accounts.filter(team__in=account_ids)
+
+    dirty_accounts.delete()
+
+    log.info(f"Updated limits on {cluster.name}: {len(updated_limits) - len(failed)} written, {skipped} unchanged")
+    return {'written': len(updated_limits) - len(failed), 'skipped': skipped, 'failed': len(failed)}
 
 
 @shared_task()
-def update_limit_for_account(account: Team, cluster: Cluster) -> None:
+def update_limit_for_account(account_id: int, cluster_id: int) -> int:
     """Update the allocation limits for an individual Slurm account and close out any expired allocations.
 
+    Args:
+        account_id: The primary key of the team corresponding to the Slurm account.
+        cluster_id: The primary key of the Slurm cluster.
+
+    Returns:
+        The updated TRES billing limit in hours.
+    """
+
+    scheduler = get_scheduler_backend()
+    account = Team.objects.get(pk=account_id)
+    cluster = Cluster.objects.get(pk=cluster_id)
+
+    # Expiring allocations stay locked until Slurm is updated so concurrent updates for the
+    # same account are serialized. Slurm values are read after the lock is acquired.
+    with transaction.atomic():
+        expiring_query = Allocation.objects.expiring_allocations(account, cluster).select_for_update(of=('self',))
+        expiring_allocations = list(expiring_query)
+        current_limit = scheduler.get_limit(account.name, cluster.name)
+        snapshot = _calculate_account_limit(
+            account,
+            cluster,
+            current_limit=current_limit,
+            total_usage=scheduler.get_usage(account.name, cluster.name),
+            service_units=Allocation.objects.service_unit_ledger(cluster, [account]).get(account.id, EMPTY_LEDGER),
+            expiring_allocations=expiring_allocations
+        )
+
+        Allocation.objects.bulk_update(expiring_allocations, ['final'])
+        snapshot.save()
+
+        if snapshot.limit != current_limit:
+            scheduler.set_limit(account.name, cluster.name, snapshot.limit)
+
+    return snapshot.limit
+
+
+def _calculate_account_limit(
+    account: Team,
+    cluster: Cluster,
+    current_limit: int,
+    total_usage: int,
+    service_units: dict[str, int],
+    expiring_allocations: list[Allocation]
+) -> UsageSnapshot:
+    """Calculate the updated allocation limit for a Slurm account and close out any expired allocations.
+
+    Final usage values are assigned to the given expiring allocations in memory.
+    It is the responsibility of the caller to persist the closed allocations, usage snapshot, and updated limit.
+
     Args:
         account: Team object for the account.
         cluster: Cluster object corresponding to the Slurm cluster.
+        current_limit: The account's current TRES billing limit in hours.
+        total_usage: The account's total TRES billing usage in hours.
+        service_units: The account's entry from `AllocationManager.service_unit_ledger`.
+        expiring_allocations: The account's expiring allocations ordered by expiration date.
+
+    Returns:
+        An unsaved usage snapshot including the updated TRES billing limit in hours.
     """
 
     # Calculate service units for expired and active allocations
-    closing_sus = Allocation.objects.expiring_service_units(account, cluster)
-    active_sus = Allocation.objects.active_service_units(account, cluster)
+    closing_sus = service_units['expiring']
+    active_sus = service_units['active']
 
     # Determine the historical contribution to the current limit
-    current_limit = slurm.get_cluster_limit(account.name, cluster.name)
     historical_usage = current_limit - active_sus - closing_sus
 
     if historical_usage < 0:
@@ -69,7 +324,6 @@ def update_limit_for_account(account: Team, cluster: Cluster) -> None:
         historical_usage = 0
 
     # Close expired allocations and determine the current usage
-    total_usage = slurm.get_cluster_usage(account.name, cluster.name)
     current_usage = total_usage - historical_usage
     if current_usage < 0:
         log.warning(f"Negative Current usage found for {account.name} on {cluster.name}:\n"
@@ -77,23 +331,23 @@ def update_limit_for_account(account: Team, cluster: Cluster) -> None:
                     f"Setting to historical usage: {historical_usage}...")
         current_usage = historical_usage
 
+    closed_usage = 0
     closing_summary = (f"Summary of closing allocations:\n"
                        f"> Current Usage before closing: {current_usage}\n")
-    for allocation in Allocation.objects.expiring_allocations(account, cluster):
+    for allocation in expiring_allocations:
         allocation.final = min(current_usage, allocation.awarded)
         closing_summary += f"> Allocation {allocation.id}: {current_usage} - {allocation.final} -> {current_usage - allocation.final}\n"
         current_usage -= allocation.final
-        allocation.save()
+        closed_usage += allocation.final
     closing_summary += f"> Current Usage after closing: {current_usage}"
 
     # This shouldn't happen but if it does somehow, create a warning so an admin will notice
     if current_usage > active_sus:
         log.warning(f"The current usage is somehow higher than the limit for {account.name}!")
 
-    # Set the new account usage limit using the updated historical usage after closing any expired allocations
-    updated_historical_usage = Allocation.objects.historical_usage(account, cluster)
+    # Determine the new account usage limit using the updated historical usage after closing any expired allocations
+    updated_historical_usage = service_units['historical'] + closed_usage
     updated_limit = updated_historical_usage + active_sus
-    slurm.set_cluster_limit(account.name, cluster.name, updated_limit)
 
     # Log summary of changes during limits update for this Slurm account on this cluster
     log.debug(f"Summary of limits update for {account.name} on {cluster.name}:\n"
@@ -102,3 +356,12 @@ def update_limit_for_account(account: Team, cluster: Cluster) -> None:
               f"> {closing_summary}\n"
               f"> historical usage change: {historical_usage} -> {updated_historical_usage}\n"
               f"> limit change: {current_limit} -> {updated_limit}")
+
+    return UsageSnapshot(
+        team=account,
+        cluster=cluster,
+        total_usage=total_usage,
+        current_usage=current_usage,
+        historical_usage=updated_historical_usage,
+        limit=updated_limit
+    )
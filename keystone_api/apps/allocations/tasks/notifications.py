@@ -4,15 +4,24 @@ import logging
 from datetime import date, timedelta
 
 from celery import shared_task
-
-from apps.allocations.models import AllocationRequest
-from apps.allocations.shortcuts import send_notification_past_expiration, send_notification_upcoming_expiration
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.allocations.models import Allocation, AllocationRequest, Cluster
+from apps.allocations.shortcuts import (
+    render_notification_past_expiration,
+    render_notification_upcoming_expiration,
+    send_notification_usage_threshold
+)
 from apps.notifications.models import Notification, Preference
-from apps.users.models import User
+from apps.notifications.shortcuts import send_notification_batch
+from apps.users.models import Team, TeamMembership, User
+from plugins.scheduler import get_scheduler_backend
 
 __all__ = [
     'notify_past_expirations',
     'notify_upcoming_expirations',
+    'notify_usage_thresholds',
     'should_notify_past_expiration',
     'should_notify_upcoming_expiration'
 ]
@@ -70,19 +79,63 @@ def should_notify_upcoming_expiration(user: User, request: AllocationRequest) ->
 
 @shared_task()
 def notify_upcoming_expirations() -> None:
-    """Send a notification to all users with soon-to-expire allocations."""
+    """Send a notification to all users with soon-to-expire allocations.
 
-    active_requests = AllocationRequest.objects.filter(
+    Team members, user preferences, and previously issued notifications are
+    each fetched using a single query for all active requests. Notification
+    thresholds are then evaluated in memory using the same rules as
+    `should_notify_upcoming_expiration`. Notifications are queued for
+    delivery together using a single bulk insert.
+    """
+
+    today = date.today()
+    active_requests = list(AllocationRequest.objects.filter(
         status=AllocationRequest.StatusChoices.APPROVED,
-        expire__gt=date.today()
-    ).all()
+        expire__gt=today
+    ))
+
+    members = dict()
+    memberships = TeamMembership.objects.filter(
+        team__in={request.team_id for request in active_requests}, user__is_active=True
+    ).select_related('user')
+
+    for membership in memberships:
+        members.setdefault(membership.team_id, []).append(membership.user)
+
+    user_ids = {membership.user_id for membership in memberships}
+    preferences = {preference.user_id: preference for preference in Preference.objects.filter(user__in=user_ids)}
+
+    # Map each user and request to the fewest days until expiration already notified on
+    notified = dict()
+    for user_id, request_id, days_to_expire in Notification.objects.filter(
+        notification_type=Notification.NotificationType.request_expiring,
+        metadata__request_id__in=[request.id for request in active_requests]
+    ).values_list('user_id', 'metadata__request_id', 'metadata__days_to_expire'):
+        # Older notifications may not record the threshold and never match a threshold lookup
+        if days_to_expire is not None:
+            notified[(user_id, request_id)] = min(days_to_expire, notified.get((user_id, request_id), days_to_expire))
 
     failed = False
+    pending = []
     for request in active_requests:
-        for user in request.team.get_all_members().filter(is_active=True):
+        recipients = []
+        days_until_expire = request.get_days_until_expire()
+        for user in members.get(request.team_id, []):
             try:
-                if should_notify_upcoming_expiration(user, request):
-                    send_notification_upcoming_expiration(user, request)
+                preference = preferences.get(user.id) or Preference(user=user)
+                next_threshold = preference.get_next_expiration_threshold(days_until_expire)
+                if next_threshold is None:
+                    continue
+
+                # Avoid spamming new users
+                if user.date_joined.date() >= today - timedelta(days=next_threshold):
+                    continue
+
+                if notified.get((user.id, request.id), next_threshold + 1) <= next_threshold:
+                    continue
+
+                log.info(f'Queuing notification to user "{user.username}" on upcoming expiration for request {request.id}.')
+                recipients.append(user)
 
             except Exception as error:
                 failed = True
@@ -90,6 +143,16 @@ def notify_upcoming_expirations() -> None:
                     f'Error notifying user "{user.username}" on upcoming expiration of request {request.id}: {error}'
                 )
 
+        try:
+            pending.extend(render_notification_upcoming_expiration(recipients, request))
+
+        except Exception as error:
+            failed = True
+            log.exception(f'Error rendering upcoming expiration notifications for request {request.id}: {error}')
+
+    if _send_batch(pending):
+        failed = True
+
     if failed:
         raise RuntimeError('Task failed with one or more errors. See logs for details.')
 
@@ -123,7 +186,10 @@ def should_notify_past_expiration(user: User, request: AllocationRequest) -> boo
 
 @shared_task()
 def notify_past_expirations() -> None:
-    """Send a notification to all users with expired allocations"""
+    """Send a notification to all users with expired allocations
+
+    Notifications are queued for delivery together using a single bulk insert.
+    """
 
     active_requests = AllocationRequest.objects.filter(
         status=AllocationRequest.StatusChoices.APPROVED,
@@ -132,12 +198,15 @@ def notify_past_expirations() -> None:
     ).all()
 
     failed = False
+    pending = []
     for request in active_requests:
+        recipients = []
         for user in request.team.get_all_members().filter(is_active=True):
 
             try:
                 if should_notify_past_expiration(user, request):
-                    send_notification_past_expiration(user, request)
+                    log.info(f'Queuing notification to user "{user.username}" on expiration of request {request.id}.')
+                    recipients.append(user)
 
             except Exception as error:
                 failed = True
@@ -145,5 +214,153 @@ def notify_past_expirations() -> None:
                     f'Error notifying user "{user.username}" on the expiration of request {request.id}: {error}'
                 )
 
+        try:
+            pending.extend(render_notification_past_expiration(recipients, request))
+
+        except Exception as error:
+            failed = True
+            log.exception(f'Error rendering expiration notifications for request {request.id}: {error}')
+
+    if _send_batch(pending):
+        failed = True
+
+    if failed:
+        raise RuntimeError('Task failed with one or more errors. See logs for details.')
+
+
+def _send_batch(pending: list[tuple[Notification, str]]) -> bool:
+    """Queue rendered notifications for delivery and report whether an error occurred.
+
+    Args:
+        pending: Unsaved notification records paired with their rendered HTML content.
+
+    Returns:
+        Whether the notifications could not be queued.
+    """
+
+    try:
+        send_notification_batch(pending)
+        return False
+
+    except Exception as error:
+        log.exception(f'Error sending {len(pending)} notification(s): {error}')
+        return True
+
+
+def _account_utilization(cluster: Cluster) -> dict[int, tuple[int, date]]:
+    """Calculate the percent utilization of every Slurm account with an active allocation on a cluster.
+
+    Slurm tracks usage per account rather than per allocation, so all active
+    allocations of a team on the cluster share a single utilization value.
+    Usage for all accounts is fetched from the scheduler in a single bulk call and
+    compared against awarded service units from a single grouped query.
+
+    Args:
+        cluster: The cluster to calculate utilization for.
+
+    Returns:
+        A dictionary mapping team IDs to their utilization in percent and the start date of their latest active allocation.
+    """
+
+    today = date.today()
+    usages = get_scheduler_backend().get_usages(cluster.name)
+    ledger = Allocation.objects.service_unit_ledger(cluster)
+    active_accounts = Allocation.objects.filter(
+        cluster=cluster,
+        request__status=AllocationRequest.StatusChoices.APPROVED,
+        request__active__lte=today,
+        request__expire__gt=today
+    ).values('request__team_id', 'request__team__name').annotate(since=Max('request__active')).order_by()
+
+    utilization = dict()
+    for account in active_accounts:
+        service_units = ledger.get(account['request__team_id'])
+        if not service_units or not service_units['active']:
+            continue
+
+        # Usage from closed allocations is excluded so only active service units are considered
+        current_usage = max(usages.get(account['request__team__name'], 0) - service_units['historical'], 0)
+        utilization[account['request__team_id']] = ((100 * current_usage) // service_units['active'], account['since'])
+
+    return utilization
+
+
+@shared_task()
+def notify_usage_thresholds() -> None:
+    """Send a notification to all users with allocations that have crossed a usage threshold.
+
+    Utilization is evaluated once per team and cluster, and users are notified
+    at most once per threshold until a new allocation becomes active. Team
+    members, user preferences, and previously issued notifications are each
+    fetched using a single query. Users notified on the same team, cluster,
+    and threshold are notified together.
+    """
+
+    failed = False
+    clusters = dict()
+    utilization = dict()
+    for cluster in Cluster.objects.filter(enabled=True):
+        try:
+            for team_id, values in _account_utilization(cluster).items():
+                utilization[(team_id, cluster.id)] = values
+
+            clusters[cluster.id] = cluster
+
+        except Exception as error:
+            failed = True
+            log.exception(f'Error calculating allocation usage on cluster {cluster.name}: {error}')
+
+    team_ids = {team_id for team_id, _ in utilization}
+    teams = Team.objects.in_bulk(team_ids)
+
+    members = dict()
+    memberships = TeamMembership.objects.filter(team__in=team_ids, user__is_active=True).select_related('user')
+    for membership in memberships:
+        members.setdefault(membership.team_id, []).append(membership.user)
+
+    user_ids = {membership.user_id for membership in memberships}
+    preferences = {preference.user_id: preference for preference in Preference.objects.filter(user__in=user_ids)}
+
+    # Map each user, team, and cluster to the highest threshold notified on since the latest allocation became active
+    notified = dict()
+    for user_id, team_id, cluster_id, threshold, sent in Notification.objects.filter(
+        notification_type=Notification.NotificationType.usage_threshold,
+        metadata__team_id__in=list(team_ids)
+    ).values_list('user_id', 'metadata__team_id', 'metadata__cluster_id', 'metadata__threshold', 'time'):
+        account = utilization.get((team_id, cluster_id))
+        if account is None or timezone.localdate(sent) < account[1]:
+            continue
+
+        key = (user_id, team_id, cluster_id)
+        notified[key] = max(threshold, notified.get(key, threshold))
+
+    for (team_id, cluster_id), (usage_percentage, _) in utilization.items():
+        team, cluster = teams[team_id], clusters[cluster_id]
+
+        # Group recipients by threshold so each group is notified using a single bulk insert
+        recipients = dict()
+        for user in members.get(team_id, []):
+            try:
+                preference = preferences.get(user.id) or Preference(user=user)
+                next_threshold = preference.get_next_usage_threshold(usage_percentage)
+                if next_threshold is None or notified.get((user.id, team_id, cluster_id), -1) >= next_threshold:
+                    continue
+
+                recipients.setdefault(next_threshold, []).append(user)
+
+            except Exception as error:
+                failed = True
+                log.exception(
+                    f'Error notifying user "{user.username}" on usage of team {team.name} on {cluster.name}: {error}'
+                )
+
+        for threshold, users in recipients.items():
+            try:
+                send_notification_usage_threshold(users, team, cluster, usage_percentage, threshold)
+
+            except Exception as error:
+                failed = True
+                log.exception(f'Error notifying {len(users)} user(s) on usage of team {team.name} on {cluster.name}: {error}')
+
     if failed:
         raise RuntimeError('Task failed with one or more errors. See logs for details.')
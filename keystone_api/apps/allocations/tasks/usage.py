@@ -0,0 +1,209 @@
+"""Background tasks for ingesting Slurm job accounting records."""
+
+import logging
+from datetime import date, timedelta
+
+import numpy as np
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.allocations.billing import cluster_weights, to_service_units
+from apps.allocations.forecasting import forecast_exhaustion
+from apps.allocations.models import *
+from apps.users.models import *
+from plugins import slurm
+
+__all__ = ['ingest_job_usage', 'ingest_job_usage_for_cluster', 'rollup_usage_snapshots', 'update_exhaustion_forecasts']
+
+log = logging.getLogger(__name__)
+
+INITIAL_LOOKBACK = timedelta(days=1)
+
+# Maps `DailyUsage` fields to the job record TRES values they accumulate
+USAGE_FIELDS = {'billing_seconds': 'billing', 'cpu_seconds': 'cpu', 'mem_seconds': 'mem', 'gpu_seconds': 'gpu'}
+
+
+@shared_task()
+def ingest_job_usage() -> None:
+    """Ingest job accounting records for all enabled clusters."""
+
+    for cluster_id in Cluster.objects.filter(enabled=True).values_list('id', flat=True):
+        ingest_job_usage_for_cluster.delay(cluster_id)
+
+
+@shared_task()
+def ingest_job_usage_for_cluster(cluster_id: int, batch_size: int = 1000) -> int:
+    """Ingest job accounting records for a given Slurm cluster into the daily usage table.
+
+    Jobs that ended since the last ingested time are streamed from `sacct` and
+    aggregated into per-(user, account, day) usage totals. Aggregated values are
+    flushed to the database in batches so that the full job list is never held
+    in memory. Jobs charged to accounts without a matching team are skipped.
+
+    The ingestion window ends `USAGE_INGEST_DELAY` seconds in the past so that
+    accounting records reaching the Slurm database late are still counted.
+
+    Usage records and the ingestion cursor are updated in a single transaction,
+    so a failed run leaves the database unchanged and re-running the task never
+    counts the same job twice.
+
+    Args:
+        cluster_id: The primary key of the Slurm cluster.
+        batch_size: The maximum number of aggregated usage records to buffer before writing to the database.
+
+    Returns:
+        The number of ingested jobs.
+    """
+
+    cluster = Cluster.objects.get(pk=cluster_id)
+    teams = dict(Team.objects.values_list('name', 'id'))
+    window_end = (timezone.now() - timedelta(seconds=settings.USAGE_INGEST_DELAY)).replace(microsecond=0)
+
+    with transaction.atomic():
+        # Lock the cursor so concurrent runs for the same cluster are processed one at a time
+        cursor, _ = UsageCursor.objects.select_for_update().get_or_create(
+            cluster=cluster, defaults={'last_ingested': window_end - INITIAL_LOOKBACK}
+        )
+
+        window_start = cursor.last_ingested
+        buffer = dict()
+        ingested = 0
+        missing = set()
+        for record in slurm.iter_job_records(cluster.name, window_start, window_end):
+            # Jobs are only counted once they have ended within the current window
+            if record['end'] is None or not (window_start < record['end'] <= window_end):
+                continue
+
+            if (team_id := teams.get(record['account'])) is None:
+                missing.add(record['account'])
+                continue
+
+            key = (timezone.localdate(record['end']), record['user'], team_id)
+            totals = buffer.setdefault(key, [0] * (len(USAGE_FIELDS) + 1))
+            totals[0] += 1
+            for i, tres in enumerate(USAGE_FIELDS.values(), start=1):
+                totals[i] += record[tres] * record['elapsed']
+
+            ingested += 1
+
+            if len(buffer) >= batch_size:
+                _flush_usage(cluster, buffer)
+
+        _flush_usage(cluster, buffer)
+        cursor.last_ingested = window_end
+        cursor.save()
+
+    if missing:
+        log.warning(f"No existing team for {len(missing)} account(s) on {cluster.name}, skipping usage: {', '.join(sorted(missing))}")
+
+    log.info(f"Ingested {ingested} job(s) on {cluster.name} ending between {window_start} and {window_end}")
+    return ingested
+
+
+@shared_task()
+def rollup_usage_snapshots() -> None:
+    """Downsample historical usage snapshots according to application settings.
+
+    Snapshots older than `SNAPSHOT_HOURLY_AFTER` days are reduced to one snapshot
+    per hour and snapshots older than `SNAPSHOT_DAILY_AFTER` days to one per day.
+    Setting either value to zero disables the corresponding rollup.
+    """
+
+    now = timezone.now()
+    choices = UsageSnapshot.ResolutionChoices
+    for resolution, days in ((choices.HOURLY, settings.SNAPSHOT_HOURLY_AFTER), (choices.DAILY, settings.SNAPSHOT_DAILY_AFTER)):
+        if days > 0:
+            deleted = UsageSnapshot.objects.rollup(resolution, before=now - timedelta(days=days))
+            log.info(f"Removed {deleted} usage snapshot(s) during {choices(resolution).label.lower()} rollup")
+
+
+@shared_task()
+def update_exhaustion_forecasts() -> int:
+    """Update the projected exhaustion date of every active allocation.
+
+    Burn rates are fit to usage snapshots recorded within the last `FORECAST_WINDOW` days.
+    Allocations are only assigned an exhaustion date if their account is projected to
+    run out of service units before the allocation expires. Forecasts are cleared for
+    allocations that are no longer active.
+
+    Returns:
+        The number of allocations with an updated exhaustion date.
+    """
+
+    today = date.today()
+    forecasts = forecast_exhaustion(since=timezone.now() - timedelta(days=settings.FORECAST_WINDOW))
+    active = Allocation.objects.filter(
+        request__status='AP', request__active__lte=today, request__expire__gt=today
+    ).select_related('request')
+
+    updated = []
+    for allocation in active:
+        exhaustion = forecasts.get((allocation.request.team_id, allocation.cluster_id))
+        if exhaustion is not None and exhaustion >= allocation.request.expire:
+            exhaustion = None
+
+        if exhaustion != allocation.exhaustion:
+            allocation.exhaustion = exhaustion
+            updated.append(allocation)
+
+    with transaction.atomic():
+        Allocation.objects.bulk_update(updated, ['exhaustion'], batch_size=1000)
+        cleared = Allocation.objects.exclude(pk__in=active.values('pk')).exclude(exhaustion=None).update(exhaustion=None)
+
+    log.info(f"Updated exhaustion forecasts for {len(updated)} active allocation(s), cleared {cleared} inactive allocation(s)")
+    return len(updated)
+
+
+def _flush_usage(cluster: Cluster, buffer: dict[tuple, list[int]]) -> None:
+    """Add buffered usage totals to the daily usage table and clear the buffer.
+
+    Service units are calculated for all buffered records in a single
+    vectorized operation using the TRES weights of the cluster.
+
+    Args:
+        cluster: The cluster the buffered usage was recorded on.
+        buffer: A dictionary mapping `(date, username, team ID)` to a list of job counts followed by `USAGE_FIELDS` values.
+    """
+
+    if not buffer:
+        return
+
+    existing = DailyUsage.objects.filter(
+        cluster=cluster,
+        date__in={key[0] for key in buffer},
+        username__in={key[1] for key in buffer},
+        team__in={key[2] for key in buffer}
+    )
+
+    # Raw TRES columns (cpu, mem, gpu) follow the job count and billing values in each buffered row
+    tres_seconds = np.array([values[2:] for values in buffer.values()], dtype=np.float64)
+    service_units = to_service_units(tres_seconds, cluster_weights(cluster)).tolist()
+
+    records = {(record.date, record.username, record.team_id): record for record in existing}
+    created, updated = [], []
+    for ((day, username, team_id), (jobs, *usage)), units in zip(buffer.items(), service_units):
+        if record := records.get((day, username, team_id)):
+            record.jobs += jobs
+            record.service_units += units
+            for field, value in zip(USAGE_FIELDS, usage):
+                setattr(record, field, getattr(record, field) + value)
+
+            updated.append(record)
+
+        else:
+            created.append(DailyUsage(
+                date=day,
+                username=username,
+                team_id=team_id,
+                cluster=cluster,
+                jobs=jobs,
+                service_units=units,
+                **dict(zip(USAGE_FIELDS, usage))
+            ))
+
+    DailyUsage.objects.bulk_create(created)
+    DailyUsage.objects.bulk_update(updated, ['jobs', 'service_units', *USAGE_FIELDS])
+    buffer.clear()
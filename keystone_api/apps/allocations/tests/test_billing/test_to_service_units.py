@@ -0,0 +1,44 @@
+"""Unit tests for the `to_service_units` function."""
+
+import numpy as np
+from django.test import TestCase
+
+from apps.allocations.billing import cluster_weights, to_service_units
+from apps.allocations.models import Cluster
+
+
+class WeightedConversion(TestCase):
+    """Test raw TRES usage is weighted into service units."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1', cpu_weight=1, mem_weight=0.5, gpu_weight=10)
+
+    def test_single_weight_row(self) -> None:
+        """Test the same cluster weights are applied to every record."""
+
+        tres_seconds = np.array([
+            [3600, 0, 0],  # One CPU hour
+            [0, 1024 * 3600, 0],  # One GB hour of memory
+            [0, 0, 3600],  # One GPU hour
+            [7200, 2048 * 3600, 1800],
+        ])
+
+        service_units = to_service_units(tres_seconds, cluster_weights(self.cluster))
+        np.testing.assert_allclose([1, 0.5, 10, 8], service_units)
+
+    def test_per_record_weights(self) -> None:
+        """Test a separate weight row can be applied to each record."""
+
+        other = Cluster.objects.create(name='cluster2', cpu_weight=2, mem_weight=0, gpu_weight=0)
+        weights = np.stack([cluster_weights(self.cluster), cluster_weights(other)])
+        service_units = to_service_units(np.array([[3600, 0, 0], [3600, 0, 0]]), weights)
+        np.testing.assert_allclose([1, 2], service_units)
+
+    def test_default_weights(self) -> None:
+        """Test clusters only charge for CPU usage by default."""
+
+        cluster = Cluster.objects.create(name='cluster3')
+        service_units = to_service_units(np.array([[3600, 1024 * 3600, 3600]]), cluster_weights(cluster))
+        np.testing.assert_allclose([1], service_units)
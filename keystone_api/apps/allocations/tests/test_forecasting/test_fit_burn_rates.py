@@ -0,0 +1,47 @@
+"""Unit tests for the `fit_burn_rates` function."""
+
+import numpy as np
+from django.test import TestCase
+
+from apps.allocations.forecasting import fit_burn_rates
+
+
+class FitBurnRates(TestCase):
+    """Test the fitting of linear burn rates to grouped usage series."""
+
+    def test_independent_series(self) -> None:
+        """Test each series is fit independently of the others."""
+
+        series = np.array([0, 1, 0, 1, 0, 1])
+        times = np.array([0, 0, 1, 1, 2, 2], dtype=np.float64)
+        usage = np.array([100, 0, 110, 5, 120, 10], dtype=np.float64)
+
+        np.testing.assert_allclose([10, 5], fit_burn_rates(series, times, usage, 2))
+
+    def test_noisy_series(self) -> None:
+        """Test noisy observations are fit using least squares."""
+
+        series = np.zeros(4, dtype=np.int64)
+        times = np.array([0, 1, 2, 3], dtype=np.float64)
+        usage = np.array([0, 12, 18, 30], dtype=np.float64)
+
+        np.testing.assert_allclose([9.6], fit_burn_rates(series, times, usage, 1))
+
+    def test_large_timestamps(self) -> None:
+        """Test precision is maintained for times measured from the Unix epoch."""
+
+        series = np.zeros(3, dtype=np.int64)
+        times = 20_000 + np.array([0, 0.5, 1], dtype=np.float64)
+        usage = np.array([1_000_000, 1_000_002, 1_000_004], dtype=np.float64)
+
+        np.testing.assert_allclose([4], fit_burn_rates(series, times, usage, 1))
+
+    def test_insufficient_observations(self) -> None:
+        """Test series without two distinct observation times return `nan`."""
+
+        series = np.array([0, 1, 1])
+        times = np.array([0, 5, 5], dtype=np.float64)
+        usage = np.array([10, 10, 20], dtype=np.float64)
+
+        rates = fit_burn_rates(series, times, usage, 3)
+        self.assertTrue(np.isnan(rates).all())
@@ -0,0 +1,66 @@
+"""Unit tests for the `forecast_exhaustion` function."""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.allocations.forecasting import forecast_exhaustion
+from apps.allocations.models import *
+from apps.users.models import Team
+
+
+class ForecastExhaustion(TestCase):
+    """Test exhaustion dates are forecast from recorded usage snapshots."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.now = timezone.now()
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.busy_team = Team.objects.create(name='busy')
+        self.idle_team = Team.objects.create(name='idle')
+        self.over_team = Team.objects.create(name='over')
+
+        snapshots = []
+        for day in range(5):
+            recorded = self.now - timedelta(days=4 - day)
+            snapshots.append(self.snapshot(self.busy_team, recorded, total_usage=100 * day, limit=1000))
+            snapshots.append(self.snapshot(self.idle_team, recorded, total_usage=50, limit=1000))
+            snapshots.append(self.snapshot(self.over_team, recorded, total_usage=1000 + day, limit=1000))
+
+        UsageSnapshot.objects.bulk_create(snapshots)
+
+    def snapshot(self, team: Team, recorded, total_usage: int, limit: int) -> UsageSnapshot:
+        """Return an unsaved usage snapshot."""
+
+        return UsageSnapshot(
+            team=team,
+            cluster=self.cluster,
+            recorded=recorded,
+            total_usage=total_usage,
+            current_usage=total_usage,
+            historical_usage=0,
+            limit=limit
+        )
+
+    def test_exhaustion_dates(self) -> None:
+        """Test exhaustion dates are projected from the latest snapshot using the fitted burn rate."""
+
+        forecasts = forecast_exhaustion(since=self.now - timedelta(days=30))
+        today = timezone.localdate(self.now)
+
+        self.assertEqual(today + timedelta(days=6), forecasts[(self.busy_team.id, self.cluster.id)])
+        self.assertIsNone(forecasts[(self.idle_team.id, self.cluster.id)])
+        self.assertEqual(today, forecasts[(self.over_team.id, self.cluster.id)])
+
+    def test_window(self) -> None:
+        """Test snapshots recorded before the window are ignored."""
+
+        forecasts = forecast_exhaustion(since=self.now - timedelta(hours=1))
+        self.assertIsNone(forecasts[(self.busy_team.id, self.cluster.id)])
+
+    def test_no_snapshots(self) -> None:
+        """Test an empty dictionary is returned when no snapshots exist."""
+
+        self.assertDictEqual(dict(), forecast_exhaustion(since=self.now + timedelta(days=1)))
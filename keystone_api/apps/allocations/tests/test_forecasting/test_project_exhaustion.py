@@ -0,0 +1,32 @@
+"""Unit tests for the `project_exhaustion` function."""
+
+import numpy as np
+from django.test import TestCase
+
+from apps.allocations.forecasting import MAX_HORIZON_DAYS, project_exhaustion
+
+
+class ProjectExhaustion(TestCase):
+    """Test the projection of days until service units are exhausted."""
+
+    def test_positive_burn_rate(self) -> None:
+        """Test remaining service units are divided by the burn rate."""
+
+        np.testing.assert_allclose([10, 2.5], project_exhaustion(np.array([100., 50.]), np.array([10., 20.])))
+
+    def test_exhausted_accounts(self) -> None:
+        """Test accounts without remaining service units are already exhausted."""
+
+        np.testing.assert_allclose([0, 0], project_exhaustion(np.array([0., -5.]), np.array([10., np.nan])))
+
+    def test_accounts_without_usage(self) -> None:
+        """Test accounts with a zero, negative, or unknown burn rate never run out."""
+
+        days = project_exhaustion(np.array([100., 100., 100.]), np.array([0., -1., np.nan]))
+        self.assertTrue(np.isnan(days).all())
+
+    def test_distant_forecasts(self) -> None:
+        """Test forecasts beyond the maximum horizon are discarded."""
+
+        days = project_exhaustion(np.array([MAX_HORIZON_DAYS + 1.]), np.array([1.]))
+        self.assertTrue(np.isnan(days).all())
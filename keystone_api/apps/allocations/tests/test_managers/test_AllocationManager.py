@@ -98,6 +98,23 @@ class GetAllocationData(TestCase):
         expected_allocations = [self.allocation3]
         self.assertQuerySetEqual(expected_allocations, expiring_allocations, ordered=False)
 
+    def test_cluster_expiring_allocations(self) -> None:
+        """Test the `cluster_expiring_allocations` method returns expired allocations for all accounts."""
+
+        other_team = Team.objects.create(name="Research Team 2")
+        other_request = AllocationRequest.objects.create(
+            team=other_team,
+            status='AP',
+            active=timezone.now().date() - timezone.timedelta(days=60),
+            expire=timezone.now().date() - timezone.timedelta(days=10)
+        )
+        other_allocation = Allocation.objects.create(
+            requested=100, awarded=50, cluster=self.cluster, request=other_request
+        )
+
+        expiring_allocations = Allocation.objects.cluster_expiring_allocations(self.cluster)
+        self.assertQuerySetEqual([self.allocation3, other_allocation], expiring_allocations, ordered=True)
+
     def test_active_service_units(self) -> None:
         """Test the `active_service_units` method returns the total awarded service units for active allocations."""
 
@@ -115,3 +132,30 @@ class GetAllocationData(TestCase):
 
         historical_usage = Allocation.objects.historical_usage(self.team, self.cluster)
         self.assertEqual(60, historical_usage)
+
+    def test_service_unit_ledger(self) -> None:
+        """Test the `service_unit_ledger` method returns all service unit totals in a single query."""
+
+        other_team = Team.objects.create(name="Research Team 2")
+        other_request = AllocationRequest.objects.create(
+            team=other_team,
+            status='AP',
+            active=timezone.now().date(),
+            expire=timezone.now().date() + timezone.timedelta(days=30)
+        )
+        Allocation.objects.create(requested=100, awarded=40, cluster=self.cluster, request=other_request)
+
+        with self.assertNumQueries(1):
+            ledger = Allocation.objects.service_unit_ledger(self.cluster)
+
+        self.assertDictEqual({
+            self.team.id: {'active': 80, 'expiring': 70, 'historical': 60},
+            other_team.id: {'active': 40, 'expiring': 0, 'historical': 0},
+        }, ledger)
+
+    def test_service_unit_ledger_filtered_by_account(self) -> None:
+        """Test the `service_unit_ledger` method can be restricted to specific accounts."""
+
+        other_team = Team.objects.create(name="Research Team 2")
+        ledger = Allocation.objects.service_unit_ledger(self.cluster, [other_team])
+        self.assertDictEqual(dict(), ledger)
@@ -0,0 +1,55 @@
+"""Unit tests for the `DailyUsageManager` class."""
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from apps.allocations.models import *
+from apps.users.models import Team
+
+
+class UserTotals(TestCase):
+    """Test the summarization of usage by user."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.team = Team.objects.create(name='account1')
+        self.cluster1 = Cluster.objects.create(name='cluster1')
+        self.cluster2 = Cluster.objects.create(name='cluster2')
+        self.today = date.today()
+        self.yesterday = self.today - timedelta(days=1)
+
+        for day, username, cluster, seconds in (
+            (self.yesterday, 'user1', self.cluster1, 100),
+            (self.today, 'user1', self.cluster1, 50),
+            (self.today, 'user2', self.cluster1, 200),
+            (self.today, 'user1', self.cluster2, 25),
+        ):
+            DailyUsage.objects.create(
+                date=day, username=username, team=self.team, cluster=cluster, jobs=1,
+                billing_seconds=seconds, service_units=seconds / 100
+            )
+
+    def test_totals_are_ordered_by_usage(self) -> None:
+        """Test usage is summed per user and ordered from highest to lowest."""
+
+        totals = DailyUsage.objects.user_totals(self.team)
+        self.assertEqual([('user2', 200), ('user1', 175)], list(totals.items()))
+
+    def test_filter_by_cluster(self) -> None:
+        """Test usage can be restricted to a single cluster."""
+
+        self.assertDictEqual({'user1': 25}, DailyUsage.objects.user_totals(self.team, cluster=self.cluster2))
+
+    def test_filter_by_date(self) -> None:
+        """Test usage can be restricted to a date range."""
+
+        totals = DailyUsage.objects.user_totals(self.team, start=self.yesterday, end=self.yesterday)
+        self.assertDictEqual({'user1': 100}, totals)
+
+    def test_service_units(self) -> None:
+        """Test usage can be summed in weighted service units."""
+
+        totals = DailyUsage.objects.user_totals(self.team, service_units=True)
+        self.assertEqual([('user2', 2.0), ('user1', 1.75)], list(totals.items()))
@@ -0,0 +1,78 @@
+"""Unit tests for the `DirtyAccountManager` class."""
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from apps.allocations.models import *
+from apps.users.models import *
+
+
+class MarkAccounts(TestCase):
+    """Test flagging accounts as dirty."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.team = Team.objects.create(name='account1')
+        self.cluster = Cluster.objects.create(name='cluster1')
+
+    def test_accounts_are_flagged(self) -> None:
+        """Test a record is created for each flagged account."""
+
+        DirtyAccount.objects.mark({(self.team.id, self.cluster.id)})
+        self.assertTrue(DirtyAccount.objects.filter(team=self.team, cluster=self.cluster).exists())
+
+    def test_existing_flags_are_refreshed(self) -> None:
+        """Test flagging an account twice updates the existing record."""
+
+        DirtyAccount.objects.mark({(self.team.id, self.cluster.id)})
+        first_marked = DirtyAccount.objects.get().marked
+
+        DirtyAccount.objects.mark({(self.team.id, self.cluster.id)})
+        self.assertEqual(1, DirtyAccount.objects.count())
+        self.assertGreaterEqual(DirtyAccount.objects.get().marked, first_marked)
+
+    def test_missing_records_are_ignored(self) -> None:
+        """Test accounts referencing deleted teams or clusters are not flagged."""
+
+        DirtyAccount.objects.mark({(self.team.id + 100, self.cluster.id), (self.team.id, self.cluster.id + 100)})
+        self.assertFalse(DirtyAccount.objects.exists())
+
+
+class PendingAccounts(TestCase):
+    """Test the retrieval of accounts pending a limits update."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.dirty_team = Team.objects.create(name='dirty')
+        self.rollover_team = Team.objects.create(name='rollover')
+        self.stable_team = Team.objects.create(name='stable')
+
+        DirtyAccount.objects.mark({(self.dirty_team.id, self.cluster.id)})
+
+        # An allocation that became active today
+        rollover_request = AllocationRequest.objects.create(
+            team=self.rollover_team,
+            status='AP',
+            active=date.today(),
+            expire=date.today() + timedelta(days=30)
+        )
+        Allocation.objects.create(requested=10, awarded=10, cluster=self.cluster, request=rollover_request)
+
+        # An allocation that has been active for a while
+        stable_request = AllocationRequest.objects.create(
+            team=self.stable_team,
+            status='AP',
+            active=date.today() - timedelta(days=30),
+            expire=date.today() + timedelta(days=30)
+        )
+        Allocation.objects.create(requested=10, awarded=10, cluster=self.cluster, request=stable_request)
+
+    def test_pending_accounts(self) -> None:
+        """Test dirty and rollover accounts are returned grouped by cluster."""
+
+        pending = DirtyAccount.objects.pending()
+        self.assertDictEqual({self.cluster.id: {self.dirty_team.id, self.rollover_team.id}}, pending)
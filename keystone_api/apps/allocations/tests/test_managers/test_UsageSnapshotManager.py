@@ -0,0 +1,75 @@
+"""Unit tests for the `UsageSnapshotManager` class."""
+
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.allocations.models import *
+from apps.users.models import Team
+
+
+class Rollup(TestCase):
+    """Test the downsampling of usage snapshots."""
+
+    def setUp(self) -> None:
+        """Create snapshots every 15 minutes over two days."""
+
+        self.team = Team.objects.create(name='account1')
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.start = timezone.make_aware(datetime(2024, 1, 1))
+
+        UsageSnapshot.objects.bulk_create([
+            UsageSnapshot(
+                recorded=self.start + timedelta(minutes=15 * i),
+                team=self.team,
+                cluster=self.cluster,
+                total_usage=i,
+                current_usage=i,
+                historical_usage=0,
+                limit=1000
+            )
+            for i in range(4 * 48)
+        ])
+
+    def test_hourly_rollup(self) -> None:
+        """Test snapshots before the cutoff are reduced to the latest snapshot per hour."""
+
+        cutoff = self.start + timedelta(days=1)
+        deleted = UsageSnapshot.objects.rollup(UsageSnapshot.ResolutionChoices.HOURLY, before=cutoff)
+
+        self.assertEqual(3 * 24, deleted)
+        hourly = UsageSnapshot.objects.filter(recorded__lt=cutoff).order_by('recorded')
+        self.assertEqual(24, hourly.count())
+        self.assertEqual([3, 7, 11], [snapshot.total_usage for snapshot in hourly[:3]])
+        self.assertTrue(all(s.resolution == UsageSnapshot.ResolutionChoices.HOURLY for s in hourly))
+
+        raw = UsageSnapshot.objects.filter(recorded__gte=cutoff)
+        self.assertEqual(4 * 24, raw.count())
+        self.assertTrue(all(s.resolution == UsageSnapshot.ResolutionChoices.RAW for s in raw))
+
+    def test_daily_rollup(self) -> None:
+        """Test hourly and raw snapshots are reduced to the latest snapshot per day."""
+
+        UsageSnapshot.objects.rollup(UsageSnapshot.ResolutionChoices.HOURLY, before=self.start + timedelta(days=1))
+        UsageSnapshot.objects.rollup(UsageSnapshot.ResolutionChoices.DAILY, before=self.start + timedelta(days=2))
+
+        daily = UsageSnapshot.objects.order_by('recorded')
+        self.assertEqual([95, 191], [snapshot.total_usage for snapshot in daily])
+        self.assertTrue(all(s.resolution == UsageSnapshot.ResolutionChoices.DAILY for s in daily))
+
+    def test_rollup_is_idempotent(self) -> None:
+        """Test repeating a rollup does not remove additional snapshots."""
+
+        cutoff = self.start + timedelta(days=1)
+        UsageSnapshot.objects.rollup(UsageSnapshot.ResolutionChoices.HOURLY, before=cutoff)
+        self.assertEqual(0, UsageSnapshot.objects.rollup(UsageSnapshot.ResolutionChoices.HOURLY, before=cutoff))
+
+    def test_coarser_snapshots_are_preserved(self) -> None:
+        """Test an hourly rollup does not modify existing daily snapshots."""
+
+        cutoff = self.start + timedelta(days=1)
+        UsageSnapshot.objects.rollup(UsageSnapshot.ResolutionChoices.DAILY, before=cutoff)
+        UsageSnapshot.objects.rollup(UsageSnapshot.ResolutionChoices.HOURLY, before=cutoff)
+
+        self.assertEqual(1, UsageSnapshot.objects.filter(recorded__lt=cutoff).count())
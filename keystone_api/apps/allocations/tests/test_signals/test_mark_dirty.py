@@ -0,0 +1,64 @@
+"""Unit tests for signal handlers that flag dirty Slurm accounts."""
+
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from apps.allocations.models import *
+from apps.users.models import *
+
+
+class AllocationChanges(TestCase):
+    """Test allocation changes flag the affected account as dirty."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.team = Team.objects.create(name='account1')
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.request = AllocationRequest.objects.create(
+            team=self.team,
+            active=date.today(),
+            expire=date.today() + timedelta(days=30)
+        )
+
+    def assert_dirty(self) -> None:
+        """Assert the test account is flagged as dirty."""
+
+        self.assertTrue(DirtyAccount.objects.filter(team=self.team, cluster=self.cluster).exists())
+
+    def test_allocation_saved(self) -> None:
+        """Test saving an allocation flags the account."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Allocation.objects.create(requested=10, cluster=self.cluster, request=self.request)
+
+        self.assert_dirty()
+
+    def test_allocation_deleted(self) -> None:
+        """Test deleting an allocation flags the account."""
+
+        allocation = Allocation.objects.create(requested=10, cluster=self.cluster, request=self.request)
+        with self.captureOnCommitCallbacks(execute=True):
+            allocation.delete()
+
+        self.assert_dirty()
+
+    def test_request_saved(self) -> None:
+        """Test saving an allocation request flags accounts for all of its allocations."""
+
+        Allocation.objects.create(requested=10, cluster=self.cluster, request=self.request)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.request.status = AllocationRequest.StatusChoices.APPROVED
+            self.request.save()
+
+        self.assert_dirty()
+
+    def test_team_deleted(self) -> None:
+        """Test deleting a team does not leave behind dirty records."""
+
+        Allocation.objects.create(requested=10, cluster=self.cluster, request=self.request)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.delete()
+
+        self.assertFalse(DirtyAccount.objects.exists())
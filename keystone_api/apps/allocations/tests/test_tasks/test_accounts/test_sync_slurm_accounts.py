@@ -0,0 +1,144 @@
+"""Unit tests for the `sync_slurm_accounts` function."""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from apps.allocations.models import Cluster
+from apps.allocations.tasks import sync_slurm_accounts
+from apps.users.models import Team, TeamMembership, User
+
+
+@patch('plugins.scheduler.SlurmCLIBackend.get_principal_investigators')
+@patch('plugins.scheduler.SlurmCLIBackend.get_associations')
+class SyncSlurmAccounts(TestCase):
+    """Test teams and memberships are synchronized against Slurm associations."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        Cluster.objects.create(name='cluster1')
+        Cluster.objects.create(name='cluster2')
+        Cluster.objects.create(name='disabled', enabled=False)
+        for username in ('pi1', 'user1', 'user2', 'user3'):
+            User.objects.create_user(username=username, password='foobar123!')
+
+    def get_memberships(self) -> set[tuple[str, str, str]]:
+        """Return all team memberships as `(team, user, role)` tuples."""
+
+        return set(TeamMembership.objects.values_list('team__name', 'user__username', 'role'))
+
+    def test_teams_and_members_are_created(self, mock_associations: Mock, mock_pis: Mock) -> None:
+        """Test new teams are created with PIs as owners and associated users as members."""
+
+        mock_associations.side_effect = lambda cluster: {
+            'cluster1': {'account1': {'pi1', 'user1'}, 'account2': set()},
+            'cluster2': {'account1': {'user2'}},
+        }[cluster]
+        mock_pis.return_value = {'account1': 'pi1', 'account2': 'user3', 'other': 'user1'}
+
+        results = sync_slurm_accounts()
+
+        self.assertEqual({'account1', 'account2'}, set(Team.objects.values_list('name', flat=True)))
+        self.assertEqual({
+            ('account1', 'pi1', TeamMembership.Role.OWNER),
+            ('account1', 'user1', TeamMembership.Role.MEMBER),
+            ('account1', 'user2', TeamMembership.Role.MEMBER),
+            ('account2', 'user3', TeamMembership.Role.OWNER),
+        }, self.get_memberships())
+        self.assertDictEqual(
+            {'teams_created': 2, 'memberships_created': 4, 'memberships_updated': 0, 'memberships_deleted': 0},
+            results
+        )
+
+    def test_existing_memberships_are_updated(self, mock_associations: Mock, mock_pis: Mock) -> None:
+        """Test roles are updated and memberships missing from Slurm are removed."""
+
+        team = Team.objects.create(name='account1')
+        unmanaged = Team.objects.create(name='unmanaged')
+        team.add_or_update_member(User.objects.get(username='pi1'), TeamMembership.Role.MEMBER)
+        team.add_or_update_member(User.objects.get(username='user1'), TeamMembership.Role.OWNER)
+        team.add_or_update_member(User.objects.get(username='user2'), TeamMembership.Role.ADMIN)
+        team.add_or_update_member(User.objects.get(username='user3'))
+        unmanaged.add_or_update_member(User.objects.get(username='user3'))
+
+        mock_associations.return_value = {'account1': {'pi1', 'user1', 'user2'}}
+        mock_pis.return_value = {'account1': 'pi1'}
+
+        results = sync_slurm_accounts(prune=True)
+
+        self.assertEqual({
+            ('account1', 'pi1', TeamMembership.Role.OWNER),
+            ('account1', 'user1', TeamMembership.Role.MEMBER),
+            ('account1', 'user2', TeamMembership.Role.ADMIN),
+            ('unmanaged', 'user3', TeamMembership.Role.MEMBER),
+        }, self.get_memberships())
+        self.assertDictEqual(
+            {'teams_created': 0, 'memberships_created': 0, 'memberships_updated': 2, 'memberships_deleted': 1},
+            results
+        )
+
+    def test_no_prune(self, mock_associations: Mock, mock_pis: Mock) -> None:
+        """Test memberships missing from Slurm are kept unless pruning is requested."""
+
+        team = Team.objects.create(name='account1')
+        team.add_or_update_member(User.objects.get(username='user3'))
+        mock_associations.return_value = {'account1': {'user1'}}
+        mock_pis.return_value = dict()
+
+        sync_slurm_accounts()
+        self.assertEqual({
+            ('account1', 'user1', TeamMembership.Role.MEMBER),
+            ('account1', 'user3', TeamMembership.Role.MEMBER),
+        }, self.get_memberships())
+
+    def test_owners_are_kept_without_prune(self, mock_associations: Mock, mock_pis: Mock) -> None:
+        """Test owners who are not the account PI keep their role unless pruning is requested."""
+
+        team = Team.objects.create(name='account1')
+        team.add_or_update_member(User.objects.get(username='user1'), TeamMembership.Role.OWNER)
+        mock_associations.return_value = {'account1': {'pi1', 'user1'}}
+        mock_pis.return_value = {'account1': 'pi1'}
+
+        results = sync_slurm_accounts()
+        self.assertEqual(0, results['memberships_updated'])
+        self.assertEqual({
+            ('account1', 'pi1', TeamMembership.Role.OWNER),
+            ('account1', 'user1', TeamMembership.Role.OWNER),
+        }, self.get_memberships())
+
+    def test_admins_are_not_pruned(self, mock_associations: Mock, mock_pis: Mock) -> None:
+        """Test admin memberships assigned in Keystone are kept when pruning."""
+
+        team = Team.objects.create(name='account1')
+        team.add_or_update_member(User.objects.get(username='user2'), TeamMembership.Role.ADMIN)
+        team.add_or_update_member(User.objects.get(username='user3'))
+        mock_associations.return_value = {'account1': {'user1'}}
+        mock_pis.return_value = dict()
+
+        results = sync_slurm_accounts(prune=True)
+        self.assertEqual(1, results['memberships_deleted'])
+        self.assertEqual({
+            ('account1', 'user1', TeamMembership.Role.MEMBER),
+            ('account1', 'user2', TeamMembership.Role.ADMIN),
+        }, self.get_memberships())
+
+    def test_unknown_users_are_skipped(self, mock_associations: Mock, mock_pis: Mock) -> None:
+        """Test associations for usernames without a Keystone account are ignored."""
+
+        mock_associations.return_value = {'account1': {'user1', 'unknown'}}
+        mock_pis.return_value = {'account1': 'also_unknown'}
+
+        sync_slurm_accounts()
+        self.assertEqual({('account1', 'user1', TeamMembership.Role.MEMBER)}, self.get_memberships())
+
+    def test_query_count(self, mock_associations: Mock, mock_pis: Mock) -> None:
+        """Test the number of queries does not grow with the number of accounts or users."""
+
+        mock_associations.return_value = {f'account{i}': {'pi1', 'user1', 'user2', 'user3'} for i in range(10)}
+        mock_pis.return_value = {f'account{i}': 'pi1' for i in range(10)}
+
+        with self.assertNumQueries(9):
+            sync_slurm_accounts()
+
+        self.assertEqual(40, TeamMembership.objects.count())
@@ -0,0 +1,62 @@
+"""Unit tests for the `update_limit_for_account` function."""
+
+from datetime import date, timedelta
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from apps.allocations.models import *
+from apps.allocations.tasks import update_limit_for_account
+from apps.users.models import Team
+
+
+class LimitCalculation(TestCase):
+    """Test the calculation and submission of updated account limits."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.team = Team.objects.create(name='account1')
+
+        active_request = AllocationRequest.objects.create(
+            team=self.team,
+            status=AllocationRequest.StatusChoices.APPROVED,
+            active=date.today() - timedelta(days=10),
+            expire=date.today() + timedelta(days=10)
+        )
+        Allocation.objects.create(requested=100, awarded=100, cluster=self.cluster, request=active_request)
+
+        expired_request = AllocationRequest.objects.create(
+            team=self.team,
+            status=AllocationRequest.StatusChoices.APPROVED,
+            active=date.today() - timedelta(days=30),
+            expire=date.today() - timedelta(days=1)
+        )
+        self.expired = Allocation.objects.create(
+            requested=50, awarded=50, cluster=self.cluster, request=expired_request
+        )
+
+    @patch('plugins.slurm.set_cluster_limit')
+    @patch('plugins.slurm.get_cluster_usage', Mock(return_value=30))
+    @patch('plugins.slurm.get_cluster_limit', Mock(return_value=150))
+    def test_expired_allocations_are_closed(self, mock_set: Mock) -> None:
+        """Test expiring allocations are assigned their final usage and the limit is updated."""
+
+        updated_limit = update_limit_for_account(self.team.id, self.cluster.id)
+
+        self.expired.refresh_from_db()
+        self.assertEqual(30, self.expired.final)
+        self.assertEqual(130, updated_limit)
+        mock_set.assert_called_once_with('account1', 'cluster1', 130)
+
+    @patch('plugins.slurm.set_cluster_limit')
+    @patch('plugins.slurm.get_cluster_usage', Mock(return_value=50))
+    @patch('plugins.slurm.get_cluster_limit', Mock(return_value=150))
+    def test_unchanged_limit_is_not_written(self, mock_set: Mock) -> None:
+        """Test Slurm is not updated when the limit has not changed."""
+
+        updated_limit = update_limit_for_account(self.team.id, self.cluster.id)
+
+        self.assertEqual(150, updated_limit)
+        mock_set.assert_not_called()
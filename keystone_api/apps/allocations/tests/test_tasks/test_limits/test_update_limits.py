@@ -0,0 +1,117 @@
+"""Unit tests for the `update_limits`, `update_limits_for_clusters`, and `summarize_limit_updates` functions."""
+
+from unittest.mock import Mock, patch
+
+from django.test import override_settings, TestCase
+
+from apps.allocations.models import *
+from apps.users.models import Team
+from apps.allocations.tasks import summarize_limit_updates, update_limits, update_limits_for_clusters
+
+
+class SubtaskDispatch(TestCase):
+    """Test clusters are dispatched as parallel Celery subtasks."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.clusters = [Cluster.objects.create(name=f'cluster{i}') for i in range(5)]
+        Cluster.objects.create(name='disabled', enabled=False)
+
+    @override_settings(LIMITS_MAX_CONCURRENCY=2)
+    @patch('apps.allocations.tasks.limits.chord')
+    def test_subtasks_capped_by_concurrency(self, mock_chord: Mock) -> None:
+        """Test enabled clusters are split across a limited number of subtasks."""
+
+        update_limits()
+
+        header = mock_chord.call_args.args[0]
+        self.assertEqual(2, len(header.tasks))
+        self.assertEqual('apps.allocations.tasks.limits.update_limits_for_clusters', header.tasks[0].task)
+
+        dispatched_ids = [args[0] for task in header.tasks for args in task.args[0]]
+        self.assertListEqual([cluster.id for cluster in self.clusters], dispatched_ids)
+
+        callback = mock_chord.return_value.call_args.args[0]
+        self.assertEqual('apps.allocations.tasks.limits.summarize_limit_updates', callback.task)
+
+    @patch('apps.allocations.tasks.limits.chord')
+    def test_no_enabled_clusters(self, mock_chord: Mock) -> None:
+        """Test no subtasks are dispatched when there are no enabled clusters."""
+
+        Cluster.objects.all().delete()
+        update_limits()
+        mock_chord.assert_not_called()
+
+
+class IncrementalDispatch(TestCase):
+    """Test only pending accounts are dispatched in incremental mode."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster1 = Cluster.objects.create(name='cluster1')
+        self.cluster2 = Cluster.objects.create(name='cluster2')
+        self.disabled = Cluster.objects.create(name='disabled', enabled=False)
+        self.team = Team.objects.create(name='account1')
+
+        DirtyAccount.objects.mark({(self.team.id, self.cluster1.id), (self.team.id, self.disabled.id)})
+
+    @patch('apps.allocations.tasks.limits.chord')
+    def test_only_dirty_accounts_dispatched(self, mock_chord: Mock) -> None:
+        """Test subtasks are only dispatched for enabled clusters with pending accounts."""
+
+        update_limits(incremental=True)
+
+        header = mock_chord.call_args.args[0]
+        dispatched_args = [args for task in header.tasks for args in task.args[0]]
+        self.assertListEqual([(self.cluster1.id, True, [self.team.id])], dispatched_args)
+
+    @patch('apps.allocations.tasks.limits.chord')
+    def test_nothing_pending(self, mock_chord: Mock) -> None:
+        """Test no subtasks are dispatched when no accounts are pending."""
+
+        DirtyAccount.objects.all().delete()
+        update_limits(incremental=True)
+        mock_chord.assert_not_called()
+
+
+class ErrorIsolation(TestCase):
+    """Test errors on one cluster do not prevent updates on other clusters."""
+
+    @patch('apps.allocations.tasks.limits.update_limits_for_cluster')
+    def test_remaining_clusters_updated(self, mock_update: Mock) -> None:
+        """Test clusters after a failing cluster are still updated and the failure is reported."""
+
+        result = {'written': 1, 'skipped': 0, 'failed': 0}
+        mock_update.side_effect = [RuntimeError('Test error'), result]
+
+        results = update_limits_for_clusters([(1,), (2,)])
+
+        self.assertEqual(2, mock_update.call_count)
+        mock_update.assert_called_with(2)
+        self.assertListEqual([{'written': 0, 'skipped': 0, 'failed': 0, 'errors': 1}, result], results)
+
+
+class ResultAggregation(TestCase):
+    """Test the aggregation of subtask results."""
+
+    def test_results_are_summed(self) -> None:
+        """Test counts are summed across all clusters."""
+
+        chunk_results = [
+            [{'written': 1, 'skipped': 2, 'failed': 0}, {'written': 3, 'skipped': 0, 'failed': 1}],
+            [{'written': 0, 'skipped': 5, 'failed': 0}],
+        ]
+
+        self.assertDictEqual({'written': 4, 'skipped': 7, 'failed': 1, 'errors': 0}, summarize_limit_updates(chunk_results))
+
+    def test_errors_are_summed(self) -> None:
+        """Test clusters that raised an error are counted."""
+
+        chunk_results = [
+            [{'written': 1, 'skipped': 0, 'failed': 0}, {'written': 0, 'skipped': 0, 'failed': 0, 'errors': 1}],
+            [{'written': 0, 'skipped': 0, 'failed': 0, 'errors': 1}],
+        ]
+
+        self.assertDictEqual({'written': 1, 'skipped': 0, 'failed': 0, 'errors': 2}, summarize_limit_updates(chunk_results))
@@ -0,0 +1,340 @@
+"""Unit tests for the `update_limits_for_cluster` function."""
+
+from datetime import date, timedelta
+from unittest.mock import Mock, patch, PropertyMock
+
+from django.test import override_settings, TestCase
+
+from apps.allocations.models import *
+from apps.allocations.tasks import update_limits_for_cluster
+from apps.allocations.tasks.limits import EMPTY_LEDGER
+from apps.scheduler.locks import LeaseLock
+from apps.users.models import Team
+from plugins.scheduler import get_scheduler_backend
+from tests.utils import LOCMEM_CACHES
+
+
+def snapshot_factory(limits: dict[str, int] | int) -> callable:
+    """Return a `_calculate_account_limit` replacement returning snapshots with the given limits."""
+
+    def calculate(account: Team, cluster: Cluster, **kwargs) -> UsageSnapshot:
+        limit = limits if isinstance(limits, int) else limits[account.name]
+        return UsageSnapshot(
+            team=account, cluster=cluster, total_usage=0, current_usage=0, historical_usage=limit, limit=limit
+        )
+
+    return calculate
+
+
+class SlurmSnapshot(TestCase):
+    """Test Slurm data is fetched once per cluster and shared across accounts."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.team1 = Team.objects.create(name='account1')
+        self.team2 = Team.objects.create(name='account2')
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('apps.allocations.tasks.limits._calculate_account_limit')
+    @patch('plugins.slurm.get_slurm_account_names')
+    @patch('plugins.slurm.get_cluster_usages')
+    @patch('plugins.slurm.get_cluster_limits')
+    def test_snapshot_values_are_forwarded(
+        self, mock_limits: Mock, mock_usages: Mock, mock_names: Mock, mock_calculate: Mock, mock_set: Mock
+    ) -> None:
+        """Test limits and usage values are read from a single snapshot per cluster."""
+
+        mock_calculate.side_effect = snapshot_factory(0)
+        mock_names.return_value = {'root', 'account1', 'account2', 'unknown1', 'unknown2'}
+        mock_limits.return_value = {'root': 0, 'account1': 100}
+        mock_usages.return_value = {'root': 0, 'account1': 50, 'account2': 25}
+
+        with self.assertLogs('apps.allocations.tasks.limits', level='WARNING') as log:
+            update_limits_for_cluster(self.cluster.id)
+
+        # Unknown accounts are reported in a single aggregated warning
+        self.assertEqual(1, len(log.output))
+        self.assertRegex(log.output[0], '.*2 account\\(s\\) on cluster1.*unknown1, unknown2')
+
+        mock_limits.assert_called_once_with('cluster1')
+        mock_usages.assert_called_once_with('cluster1')
+        mock_calculate.assert_any_call(
+            self.team1, self.cluster,
+            current_limit=100, total_usage=50, service_units=EMPTY_LEDGER, expiring_allocations=[]
+        )
+        mock_calculate.assert_any_call(
+            self.team2, self.cluster,
+            current_limit=0, total_usage=25, service_units=EMPTY_LEDGER, expiring_allocations=[]
+        )
+        self.assertEqual(2, mock_calculate.call_count)
+
+
+class BatchLimitWrites(TestCase):
+    """Test updated limits are written to Slurm in a single batch."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        Team.objects.create(name='account1')
+        Team.objects.create(name='account2')
+
+    @patch('plugins.slurm.set_cluster_limit')
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('apps.allocations.tasks.limits._calculate_account_limit')
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value=dict()))
+    def test_limits_written_in_batch(self, mock_calculate: Mock, mock_set_many: Mock, mock_set_one: Mock) -> None:
+        """Test all updated limits are submitted with one batch call by default."""
+
+        mock_calculate.side_effect = snapshot_factory({'account1': 10, 'account2': 20})
+        mock_set_many.return_value = {'account1': True, 'account2': True}
+
+        update_limits_for_cluster(self.cluster.id)
+        mock_set_many.assert_called_once_with('cluster1', {'account1': 10, 'account2': 20})
+        mock_set_one.assert_not_called()
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('apps.allocations.tasks.limits._calculate_account_limit', Mock(side_effect=snapshot_factory(10)))
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value=dict()))
+    def test_failures_are_logged(self, mock_set_many: Mock) -> None:
+        """Test failed batch writes are reported in a single log message."""
+
+        mock_set_many.return_value = {'account1': True, 'account2': False}
+        with self.assertLogs('apps.allocations.tasks.limits', level='ERROR') as log:
+            result = update_limits_for_cluster(self.cluster.id)
+
+        self.assertEqual(1, len(log.output))
+        self.assertRegex(log.output[0], '.*1 account\\(s\\): account2')
+        self.assertDictEqual({'written': 1, 'skipped': 0, 'failed': 1}, result)
+
+    @patch('plugins.slurm.set_cluster_limit')
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('apps.allocations.tasks.limits._calculate_account_limit', Mock(side_effect=snapshot_factory(10)))
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value=dict()))
+    def test_batching_can_be_disabled(self, mock_set_many: Mock, mock_set_one: Mock) -> None:
+        """Test limits are written per account when batching is disabled."""
+
+        mock_set_one.side_effect = [None, RuntimeError('sacctmgr error')]
+
+        result = update_limits_for_cluster(self.cluster.id, batch=False)
+        mock_set_many.assert_not_called()
+        self.assertEqual(2, mock_set_one.call_count)
+        self.assertDictEqual({'written': 1, 'skipped': 0, 'failed': 1}, result)
+
+
+class ChangeDetection(TestCase):
+    """Test unchanged limits are not written to Slurm."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        Team.objects.create(name='account1')
+        Team.objects.create(name='account2')
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('apps.allocations.tasks.limits._calculate_account_limit', Mock(side_effect=snapshot_factory(10)))
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account1': 10, 'account2': 5}))
+    def test_unchanged_limits_are_skipped(self, mock_set_many: Mock) -> None:
+        """Test only changed limits are written and the counts are reported."""
+
+        mock_set_many.return_value = {'account2': True}
+
+        result = update_limits_for_cluster(self.cluster.id)
+        mock_set_many.assert_called_once_with('cluster1', {'account2': 10})
+        self.assertDictEqual({'written': 1, 'skipped': 1, 'failed': 0}, result)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class AllocationCloseOut(TestCase):
+    """Test expired allocations are closed out in bulk."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.allocations = []
+        for i in range(3):
+            team = Team.objects.create(name=f'account{i}')
+            request = AllocationRequest.objects.create(
+                team=team,
+                status=AllocationRequest.StatusChoices.APPROVED,
+                active=date.today() - timedelta(days=30),
+                expire=date.today() - timedelta(days=1)
+            )
+            self.allocations.append(
+                Allocation.objects.create(requested=100, awarded=100, cluster=self.cluster, request=request)
+            )
+
+    @patch('plugins.slurm.set_cluster_limits', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account0', 'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value={'account0': 10, 'account1': 20, 'account2': 200}))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account0': 100, 'account1': 100, 'account2': 100}))
+    def test_final_usage_is_saved(self) -> None:
+        """Test final usage values are assigned to every expiring allocation."""
+
+        update_limits_for_cluster(self.cluster.id)
+
+        finals = [Allocation.objects.get(pk=allocation.pk).final for allocation in self.allocations]
+        self.assertListEqual([10, 20, 100], finals)
+
+    @patch('plugins.slurm.set_cluster_limits', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account0', 'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value={'account0': 10, 'account1': 20, 'account2': 200}))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account0': 100, 'account1': 100, 'account2': 100}))
+    def test_usage_snapshots_are_recorded(self) -> None:
+        """Test a usage snapshot is recorded for every account with a shared timestamp."""
+
+        update_limits_for_cluster(self.cluster.id)
+
+        snapshots = UsageSnapshot.objects.filter(cluster=self.cluster).order_by('team__name')
+        self.assertEqual(1, len({snapshot.recorded for snapshot in snapshots}))
+        self.assertListEqual([10, 20, 200], [snapshot.total_usage for snapshot in snapshots])
+        self.assertListEqual([10, 20, 100], [snapshot.historical_usage for snapshot in snapshots])
+        self.assertListEqual([10, 20, 100], [snapshot.limit for snapshot in snapshots])
+
+    @patch('plugins.slurm.set_cluster_limits', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account0', 'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account0': 100, 'account1': 100, 'account2': 100}))
+    def test_constant_query_count(self) -> None:
+        """Test allocations are closed out using a constant number of queries."""
+
+        # One query each for the cluster, team lookup, ledger, and expiring allocations
+        # The bulk update and snapshot insert (with savepoint) and a single query to clear dirty account flags
+        with self.assertNumQueries(4 + 4 + 1):
+            update_limits_for_cluster(self.cluster.id)
+
+
+class IncrementalUpdates(TestCase):
+    """Test limit updates restricted to specific accounts."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.team1 = Team.objects.create(name='account1')
+        self.team2 = Team.objects.create(name='account2')
+        self.team3 = Team.objects.create(name='account3')
+        DirtyAccount.objects.mark({(self.team1.id, self.cluster.id), (self.team2.id, self.cluster.id)})
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('plugins.slurm.get_slurm_account_names')
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account1': 10, 'account2': 10, 'account3': 10}))
+    def test_only_given_accounts_processed(self, mock_names: Mock, mock_set_many: Mock) -> None:
+        """Test only the requested accounts are updated and their dirty flags are cleared."""
+
+        mock_set_many.return_value = {'account1': True}
+        update_limits_for_cluster(self.cluster.id, account_ids=[self.team1.id])
+
+        mock_names.assert_not_called()
+        mock_set_many.assert_called_once_with('cluster1', {'account1': 0})
+        self.assertQuerySetEqual(
+            [self.team2.id], DirtyAccount.objects.values_list('team', flat=True), ordered=False
+        )
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1', 'account2'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account1': 10, 'account2': 10}))
+    def test_failed_accounts_remain_dirty(self, mock_set_many: Mock) -> None:
+        """Test accounts that failed to update are not cleared."""
+
+        mock_set_many.return_value = {'account1': True, 'account2': False}
+        update_limits_for_cluster(self.cluster.id)
+
+        self.assertQuerySetEqual(
+            [self.team2.id], DirtyAccount.objects.values_list('team', flat=True), ordered=False
+        )
+
+
+@override_settings(SCHEDULER_BACKEND='plugins.scheduler.InMemoryBackend')
+class SchedulerBackendIntegration(TestCase):
+    """Test limits are read from and written to the configured scheduler backend."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        for i, awarded in enumerate((100, 200)):
+            team = Team.objects.create(name=f'account{i}')
+            request = AllocationRequest.objects.create(
+                team=team,
+                status=AllocationRequest.StatusChoices.APPROVED,
+                active=date.today() - timedelta(days=1),
+                expire=date.today() + timedelta(days=30)
+            )
+            Allocation.objects.create(requested=awarded, awarded=awarded, cluster=self.cluster, request=request)
+
+        self.scheduler = get_scheduler_backend()
+        self.scheduler.add_accounts('cluster1', ['root', 'account0', 'account1'], limits=[0, 100, 0], usage=[0, 10, 0])
+
+    def test_limits_are_updated(self) -> None:
+        """Test changed limits are written to the backend and unchanged limits are skipped."""
+
+        results = update_limits_for_cluster(self.cluster.id)
+        self.assertDictEqual({'written': 1, 'skipped': 1, 'failed': 0}, results)
+        self.assertDictEqual({'root': 0, 'account0': 100, 'account1': 200}, self.scheduler.get_limits('cluster1'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class OverlapProtection(TestCase):
+    """Test concurrent updates for the same cluster do not overlap."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        Team.objects.create(name='account1')
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account1': 100}))
+    def test_locked_cluster_is_skipped(self, mock_set_many: Mock) -> None:
+        """Test an update is skipped while another update holds the cluster lock."""
+
+        lock = LeaseLock(f'update_limits:{self.cluster.id}')
+        self.assertTrue(lock.acquire())
+        with lock:
+            result = update_limits_for_cluster(self.cluster.id)
+
+        self.assertDictEqual({'written': 0, 'skipped': 0, 'failed': 0}, result)
+        mock_set_many.assert_not_called()
+        self.assertFalse(UsageSnapshot.objects.exists())
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account1': 100}))
+    def test_lock_is_released(self, mock_set_many: Mock) -> None:
+        """Test the cluster lock is released once an update completes."""
+
+        mock_set_many.return_value = {'account1': True}
+        update_limits_for_cluster(self.cluster.id)
+        update_limits_for_cluster(self.cluster.id)
+        self.assertEqual(2, mock_set_many.call_count)
+
+    @patch('plugins.slurm.set_cluster_limits')
+    @patch('plugins.slurm.get_slurm_account_names', Mock(return_value={'account1'}))
+    @patch('plugins.slurm.get_cluster_usages', Mock(return_value=dict()))
+    @patch('plugins.slurm.get_cluster_limits', Mock(return_value={'account1': 100}))
+    def test_lost_lock_skips_writes(self, mock_set_many: Mock) -> None:
+        """Test limits are not written to Slurm if the lock is lost during an update."""
+
+        with patch('apps.scheduler.locks.LeaseLock.lost', new_callable=PropertyMock, return_value=True):
+            result = update_limits_for_cluster(self.cluster.id)
+
+        mock_set_many.assert_not_called()
+        self.assertDictEqual({'written': 0, 'skipped': 0, 'failed': 1}, result)
@@ -1,29 +1,180 @@
 """Unit tests for the `notify_upcoming_expirations` function."""
 
-from unittest.mock import MagicMock, Mock, patch
+from datetime import date, timedelta
+from unittest.mock import Mock, patch
 
 from django.test import TestCase
+from django.utils import timezone
 
+from apps.allocations.models import AllocationRequest
 from apps.allocations.tasks import notify_upcoming_expirations
+from apps.notifications.models import Notification, Preference
+from apps.users.models import Team, User
+
+
+class ExpirationNotifications(TestCase):
+    """Test notifications are issued for allocations nearing expiration."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.team = Team.objects.create(name='team1')
+        self.user = self.create_member('user1')
+        self.request = AllocationRequest.objects.create(
+            title='Request',
+            description='Description',
+            team=self.team,
+            status=AllocationRequest.StatusChoices.APPROVED,
+            active=date.today() - timedelta(days=10),
+            expire=date.today() + timedelta(days=7)
+        )
+
+    def create_member(self, username: str, **kwargs) -> User:
+        """Create a user who joined well before any notification threshold and add them to the test team."""
+
+        user = User.objects.create_user(username=username, password='foobar123!', email=f'{username}@example.com', **kwargs)
+        user.date_joined = timezone.now() - timedelta(days=365)
+        user.save()
+
+        self.team.add_or_update_member(user)
+        return user
+
+    def get_notifications(self) -> list[Notification]:
+        """Return all expiration notifications ordered by creation."""
+
+        return list(Notification.objects.filter(notification_type=Notification.NotificationType.request_expiring).order_by('id'))
+
+    def test_threshold_reached(self) -> None:
+        """Test a notification is issued once a threshold is reached."""
+
+        Preference.objects.create(user=self.user, request_expiry_thresholds=[7])
+        notify_upcoming_expirations()
+
+        notifications = self.get_notifications()
+        self.assertEqual(1, len(notifications))
+        self.assertEqual(self.user, notifications[0].user)
+        self.assertEqual(self.request.id, notifications[0].metadata['request_id'])
+        self.assertEqual(7, notifications[0].metadata['days_to_expire'])
+
+    def test_threshold_not_reached(self) -> None:
+        """Test no notification is issued before the first threshold is reached."""
+
+        Preference.objects.create(user=self.user, request_expiry_thresholds=[5])
+        notify_upcoming_expirations()
+        self.assertFalse(self.get_notifications())
+
+    def test_duplicate_notifications(self) -> None:
+        """Test notifications are only issued once per threshold."""
+
+        Preference.objects.create(user=self.user, request_expiry_thresholds=[7, 14])
+        notify_upcoming_expirations()
+        notify_upcoming_expirations()
+        self.assertEqual(1, len(self.get_notifications()))
+
+    def test_notifications_without_threshold(self) -> None:
+        """Test historical notifications missing the `days_to_expire` metadata are ignored."""
+
+        Notification.objects.create(
+            user=self.user,
+            message='Message',
+            subject='Subject',
+            notification_type=Notification.NotificationType.request_expiring,
+            metadata={'request_id': self.request.id}
+        )
+
+        Preference.objects.create(user=self.user, request_expiry_thresholds=[7])
+        notify_upcoming_expirations()
+        self.assertEqual(2, len(self.get_notifications()))
+
+    def test_new_users_skipped(self) -> None:
+        """Test users who joined after the notification threshold are not notified."""
+
+        self.user.date_joined = timezone.now()
+        self.user.save()
+
+        Preference.objects.create(user=self.user, request_expiry_thresholds=[7])
+        notify_upcoming_expirations()
+        self.assertFalse(self.get_notifications())
+
+    def test_inactive_users_skipped(self) -> None:
+        """Test inactive team members are not notified."""
+
+        self.user.is_active = False
+        self.user.save()
+
+        Preference.objects.create(user=self.user, request_expiry_thresholds=[7])
+        notify_upcoming_expirations()
+        self.assertFalse(self.get_notifications())
+
+    def test_default_preferences(self) -> None:
+        """Test users without saved preferences are notified using the default thresholds."""
+
+        notify_upcoming_expirations()
+
+        self.assertEqual([7], [n.metadata['days_to_expire'] for n in self.get_notifications()])
+        self.assertFalse(Preference.objects.exists())
+
+    def test_bulk_queries(self) -> None:
+        """Test the number of queries does not grow with the number of team members or requests."""
+
+        for i in range(5):
+            self.create_member(f'member{i}')
+
+        for i in range(3):
+            AllocationRequest.objects.create(
+                title=f'Request {i}',
+                description='Description',
+                team=self.team,
+                status=AllocationRequest.StatusChoices.APPROVED,
+                active=date.today() - timedelta(days=10),
+                expire=date.today() + timedelta(days=7)
+            )
+
+        with patch('apps.allocations.tasks.notifications.send_notification_batch') as mock_send:
+            with self.assertNumQueries(4):
+                notify_upcoming_expirations()
+
+        mock_send.assert_called_once()
+        self.assertEqual(24, len(mock_send.call_args.args[0]))
+
+    def test_shared_rendering(self) -> None:
+        """Test request details are rendered once per request regardless of the number of recipients."""
+
+        for i in range(5):
+            self.create_member(f'member{i}')
+
+        with patch('apps.allocations.tasks.notifications.render_notification_upcoming_expiration', return_value=[]) as mock_render:
+            notify_upcoming_expirations()
+
+        mock_render.assert_called_once()
+        self.assertEqual(6, len(mock_render.call_args.args[0]))
 
 
 class FailureReporting(TestCase):
     """Test the reporting of task failure."""
 
-    @patch('apps.allocations.tasks.should_notify_past_expiration')
-    @patch('apps.allocations.models.AllocationRequest.objects.filter')
-    def test_raises_error_on_failure(self, mock_filter: Mock, mock_should_notify: Mock) -> None:
+    @patch('apps.allocations.tasks.notifications.send_notification_batch')
+    def test_raises_error_on_failure(self, mock_send: Mock) -> None:
         """Test a RuntimeError is raised when one or more notifications fail.
 
         Raising an error on failure is required to ensure Celery tasks
         report the correct status on exit.
         """
 
-        mock_user = MagicMock()
-        mock_request = MagicMock()
-        mock_request.team.get_all_members.return_value.filter.return_value = [mock_user]
-        mock_filter.return_value.all.return_value = [mock_request]
+        team = Team.objects.create(name='team1')
+        user = User.objects.create_user(username='user1', password='foobar123!')
+        user.date_joined = timezone.now() - timedelta(days=365)
+        user.save()
+        team.add_or_update_member(user)
+
+        AllocationRequest.objects.create(
+            title='Request',
+            description='Description',
+            team=team,
+            status=AllocationRequest.StatusChoices.APPROVED,
+            expire=date.today() + timedelta(days=7)
+        )
 
-        mock_should_notify.side_effect = Exception("Test error")
+        mock_send.side_effect = Exception("Test error")
         with self.assertRaisesRegex(RuntimeError, 'Task failed with one or more errors.*'):
             notify_upcoming_expirations()
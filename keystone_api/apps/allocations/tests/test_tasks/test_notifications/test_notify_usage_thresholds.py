@@ -0,0 +1,167 @@
+"""Unit tests for the `notify_usage_thresholds` function."""
+
+from datetime import date, timedelta
+from unittest.mock import Mock, patch
+
+from django.test import override_settings, TestCase
+from django.utils import timezone
+
+from apps.allocations.models import *
+from apps.allocations.tasks import notify_usage_thresholds
+from apps.notifications.models import Notification, Preference
+from apps.users.models import Team, User
+from plugins.scheduler import get_scheduler_backend
+
+
+@override_settings(SCHEDULER_BACKEND='plugins.scheduler.InMemoryBackend')
+class ThresholdNotifications(TestCase):
+    """Test notifications are issued when allocations cross a usage threshold."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.team = Team.objects.create(name='account1')
+        self.user = User.objects.create_user(username='user1', password='foobar123!', email='user1@example.com')
+        self.team.add_or_update_member(self.user)
+        Preference.objects.create(user=self.user, allocation_usage_thresholds=[50, 90])
+
+        request = AllocationRequest.objects.create(
+            title='Request',
+            description='Description',
+            team=self.team,
+            status=AllocationRequest.StatusChoices.APPROVED,
+            active=date.today() - timedelta(days=10),
+            expire=date.today() + timedelta(days=30)
+        )
+        self.allocation = Allocation.objects.create(requested=100, awarded=100, cluster=self.cluster, request=request)
+
+        self.scheduler = get_scheduler_backend()
+
+    def set_usage(self, usage: int) -> None:
+        """Set the scheduler usage for the test account."""
+
+        self.scheduler.add_accounts('cluster1', ['account1'], limits=[100], usage=[usage])
+
+    def get_notifications(self) -> list[Notification]:
+        """Return all usage notifications ordered by creation."""
+
+        return list(Notification.objects.filter(notification_type=Notification.NotificationType.usage_threshold).order_by('id'))
+
+    def test_no_threshold_crossed(self) -> None:
+        """Test no notification is issued below the lowest threshold."""
+
+        self.set_usage(49)
+        notify_usage_thresholds()
+        self.assertFalse(self.get_notifications())
+
+    def test_threshold_crossed(self) -> None:
+        """Test a notification is issued for the highest crossed threshold."""
+
+        self.set_usage(60)
+        notify_usage_thresholds()
+
+        notifications = self.get_notifications()
+        self.assertEqual(1, len(notifications))
+        self.assertEqual(self.user, notifications[0].user)
+        self.assertEqual(self.team.id, notifications[0].metadata['team_id'])
+        self.assertEqual(self.cluster.id, notifications[0].metadata['cluster_id'])
+        self.assertEqual(50, notifications[0].metadata['threshold'])
+        self.assertEqual(60, notifications[0].metadata['usage_percentage'])
+
+    def test_duplicate_notifications(self) -> None:
+        """Test notifications are only issued once per threshold."""
+
+        self.set_usage(60)
+        notify_usage_thresholds()
+        notify_usage_thresholds()
+        self.assertEqual(1, len(self.get_notifications()))
+
+        self.set_usage(95)
+        notify_usage_thresholds()
+        notify_usage_thresholds()
+        self.assertEqual([50, 90], [n.metadata['threshold'] for n in self.get_notifications()])
+
+    def test_multiple_allocations(self) -> None:
+        """Test a team with multiple active allocations on a cluster is notified once on their combined usage."""
+
+        request = AllocationRequest.objects.create(
+            title='Second request',
+            description='Description',
+            team=self.team,
+            status=AllocationRequest.StatusChoices.APPROVED,
+            active=date.today() - timedelta(days=20),
+            expire=date.today() + timedelta(days=30)
+        )
+        Allocation.objects.create(requested=100, awarded=100, cluster=self.cluster, request=request)
+
+        self.set_usage(120)
+        notify_usage_thresholds()
+
+        notifications = self.get_notifications()
+        self.assertEqual(1, len(notifications))
+        self.assertEqual(60, notifications[0].metadata['usage_percentage'])
+
+    def test_new_allocation_resets_thresholds(self) -> None:
+        """Test thresholds notified before the latest allocation became active are notified again."""
+
+        self.set_usage(60)
+        notify_usage_thresholds()
+        Notification.objects.update(time=timezone.now() - timedelta(days=11))
+
+        notify_usage_thresholds()
+        self.assertEqual([50, 50], [n.metadata['threshold'] for n in self.get_notifications()])
+
+    def test_historical_usage_is_excluded(self) -> None:
+        """Test usage charged against expired allocations does not count toward utilization."""
+
+        request = AllocationRequest.objects.create(
+            title='Expired',
+            description='Description',
+            team=self.team,
+            status=AllocationRequest.StatusChoices.APPROVED,
+            active=date.today() - timedelta(days=60),
+            expire=date.today() - timedelta(days=30)
+        )
+        Allocation.objects.create(requested=100, awarded=100, final=100, cluster=self.cluster, request=request)
+
+        self.set_usage(140)
+        notify_usage_thresholds()
+        self.assertFalse(self.get_notifications())
+
+    def test_default_preferences(self) -> None:
+        """Test users without saved preferences are notified using the default thresholds."""
+
+        Preference.objects.all().delete()
+        self.set_usage(80)
+        notify_usage_thresholds()
+
+        self.assertEqual([75], [n.metadata['threshold'] for n in self.get_notifications()])
+        self.assertFalse(Preference.objects.exists())
+
+    def test_bulk_queries(self) -> None:
+        """Test the number of queries does not grow with the number of team members."""
+
+        self.set_usage(95)
+        for i in range(5):
+            self.team.add_or_update_member(User.objects.create_user(username=f'member{i}', password='foobar123!'))
+
+        with patch('apps.allocations.tasks.notifications.send_notification_usage_threshold') as mock_send:
+            with self.assertNumQueries(7):
+                notify_usage_thresholds()
+
+        mock_send.assert_called_once()
+        self.assertEqual(6, len(mock_send.call_args.args[0]))
+
+
+class FailureReporting(TestCase):
+    """Test the reporting of task failure."""
+
+    @patch('apps.allocations.tasks.notifications.get_scheduler_backend')
+    def test_raises_error_on_failure(self, mock_backend: Mock) -> None:
+        """Test a RuntimeError is raised when usage cannot be retrieved for a cluster."""
+
+        Cluster.objects.create(name='cluster1')
+        mock_backend.return_value.get_usages.side_effect = RuntimeError('Test error')
+        with self.assertRaisesRegex(RuntimeError, 'Task failed with one or more errors.*'):
+            notify_usage_thresholds()
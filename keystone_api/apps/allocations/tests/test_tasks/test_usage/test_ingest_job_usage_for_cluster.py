@@ -0,0 +1,194 @@
+"""Unit tests for the `ingest_job_usage_for_cluster` function."""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.test import override_settings, TestCase
+from django.utils import timezone
+
+from apps.allocations.models import *
+from apps.allocations.tasks import ingest_job_usage_for_cluster
+from apps.users.models import Team
+
+
+def job(user: str, account: str, end: timezone.datetime | None, elapsed: int = 60, billing: int = 2) -> dict:
+    """Return a job record in the format yielded by `iter_job_records`."""
+
+    return {
+        'job_id': '1', 'user': user, 'account': account, 'end': end, 'elapsed': elapsed,
+        'billing': billing, 'cpu': 2, 'mem': 1024, 'gpu': 1
+    }
+
+
+@override_settings(USAGE_INGEST_DELAY=0)
+class UsageAggregation(TestCase):
+    """Test job records are aggregated by user, account, and day."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        self.team1 = Team.objects.create(name='account1')
+        self.team2 = Team.objects.create(name='account2')
+        self.now = timezone.now()
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_jobs_are_aggregated(self, mock_records: Mock) -> None:
+        """Test jobs for the same user, account, and day are summed into a single record."""
+
+        ended = self.now - timedelta(minutes=5)
+        mock_records.return_value = iter([
+            job('user1', 'account1', ended, elapsed=60, billing=2),
+            job('user1', 'account1', ended, elapsed=30, billing=4),
+            job('user2', 'account1', ended, elapsed=10, billing=1),
+            job('user1', 'account2', ended, elapsed=10, billing=1),
+        ])
+
+        self.assertEqual(4, ingest_job_usage_for_cluster(self.cluster.id))
+        record = DailyUsage.objects.get(username='user1', team=self.team1)
+        self.assertEqual(2, record.jobs)
+        self.assertEqual(240, record.billing_seconds)
+        self.assertEqual(180, record.cpu_seconds)
+        self.assertEqual(92160, record.mem_seconds)
+        self.assertEqual(90, record.gpu_seconds)
+        self.assertEqual(timezone.localdate(ended), record.date)
+        self.assertEqual(3, DailyUsage.objects.count())
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_unfinished_and_unknown_jobs_are_skipped(self, mock_records: Mock) -> None:
+        """Test running jobs and jobs for unknown accounts are ignored."""
+
+        ended = self.now - timedelta(minutes=5)
+        mock_records.return_value = iter([
+            job('user1', 'account1', None),
+            job('user1', 'unknown', ended),
+            job('user1', 'account1', ended),
+        ])
+
+        with self.assertLogs('apps.allocations.tasks.usage', level='WARNING'):
+            self.assertEqual(1, ingest_job_usage_for_cluster(self.cluster.id))
+
+        self.assertEqual(1, DailyUsage.objects.count())
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_batches_are_merged(self, mock_records: Mock) -> None:
+        """Test usage flushed in separate batches is added to existing records."""
+
+        ended = self.now - timedelta(minutes=5)
+        mock_records.return_value = iter([
+            job('user1', 'account1', ended),
+            job('user2', 'account1', ended),
+            job('user1', 'account1', ended),
+        ])
+
+        ingest_job_usage_for_cluster(self.cluster.id, batch_size=1)
+        record = DailyUsage.objects.get(username='user1')
+        self.assertEqual(2, record.jobs)
+        self.assertEqual(240, record.billing_seconds)
+        self.assertEqual(120, record.gpu_seconds)
+        self.assertAlmostEqual(240 / 3600, record.service_units)
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_service_units_use_cluster_weights(self, mock_records: Mock) -> None:
+        """Test service units are calculated from raw TRES usage using the cluster TRES weights."""
+
+        self.cluster.cpu_weight = 1
+        self.cluster.mem_weight = 0.5
+        self.cluster.gpu_weight = 10
+        self.cluster.save()
+
+        ended = self.now - timedelta(minutes=5)
+        mock_records.return_value = iter([job('user1', 'account1', ended, elapsed=3600)])
+
+        ingest_job_usage_for_cluster(self.cluster.id)
+
+        # 2 CPU hours + 1 GB hour of memory at 0.5 + 1 GPU hour at 10
+        self.assertAlmostEqual(12.5, DailyUsage.objects.get().service_units)
+
+
+@override_settings(USAGE_INGEST_DELAY=0)
+class IngestionCursor(TestCase):
+    """Test the ingestion cursor makes repeated runs idempotent."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        Team.objects.create(name='account1')
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_cursor_is_created(self, mock_records: Mock) -> None:
+        """Test the cursor is initialized and advanced on the first run."""
+
+        mock_records.return_value = iter([])
+        ingest_job_usage_for_cluster(self.cluster.id)
+
+        cursor = UsageCursor.objects.get(cluster=self.cluster)
+        _, start, end = mock_records.call_args.args
+        self.assertEqual(end, cursor.last_ingested)
+        self.assertLess(start, end)
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_reruns_are_idempotent(self, mock_records: Mock) -> None:
+        """Test jobs ending before the cursor are not counted again."""
+
+        ended = timezone.now() - timedelta(minutes=5)
+        mock_records.side_effect = lambda *args: iter([job('user1', 'account1', ended)])
+
+        self.assertEqual(1, ingest_job_usage_for_cluster(self.cluster.id))
+        self.assertEqual(0, ingest_job_usage_for_cluster(self.cluster.id))
+        self.assertEqual(1, DailyUsage.objects.get().jobs)
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_failed_runs_are_rolled_back(self, mock_records: Mock) -> None:
+        """Test usage records and the cursor are unchanged when reading job records fails."""
+
+        ended = timezone.now() - timedelta(minutes=5)
+        previous = timezone.now() - timedelta(hours=1)
+        UsageCursor.objects.create(cluster=self.cluster, last_ingested=previous)
+
+        def records(*args):
+            yield job('user1', 'account1', ended)
+            raise RuntimeError('sacct failed')
+
+        mock_records.side_effect = records
+        with self.assertRaises(RuntimeError):
+            ingest_job_usage_for_cluster(self.cluster.id, batch_size=1)
+
+        self.assertFalse(DailyUsage.objects.exists())
+        self.assertEqual(previous, UsageCursor.objects.get().last_ingested)
+
+
+@override_settings(USAGE_INGEST_DELAY=3600)
+class IngestionDelay(TestCase):
+    """Test the ingestion window lags behind the current time."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.cluster = Cluster.objects.create(name='cluster1')
+        Team.objects.create(name='account1')
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_window_ends_in_the_past(self, mock_records: Mock) -> None:
+        """Test the ingestion window and cursor end `USAGE_INGEST_DELAY` seconds before the current time."""
+
+        mock_records.return_value = iter([])
+        ingest_job_usage_for_cluster(self.cluster.id)
+
+        _, _, end = mock_records.call_args.args
+        self.assertAlmostEqual(timezone.now() - timedelta(hours=1), end, delta=timedelta(seconds=5))
+        self.assertEqual(end, UsageCursor.objects.get().last_ingested)
+
+    @patch('plugins.slurm.iter_job_records')
+    def test_late_records_are_counted(self, mock_records: Mock) -> None:
+        """Test jobs ending within the delay are skipped and counted by a later run once they are in the window."""
+
+        ended = timezone.now() - timedelta(minutes=5)
+        mock_records.side_effect = lambda *args: iter([job('user1', 'account1', ended)])
+        self.assertEqual(0, ingest_job_usage_for_cluster(self.cluster.id))
+
+        with override_settings(USAGE_INGEST_DELAY=0):
+            self.assertEqual(1, ingest_job_usage_for_cluster(self.cluster.id))
+
+        self.assertEqual(1, DailyUsage.objects.get().jobs)
@@ -0,0 +1,74 @@
+"""Unit tests for the `update_exhaustion_forecasts` task."""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from apps.allocations.models import *
+from apps.allocations.tasks import update_exhaustion_forecasts
+from apps.users.models import Team
+
+
+class UpdateExhaustionForecasts(TestCase):
+    """Test exhaustion dates are assigned to active allocations."""
+
+    def setUp(self) -> None:
+        """Create test data."""
+
+        self.today = date.today()
+        self.team = Team.objects.create(name='account1')
+        self.cluster = Cluster.objects.create(name='cluster1')
+
+        self.short = self.create_allocation(expire=self.today + timedelta(days=5))
+        self.long = self.create_allocation(expire=self.today + timedelta(days=60))
+        self.expired = self.create_allocation(expire=self.today - timedelta(days=1), exhaustion=self.today)
+
+    def create_allocation(self, expire: date, exhaustion: date | None = None) -> Allocation:
+        """Create an approved allocation for the test team."""
+
+        request = AllocationRequest.objects.create(
+            title='Request',
+            description='Description',
+            team=self.team,
+            status='AP',
+            active=self.today - timedelta(days=30),
+            expire=expire
+        )
+
+        return Allocation.objects.create(
+            requested=1000, awarded=1000, cluster=self.cluster, request=request, exhaustion=exhaustion
+        )
+
+    @patch('apps.allocations.tasks.usage.forecast_exhaustion')
+    def test_active_allocations_are_updated(self, mock_forecast) -> None:
+        """Test forecasts are only stored for allocations that expire after the projected date."""
+
+        exhaustion = self.today + timedelta(days=10)
+        mock_forecast.return_value = {(self.team.id, self.cluster.id): exhaustion}
+
+        self.assertEqual(1, update_exhaustion_forecasts())
+        self.short.refresh_from_db()
+        self.long.refresh_from_db()
+        self.assertIsNone(self.short.exhaustion)
+        self.assertEqual(exhaustion, self.long.exhaustion)
+
+    @patch('apps.allocations.tasks.usage.forecast_exhaustion')
+    def test_inactive_allocations_are_cleared(self, mock_forecast) -> None:
+        """Test forecasts are removed from allocations that are no longer active."""
+
+        mock_forecast.return_value = dict()
+
+        update_exhaustion_forecasts()
+        self.expired.refresh_from_db()
+        self.assertIsNone(self.expired.exhaustion)
+
+    @patch('apps.allocations.tasks.usage.forecast_exhaustion')
+    def test_exhaustion_is_filterable(self, mock_forecast) -> None:
+        """Test allocations running out soon can be selected with an indexed date query."""
+
+        mock_forecast.return_value = {(self.team.id, self.cluster.id): self.today + timedelta(days=10)}
+
+        update_exhaustion_forecasts()
+        running_out = Allocation.objects.filter(exhaustion__lte=self.today + timedelta(days=14))
+        self.assertQuerySetEqual(running_out, [self.long])
@@ -18,4 +18,5 @@ urlpatterns = router.urls
 urlpatterns += [
     path('allocation-request/status-choices/', AllocationRequestStatusChoicesView.as_view()),
     path('allocation-review/status-choices/', AllocationReviewStatusChoicesView.as_view()),
+    path('usage-series/', UsageSeriesView.as_view()),
 ]
@@ -4,8 +4,11 @@ View objects handle the processing of incoming HTTP requests and return the
 appropriately rendered HTML template or other HTTP response.
 """
 
-from drf_spectacular.utils import extend_schema
-from rest_framework import permissions, status, viewsets
+from datetime import timedelta
+
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import permissions, serializers, status, viewsets
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 
@@ -21,7 +24,8 @@ __all__ = [
     'AllocationReviewViewSet',
     'AllocationViewSet',
     'AttachmentViewSet',
-    'ClusterViewSet'
+    'ClusterViewSet',
+    'UsageSeriesView',
 ]
 
 
@@ -141,3 +145,55 @@ class ClusterViewSet(viewsets.ModelViewSet):
     serializer_class = ClusterSerializer
     search_fields = ['name', 'description']
     permission_classes = [permissions.IsAuthenticated, StaffWriteAuthenticatedRead]
+
+
+class UsageSeriesView(GenericAPIView):
+    """Usage snapshot time series for plotting account burn-down.
+
+    Snapshots are filtered using the standard query parameters (e.g., `team`, `cluster`,
+    `recorded__gte`, and `recorded__lte`) and are returned as columnar arrays ordered by time.
+    Requests without a `recorded__gte` or `recorded__gt` lower bound are limited to snapshots
+    recorded within the `default_window` preceding the request.
+    """
+
+    queryset = UsageSnapshot.objects.all()
+    permission_classes = [permissions.IsAuthenticated]
+    columns = ('recorded', 'team', 'cluster', 'total_usage', 'current_usage', 'historical_usage', 'limit')
+    default_window = timedelta(days=30)
+
+    def get_queryset(self) -> list[UsageSnapshot]:
+        """Return a list of usage snapshots for the currently authenticated user."""
+
+        if self.request.user.is_staff:
+            return self.queryset
+
+        teams = Team.objects.teams_for_user(self.request.user)
+        return UsageSnapshot.objects.filter(team__in=teams)
+
+    def filter_queryset(self, queryset: list[UsageSnapshot]) -> list[UsageSnapshot]:
+        """Filter usage snapshots using the request parameters and bound the default time range."""
+
+        queryset = super().filter_queryset(queryset)
+        if not {'recorded__gte', 'recorded__gt'} & self.request.query_params.keys():
+            queryset = queryset.filter(recorded__gte=timezone.now() - self.default_window)
+
+        return queryset
+
+    @extend_schema(responses={
+        '200': inline_serializer('usage_series', fields={
+            'recorded': serializers.ListField(child=serializers.DateTimeField()),
+            'team': serializers.ListField(child=serializers.IntegerField()),
+            'cluster': serializers.ListField(child=serializers.IntegerField()),
+            'total_usage': serializers.ListField(child=serializers.IntegerField()),
+            'current_usage': serializers.ListField(child=serializers.IntegerField()),
+            'historical_usage': serializers.ListField(child=serializers.IntegerField()),
+            'limit': serializers.ListField(child=serializers.IntegerField()),
+        })
+    })
+    def get(self, request, *args, **kwargs) -> Response:
+        """Return usage snapshots as a dictionary of equal length column arrays."""
+
+        rows = self.filter_queryset(self.get_queryset()).order_by('recorded', 'id').values_list(*self.columns)
+        values = list(zip(*rows)) or [()] * len(self.columns)
+        series = {column: list(column_values) for column, column_values in zip(self.columns, values)}
+        return Response(series, status=status.HTTP_200_OK)
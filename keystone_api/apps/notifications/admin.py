@@ -6,17 +6,20 @@ interfaces for managing application database constructs.
 
 from django.conf import settings
 from django.contrib import admin
+from django.utils import timezone
 
 from .models import *
 
 settings.JAZZMIN_SETTINGS['icons'].update({
     'notifications.Notification': 'fa fa-envelope',
     'notifications.Preference': 'fas fa-mail-bulk',
+    'notifications.OutboxMessage': 'fas fa-paper-plane',
 })
 
 settings.JAZZMIN_SETTINGS['order_with_respect_to'].extend([
     'notifications.Preference',
     'notifications.Notification',
+    'notifications.OutboxMessage',
 ])
 
 
@@ -45,3 +48,25 @@ class PreferenceAdmin(admin.ModelAdmin):
 
     list_display = ('user',)
     search_fields = ('user__username',)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Admin interface for notification emails waiting to be delivered."""
+
+    @admin.action
+    def retry_selected_messages(self, request, queryset) -> None:
+        """Reschedule selected messages for immediate delivery."""
+
+        queryset.update(status=OutboxMessage.StatusChoices.PENDING, attempts=0, next_attempt=timezone.now())
+
+    list_display = ('notification__user', 'notification__subject', 'status', 'attempts', 'next_attempt')
+    list_filter = ('status', 'next_attempt')
+    search_fields = ('notification__user__username', 'notification__subject', 'last_error')
+    readonly_fields = ('notification', 'html_message', 'attempts', 'last_error', 'created')
+    actions = [retry_selected_messages]
+
+    def has_add_permission(self, request, obj=None) -> False:
+        """Disable permissions for creating new records."""
+
+        return False
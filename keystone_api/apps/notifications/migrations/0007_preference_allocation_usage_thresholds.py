@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-17 00:41
+
+import apps.notifications.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_alter_notification_notification_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='preference',
+            name='allocation_usage_thresholds',
+            field=models.JSONField(default=apps.notifications.models.default_usage_thresholds),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('GM', 'General Message'), ('RE', 'Upcoming Request Expiration'), ('RD', 'Request Past Expiration'), ('UT', 'Allocation Usage Threshold')], max_length=2),
+        ),
+    ]
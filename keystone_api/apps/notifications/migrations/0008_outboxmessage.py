@@ -0,0 +1,31 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_preference_allocation_usage_thresholds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('html_message', models.TextField()),
+                ('status', models.CharField(choices=[('PD', 'Pending'), ('DL', 'Dead Letter')], default='PD', max_length=2)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('notification', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='outbox', to='notifications.notification')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt'], name='notificatio_status_56a84a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-17 01:16
+
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0008_outboxmessage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(models.F('notification_type'), django.db.models.fields.json.KeyTransform('request_id', 'metadata'), name='notification_request_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(models.F('notification_type'), django.db.models.fields.json.KeyTransform('team_id', 'metadata'), name='notification_team_idx'),
+        ),
+    ]
@@ -8,8 +8,11 @@ the associated table/fields/records are presented by parent interfaces.
 
 from django.conf import settings
 from django.db import models
+from django.db.models import F
+from django.db.models.fields.json import KeyTransform
+from django.utils import timezone
 
-__all__ = ['Notification', 'Preference']
+__all__ = ['Notification', 'OutboxMessage', 'Preference']
 
 
 def default_expiry_thresholds() -> list[int]:  # pragma: nocover
@@ -21,15 +24,34 @@ def default_expiry_thresholds() -> list[int]:  # pragma: nocover
     return [30, 14]
 
 
+def default_usage_thresholds() -> list[int]:  # pragma: nocover
+    """The default allocation usage thresholds at which to issue a user notification.
+
+    Returned values are defined as a percentage of awarded service units.
+    """
+
+    return [75, 90]
+
+
 class Notification(models.Model):
     """User notification."""
 
+    class Meta:
+        """Database model settings."""
+
+        # Support checks for previously issued notifications by their metadata
+        indexes = [
+            models.Index(F('notification_type'), KeyTransform('request_id', 'metadata'), name='notification_request_idx'),
+            models.Index(F('notification_type'), KeyTransform('team_id', 'metadata'), name='notification_team_idx'),
+        ]
+
     class NotificationType(models.TextChoices):
         """Enumerated choices for the `notification_type` field."""
 
         general_message = 'GM', 'General Message'
         request_expiring = 'RE', 'Upcoming Request Expiration'
         request_expired = 'RD', 'Request Past Expiration'
+        usage_threshold = 'UT', 'Allocation Usage Threshold'
 
     time = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
@@ -41,10 +63,37 @@ class Notification(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
 
+class OutboxMessage(models.Model):
+    """Notification email waiting to be delivered by the outbox sender."""
+
+    class Meta:
+        """Database model settings."""
+
+        indexes = [
+            models.Index(fields=['status', 'next_attempt'])
+        ]
+
+    class StatusChoices(models.TextChoices):
+        """Enumerated choices for the `status` field."""
+
+        PENDING = 'PD', 'Pending'
+        DEAD = 'DL', 'Dead Letter'
+
+    html_message = models.TextField()
+    status = models.CharField(max_length=2, choices=StatusChoices.choices, default=StatusChoices.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    notification = models.OneToOneField(Notification, on_delete=models.CASCADE, related_name='outbox')
+
+
 class Preference(models.Model):
     """User notification preferences."""
 
     request_expiry_thresholds = models.JSONField(default=default_expiry_thresholds)
+    allocation_usage_thresholds = models.JSONField(default=default_usage_thresholds)
     notify_on_expiration = models.BooleanField(default=True)
 
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -84,7 +133,7 @@ class Preference(models.Model):
         """Return the next threshold at which a usage notification should be sent
 
         The next notification occurs at the largest threshold that is
-        less than or equal the days until expiration
+        less than or equal the usage percentage
 
         Args:
             usage_percentage: An allocation's percent utilization
@@ -94,6 +143,6 @@ class Preference(models.Model):
         """
 
         return max(
-            filter(lambda x: x <= usage_percentage, self.request_expiry_thresholds),
+            filter(lambda x: x <= usage_percentage, self.allocation_usage_thresholds),
             default=None
         )
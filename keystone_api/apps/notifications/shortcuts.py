@@ -4,14 +4,23 @@ Shortcuts are designed to simplify common tasks such as rendering templates,
 redirecting URLs, issuing notifications, and handling HTTP responses.
 """
 
-from django.conf import settings
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+import logging
+from pathlib import PurePath
+from typing import Iterable
 
-from apps.notifications.models import Notification
+from django.db import transaction
+from django.template.loader import get_template
+from markupsafe import Markup
+
+from apps.notifications.models import Notification, OutboxMessage
 from apps.users.models import User
 
+log = logging.getLogger(__name__)
+
+# Templates wrapping rendered notification content with a per-user greeting and signature
+HTML_LAYOUT = 'notification_layout.html'
+TEXT_LAYOUT = 'notification_layout.txt'
+
 
 def send_notification(
     user: User,
@@ -23,6 +32,10 @@ def send_notification(
 ) -> None:
     """Send a notification email to a specified user with both plain text and HTML content.
 
+    The notification is recorded in the database and queued in the email outbox
+    within the same transaction. Emails are delivered in the background by the
+    `send_outbox` task.
+
     Args:
         user: The user object to whom the email will be sent.
         subject: The subject line of the email.
@@ -32,14 +45,7 @@ def send_notification(
         notification_metadata: Metadata to store alongside the notification.
     """
 
-    send_mail(
-        subject=subject,
-        message=plain_text,
-        from_email=settings.EMAIL_FROM_ADDRESS,
-        recipient_list=[user.email],
-        html_message=html_text)
-
-    Notification.objects.create(
+    notification = Notification(
         user=user,
         subject=subject,
         message=plain_text,
@@ -47,6 +53,62 @@ def send_notification(
         metadata=notification_metadata
     )
 
+    send_notification_batch([(notification, html_text)])
+
+
+def render_notification_templates(
+    users: Iterable[User],
+    subject: str,
+    template: str,
+    context: dict,
+    notification_type: Notification.NotificationType,
+    notification_metadata: dict | None = None
+) -> list[tuple[Notification, str]]:
+    """Render an email template into unsaved notifications for multiple users without sending them.
+
+    The given template is rendered once and shared by all users. Only the
+    notification layout, which adds the greeting and signature, is rendered
+    for each individual user. The plain text content is rendered from a text
+    template with the same name as the HTML template and a `.txt` suffix.
+
+    Args:
+        users: The users to whom the email will be sent.
+        subject: The subject line of the email.
+        template: The name of the HTML template file to render.
+        context: Variable definitions used to populate the template.
+        notification_type: Optionally categorize the notification type.
+        notification_metadata: Metadata to store alongside the notification.
+
+    Returns:
+        An unsaved notification record and the rendered HTML content for each user.
+
+    Raises:
+        UndefinedError: When template variables are not defined in the notification metadata
+    """
+
+    users = list(users)
+    if not users:
+        return []
+
+    html_body = Markup(get_template(template, using='jinja2').render(context).strip())
+    text_body = get_template(str(PurePath(template).with_suffix('.txt')), using='jinja2').render(context).strip()
+    html_layout = get_template(HTML_LAYOUT, using='jinja2')
+    text_layout = get_template(TEXT_LAYOUT, using='jinja2')
+
+    rendered = []
+    for user in users:
+        notification = Notification(
+            user=user,
+            subject=subject,
+            message=text_layout.render({'user': user, 'body': text_body}).strip(),
+            notification_type=notification_type,
+            metadata=notification_metadata
+        )
+
+        rendered.append((notification, html_layout.render({'user': user, 'body': html_body})))
+
+    return rendered
+
 
 def send_notification_template(
     user: User,
@@ -70,19 +132,68 @@ def send_notification_template(
         UndefinedError: When template variables are not defined in the notification metadata
     """
 
-    html_content = render_to_string(template, context, using='jinja2')
-    text_content = strip_tags(html_content)
+    send_notification_template_batch([user], subject, template, context, notification_type, notification_metadata)
+
+
+def send_notification_template_batch(
+    users: Iterable[User],
+    subject: str,
+    template: str,
+    context: dict,
+    notification_type: Notification.NotificationType,
+    notification_metadata: dict | None = None
+) -> list[Notification]:
+    """Render an email template and send it to multiple users.
+
+    The template is rendered once and shared by all users, and the resulting
+    notifications are saved using a single bulk insert.
+
+    Args:
+        users: The users to whom the email will be sent.
+        subject: The subject line of the email.
+        template: The name of the template file to render.
+        context: Variable definitions used to populate the template.
+        notification_type: Optionally categorize the notification type.
+        notification_metadata: Metadata to store alongside each notification.
+
+    Returns:
+        The saved notification records.
+
+    Raises:
+        UndefinedError: When template variables are not defined in the notification metadata
+    """
 
-    send_notification(
-        user,
-        subject,
-        text_content,
-        html_content,
-        notification_type,
-        notification_metadata
+    return send_notification_batch(
+        render_notification_templates(users, subject, template, context, notification_type, notification_metadata)
     )
 
 
+def send_notification_batch(notifications: Iterable[tuple[Notification, str]]) -> list[Notification]:
+    """Send multiple notification emails to their respective users.
+
+    Notification records and their outbox messages are saved using a single
+    bulk insert each, within one transaction. Emails are delivered in the
+    background by the `send_outbox` task.
+
+    Args:
+        notifications: Unsaved notification records paired with the HTML version of their content.
+
+    Returns:
+        The saved notification records.
+    """
+
+    notifications = list(notifications)
+    with transaction.atomic():
+        saved = Notification.objects.bulk_create([notification for notification, _ in notifications])
+        OutboxMessage.objects.bulk_create([
+            OutboxMessage(notification=notification, html_message=html_text)
+            for notification, (_, html_text) in zip(saved, notifications)
+        ])
+
+    log.info(f'Queued {len(saved)} notification(s) for delivery.')
+    return saved
+
+
 def send_general_notification(user: User, subject: str, message: str) -> None:
     """Send a general notification email to a specified user.
 
@@ -97,5 +208,5 @@ def send_general_notification(user: User, subject: str, message: str) -> None:
         subject=subject,
         template='general.html',
         notification_type=Notification.NotificationType.general_message,
-        context={'user': user, 'message': message}
+        context={'message': message}
     )
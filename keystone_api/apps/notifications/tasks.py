@@ -0,0 +1,170 @@
+"""Scheduled tasks executed in parallel by Celery.
+
+Tasks are scheduled and executed in the background by Celery. They operate
+asynchronously from the rest of the application and log their results in the
+application database.
+
+Tasks in this module are routed to the dedicated `email` queue so slow mail
+servers never delay other background work.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from apps.notifications.models import OutboxMessage
+from apps.scheduler.locks import LeaseLock
+
+__all__ = ['send_outbox']
+
+log = logging.getLogger(__name__)
+
+
+@shared_task()
+def send_outbox(batch_size: int | None = None) -> dict[str, int]:
+    """Deliver pending messages from the email outbox.
+
+    Messages are delivered in batches over a shared SMTP connection, which is
+    reopened for every batch. Delivery is throttled to `EMAIL_RATE_LIMIT`
+    messages per second. Failed messages are retried with exponential backoff
+    starting at `EMAIL_RETRY_BACKOFF` seconds, and are moved to the dead letter
+    status after `EMAIL_MAX_ATTEMPTS` failed attempts. Delivery stops early if
+    the mail server cannot be reached, in which case the undelivered messages in
+    the current batch are retried. Only one worker drains the outbox at a time.
+
+    Args:
+        batch_size: Maximum number of messages per connection. Defaults to the `EMAIL_BATCH_SIZE` setting.
+
+    Returns:
+        The number of sent, retried, and dead lettered messages.
+    """
+
+    lock = LeaseLock('send_outbox')
+    if not lock.acquire():
+        log.info('Email outbox is already being sent by another worker, skipping.')
+        return {'sent': 0, 'retried': 0, 'dead': 0}
+
+    with lock:
+        return _send_outbox(batch_size or settings.EMAIL_BATCH_SIZE, lock)
+
+
+def _send_outbox(batch_size: int, lock: LeaseLock) -> dict[str, int]:
+    """Deliver pending outbox messages while holding the outbox lock.
+
+    Args:
+        batch_size: Maximum number of messages per connection.
+        lock: The held outbox lock.
+
+    Returns:
+        The number of sent, retried, and dead lettered messages.
+    """
+
+    results = {'sent': 0, 'retried': 0, 'dead': 0}
+    interval = 1 / settings.EMAIL_RATE_LIMIT if settings.EMAIL_RATE_LIMIT > 0 else 0
+    next_send = time.monotonic()
+    connection = get_connection()
+
+    # Messages that fail are rescheduled into the future, so every batch makes progress
+    while not lock.lost:
+        batch = list(
+            OutboxMessage.objects.filter(status=OutboxMessage.StatusChoices.PENDING, next_attempt__lte=timezone.now())
+            .select_related('notification__user')
+            .order_by('next_attempt', 'id')[:batch_size]
+        )
+
+        if not batch:
+            break
+
+        delivered, failed = [], []
+        connection_error = None
+        try:
+            connection.open()
+            for message in batch:
+                if (delay := next_send - time.monotonic()) > 0:
+                    time.sleep(delay)
+
+                next_send = max(next_send, time.monotonic()) + interval
+                try:
+                    connection.send_messages([_build_email(message)])
+                    delivered.append(message.pk)
+
+                except Exception as error:
+                    _schedule_retry(message, error)
+                    failed.append(message)
+
+                    # The connection may be left in an unusable state after a failure
+                    connection.close()
+                    connection.open()
+
+        except Exception as error:
+            # Messages left undelivered by a connection failure are retried instead of waiting for the next run
+            connection_error = error
+            attempted = set(delivered).union(message.pk for message in failed)
+            for message in batch:
+                if message.pk not in attempted:
+                    _schedule_retry(message, error)
+                    failed.append(message)
+
+        finally:
+            connection.close()
+            OutboxMessage.objects.filter(pk__in=delivered).delete()
+            OutboxMessage.objects.bulk_update(failed, ['status', 'attempts', 'next_attempt', 'last_error'])
+
+        dead = sum(message.status == OutboxMessage.StatusChoices.DEAD for message in failed)
+        results['sent'] += len(delivered)
+        results['retried'] += len(failed) - dead
+        results['dead'] += dead
+
+        if connection_error is not None:
+            log.error(f'Could not connect to the email server, stopping outbox delivery: {connection_error}')
+            break
+
+    log.info(f'Processed email outbox: {results}')
+    return results
+
+
+def _build_email(message: OutboxMessage) -> EmailMultiAlternatives:
+    """Build the email for an outbox message.
+
+    Args:
+        message: The outbox message to deliver.
+
+    Returns:
+        An email containing both the plain text and HTML notification content.
+    """
+
+    notification = message.notification
+    email = EmailMultiAlternatives(
+        subject=notification.subject,
+        body=notification.message,
+        from_email=settings.EMAIL_FROM_ADDRESS,
+        to=[notification.user.email]
+    )
+
+    email.attach_alternative(message.html_message, 'text/html')
+    return email
+
+
+def _schedule_retry(message: OutboxMessage, error: Exception) -> None:
+    """Record a failed delivery attempt and schedule the next attempt or dead letter the message.
+
+    Args:
+        message: The outbox message that failed to deliver.
+        error: The error raised while delivering the message.
+    """
+
+    message.attempts += 1
+    message.last_error = str(error)
+    if message.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+        message.status = OutboxMessage.StatusChoices.DEAD
+        log.error(f'Giving up on outbox message {message.pk} after {message.attempts} attempt(s): {error}')
+        return
+
+    backoff = settings.EMAIL_RETRY_BACKOFF * 2 ** (message.attempts - 1)
+    message.next_attempt = timezone.now() + timedelta(seconds=backoff)
+    log.warning(f'Error sending outbox message {message.pk}, retrying in {backoff} seconds: {error}')
@@ -106,3 +106,42 @@ class GetNextExpirationThreshold(TestCase):
 
         next_threshold = self.preference.get_next_expiration_threshold(1)
         self.assertEqual(next_threshold, 7)
+
+
+class GetNextUsageThreshold(TestCase):
+    """Test determining the next threshold for a usage notification."""
+
+    def setUp(self) -> None:
+        """Set up test data."""
+
+        self.user = get_user_model().objects.create_user(username="testuser", password="foobar123")
+        self.preference = Preference.objects.create(
+            user=self.user,
+            request_expiry_thresholds=[7, 14, 30],
+            allocation_usage_thresholds=[50, 75, 90]
+        )
+
+    def test_get_next_usage_threshold_with_valid_threshold(self) -> None:
+        """Test the largest crossed threshold is returned."""
+
+        next_threshold = self.preference.get_next_usage_threshold(80)
+        self.assertEqual(next_threshold, 75)
+
+    def test_get_next_usage_threshold_with_exact_match(self) -> None:
+        """Test with an exact match to the threshold."""
+
+        next_threshold = self.preference.get_next_usage_threshold(90)
+        self.assertEqual(next_threshold, 90)
+
+    def test_get_next_usage_threshold_with_no_valid_threshold(self) -> None:
+        """Test when no threshold has been crossed."""
+
+        next_threshold = self.preference.get_next_usage_threshold(10)
+        self.assertIsNone(next_threshold)
+
+    def test_get_next_usage_threshold_ignores_expiry_thresholds(self) -> None:
+        """Test usage thresholds are independent of expiration thresholds."""
+
+        self.preference.allocation_usage_thresholds = []
+        next_threshold = self.preference.get_next_usage_threshold(40)
+        self.assertIsNone(next_threshold)
@@ -0,0 +1,76 @@
+"""Unit tests for the `render_notification_templates` function."""
+
+import jinja2
+from django.test import TestCase
+
+from apps.notifications.models import Notification
+from apps.notifications.shortcuts import render_notification_templates
+from apps.users.models import User
+
+
+class TemplateRendering(TestCase):
+    """Test rendering notification templates for multiple users."""
+
+    def setUp(self) -> None:
+        """Create dummy users."""
+
+        self.named_user = User.objects.create_user(username='user1', first_name='Foo', last_name='Bar', password='foobar123')
+        self.unnamed_user = User.objects.create_user(username='user2', password='foobar123')
+
+    def render(self, message: str) -> list[tuple[Notification, str]]:
+        """Render the general notification template for all test users."""
+
+        return render_notification_templates(
+            [self.named_user, self.unnamed_user],
+            'Test subject',
+            template='general.html',
+            context={'message': message},
+            notification_type=Notification.NotificationType.general_message,
+            notification_metadata={'key': 'value'}
+        )
+
+    def test_notification_fields(self) -> None:
+        """Test an unsaved notification is returned for each user."""
+
+        rendered = self.render('Test message')
+        self.assertEqual([self.named_user, self.unnamed_user], [notification.user for notification, _ in rendered])
+
+        for notification, _ in rendered:
+            self.assertIsNone(notification.pk)
+            self.assertEqual('Test subject', notification.subject)
+            self.assertEqual(Notification.NotificationType.general_message, notification.notification_type)
+            self.assertEqual({'key': 'value'}, notification.metadata)
+
+    def test_per_user_greeting(self) -> None:
+        """Test each user is addressed individually in both the HTML and plain text content."""
+
+        (named, named_html), (unnamed, unnamed_html) = self.render('Test message')
+
+        self.assertIn('<p>Dear Foo Bar,</p>', named_html)
+        self.assertIn('<p>Dear user2,</p>', unnamed_html)
+        self.assertTrue(named.message.startswith('Dear Foo Bar,'))
+        self.assertTrue(unnamed.message.startswith('Dear user2,'))
+
+    def test_plain_text_content(self) -> None:
+        """Test plain text content is rendered from the text template without HTML markup or escaping."""
+
+        (notification, html_content), _ = self.render('1 < 2 & 3')
+
+        self.assertIn('<p>1 &lt; 2 &amp; 3</p>', html_content)
+        self.assertIn('1 < 2 & 3', notification.message)
+        self.assertNotIn('<p>', notification.message)
+
+    def test_no_users(self) -> None:
+        """Test no notifications are rendered for an empty list of users."""
+
+        self.assertEqual([], render_notification_templates(
+            [], 'Test subject', 'general.html', dict(), Notification.NotificationType.general_message
+        ))
+
+    def test_incomplete_rendering(self) -> None:
+        """Test an error is raised when a template isn't completely rendered."""
+
+        with self.assertRaises(jinja2.UndefinedError):
+            render_notification_templates(
+                [self.named_user], 'Test subject', 'general.html', dict(), Notification.NotificationType.general_message
+            )
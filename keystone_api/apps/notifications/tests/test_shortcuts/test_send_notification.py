@@ -4,12 +4,13 @@ from django.conf import settings
 from django.core import mail
 from django.test import override_settings, TestCase
 
-from apps.notifications.models import Notification
+from apps.notifications.models import Notification, OutboxMessage
 from apps.notifications.shortcuts import send_notification
+from apps.notifications.tasks import send_outbox
 from apps.users.models import User
 
 
-@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_RATE_LIMIT=0)
 class EmailSending(TestCase):
     """Test sending emails via the `send_notification` function"""
 
@@ -38,9 +39,19 @@ class EmailSending(TestCase):
             self.notification_type,
             self.notification_metadata)
 
+    def test_email_is_queued(self) -> None:
+        """Test the email is queued in the outbox instead of being sent immediately"""
+
+        self.assertEqual(len(mail.outbox), 0)
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(Notification.objects.get(user=self.user), message.notification)
+        self.assertEqual(self.html_text, message.html_message)
+
     def test_email_content(self) -> None:
         """Test an email notification is sent with the correct content"""
 
+        send_outbox()
         self.assertEqual(len(mail.outbox), 1)
 
         email = mail.outbox[0]
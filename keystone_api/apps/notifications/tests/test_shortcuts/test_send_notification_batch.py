@@ -0,0 +1,64 @@
+"""Unit tests for the `send_notification_batch` function."""
+
+from django.core import mail
+from django.test import override_settings, TestCase
+
+from apps.notifications.models import Notification, OutboxMessage
+from apps.notifications.shortcuts import send_notification_batch
+from apps.users.models import User
+
+
+def build_notifications(users: list[User]) -> list[tuple[Notification, str]]:
+    """Build an unsaved notification and HTML content for each given user."""
+
+    return [
+        (Notification(
+            user=user,
+            subject=f'Subject {user.username}',
+            message=f'Message {user.username}',
+            notification_type=Notification.NotificationType.general_message,
+            metadata={'username': user.username}
+        ), f'<p>Message {user.username}</p>')
+        for user in users
+    ]
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailQueuing(TestCase):
+    """Test queuing emails via the `send_notification_batch` function."""
+
+    def setUp(self) -> None:
+        """Create dummy users."""
+
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='foobar123')
+            for i in range(5)
+        ]
+
+    def test_database_is_updated(self) -> None:
+        """Test a record of each notification is stored in the database."""
+
+        saved = send_notification_batch(build_notifications(self.users))
+        self.assertEqual(len(self.users), len(saved))
+
+        for user in self.users:
+            notification = Notification.objects.get(user=user)
+            self.assertEqual(f'Message {user.username}', notification.message)
+            self.assertEqual({'username': user.username}, notification.metadata)
+
+    def test_emails_are_queued(self) -> None:
+        """Test an outbox message is queued for each notification instead of sending emails immediately."""
+
+        send_notification_batch(build_notifications(self.users))
+
+        self.assertEqual(0, len(mail.outbox))
+        for user in self.users:
+            message = OutboxMessage.objects.get(notification__user=user)
+            self.assertEqual(f'<p>Message {user.username}</p>', message.html_message)
+            self.assertEqual(OutboxMessage.StatusChoices.PENDING, message.status)
+
+    def test_empty_batch(self) -> None:
+        """Test nothing is queued for an empty batch."""
+
+        self.assertEqual([], send_notification_batch([]))
+        self.assertFalse(OutboxMessage.objects.exists())
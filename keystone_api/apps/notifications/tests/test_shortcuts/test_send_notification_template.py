@@ -7,11 +7,12 @@ from django.test import override_settings, TestCase
 
 from apps.notifications.models import Notification
 from apps.notifications.shortcuts import send_notification_template
+from apps.notifications.tasks import send_outbox
 from apps.users.models import User
 from main import settings
 
 
-@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_RATE_LIMIT=0)
 class EmailSending(TestCase):
     """Test sending email templates via the `send_notification_template` function."""
 
@@ -39,6 +40,7 @@ class EmailSending(TestCase):
             notification_type=Notification.NotificationType.general_message
         )
 
+        send_outbox()
         self.assertEqual(len(mail.outbox), 1)
         email = mail.outbox[0]
 
@@ -0,0 +1,54 @@
+"""Unit tests for the `send_notification_template_batch` function."""
+
+from django.test import TestCase
+
+from apps.notifications.models import Notification, OutboxMessage
+from apps.notifications.shortcuts import send_notification_template_batch
+from apps.users.models import User
+
+
+class MultipleRecipients(TestCase):
+    """Test sending a single email template to multiple users."""
+
+    def setUp(self) -> None:
+        """Create dummy users."""
+
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='foobar123')
+            for i in range(5)
+        ]
+
+    def send(self, users: list[User]) -> list[Notification]:
+        """Send the general notification template to the given users."""
+
+        return send_notification_template_batch(
+            users,
+            'Test subject',
+            template='general.html',
+            context={'message': 'Test message'},
+            notification_type=Notification.NotificationType.general_message,
+            notification_metadata={'key': 'value'}
+        )
+
+    def test_database_is_updated(self) -> None:
+        """Test a notification and outbox message are saved for each user."""
+
+        saved = self.send(self.users)
+        self.assertEqual(len(self.users), len(saved))
+
+        for user in self.users:
+            notification = Notification.objects.get(user=user)
+            self.assertEqual('Test subject', notification.subject)
+            self.assertEqual({'key': 'value'}, notification.metadata)
+            self.assertIn(f'Dear {user.username},', notification.message)
+            self.assertTrue(OutboxMessage.objects.filter(notification=notification).exists())
+
+    def test_bulk_queries(self) -> None:
+        """Test the number of queries does not grow with the number of recipients."""
+
+        # Queries include a savepoint and its release in addition to one insert per table
+        with self.assertNumQueries(4):
+            self.send(self.users)
+
+        with self.assertNumQueries(4):
+            self.send(self.users[:1])
@@ -0,0 +1,202 @@
+"""Unit tests for the `send_outbox` task."""
+
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.core import mail
+from django.test import override_settings, TestCase
+from django.utils import timezone
+
+from apps.notifications.models import Notification, OutboxMessage
+from apps.notifications.shortcuts import send_notification
+from apps.notifications.tasks import send_outbox
+from apps.scheduler.locks import LeaseLock
+from apps.users.models import User
+from tests.utils import LOCMEM_CACHES
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_RATE_LIMIT=0,
+    EMAIL_MAX_ATTEMPTS=3,
+    EMAIL_RETRY_BACKOFF=60,
+    CACHES=LOCMEM_CACHES
+)
+class OutboxTestCase(TestCase):
+    """Base test case that queues a notification for several users."""
+
+    def setUp(self) -> None:
+        """Queue a notification for each of several dummy users."""
+
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='foobar123')
+            for i in range(5)
+        ]
+
+        for user in self.users:
+            send_notification(
+                user,
+                f'Subject {user.username}',
+                f'Message {user.username}',
+                f'<p>Message {user.username}</p>',
+                Notification.NotificationType.general_message
+            )
+
+
+class Delivery(OutboxTestCase):
+    """Test the delivery of queued messages."""
+
+    def test_email_content(self) -> None:
+        """Test an email is sent to each user with the correct content."""
+
+        results = send_outbox()
+        self.assertEqual({'sent': 5, 'retried': 0, 'dead': 0}, results)
+
+        self.assertEqual(len(self.users), len(mail.outbox))
+        for user, email in zip(self.users, mail.outbox):
+            self.assertEqual(f'Subject {user.username}', email.subject)
+            self.assertEqual(f'Message {user.username}', email.body)
+            self.assertEqual(settings.EMAIL_FROM_ADDRESS, email.from_email)
+            self.assertEqual([user.email], email.to)
+            self.assertEqual([(f'<p>Message {user.username}</p>', 'text/html')], email.alternatives)
+
+    def test_delivered_messages_removed(self) -> None:
+        """Test delivered messages are removed from the outbox and not sent twice."""
+
+        send_outbox()
+        send_outbox()
+
+        self.assertEqual(len(self.users), len(mail.outbox))
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(len(self.users), Notification.objects.count())
+
+    def test_future_messages_skipped(self) -> None:
+        """Test messages scheduled for a later attempt are not sent."""
+
+        OutboxMessage.objects.update(next_attempt=timezone.now() + timedelta(minutes=5))
+        send_outbox()
+        self.assertEqual(0, len(mail.outbox))
+
+    def test_locked_outbox_skipped(self) -> None:
+        """Test the outbox is not sent while another worker holds the outbox lock."""
+
+        lock = LeaseLock('send_outbox')
+        lock.acquire()
+        try:
+            send_outbox()
+
+        finally:
+            lock.release()
+
+        self.assertEqual(0, len(mail.outbox))
+        self.assertEqual(len(self.users), OutboxMessage.objects.count())
+
+
+class ConnectionReuse(OutboxTestCase):
+    """Test messages are delivered over a shared connection."""
+
+    @patch('apps.notifications.tasks.get_connection')
+    def test_reconnects_per_batch(self, mock_get_connection: MagicMock) -> None:
+        """Test the connection is reopened once for every batch of messages."""
+
+        connection = mock_get_connection.return_value
+        send_outbox(batch_size=2)
+
+        mock_get_connection.assert_called_once()
+        self.assertEqual(3, connection.open.call_count)
+        self.assertEqual(3, connection.close.call_count)
+        self.assertEqual(5, connection.send_messages.call_count)
+
+    @override_settings(EMAIL_RATE_LIMIT=2)
+    @patch('apps.notifications.tasks.time.sleep')
+    @patch('apps.notifications.tasks.time.monotonic', return_value=0)
+    def test_rate_limit(self, mock_monotonic: MagicMock, mock_sleep: MagicMock) -> None:
+        """Test delivery is paced according to the configured rate limit."""
+
+        send_outbox()
+
+        self.assertEqual(len(self.users), len(mail.outbox))
+        self.assertEqual([0.5, 1.0, 1.5, 2.0], [call.args[0] for call in mock_sleep.call_args_list])
+
+
+class Retries(OutboxTestCase):
+    """Test failed messages are retried and eventually dead lettered."""
+
+    @patch('apps.notifications.tasks.get_connection')
+    def test_failures_are_isolated(self, mock_get_connection: MagicMock) -> None:
+        """Test a failed delivery does not prevent remaining messages from being sent."""
+
+        connection = mock_get_connection.return_value
+        connection.send_messages.side_effect = [1, SMTPException('Test error'), 1, 1, 1]
+
+        results = send_outbox()
+        self.assertEqual({'sent': 4, 'retried': 1, 'dead': 0}, results)
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual(self.users[1], message.notification.user)
+        self.assertEqual(1, message.attempts)
+        self.assertEqual('Test error', message.last_error)
+        self.assertEqual(OutboxMessage.StatusChoices.PENDING, message.status)
+
+    @patch('apps.notifications.tasks.get_connection')
+    def test_exponential_backoff(self, mock_get_connection: MagicMock) -> None:
+        """Test the delay before retrying a message doubles after every failed attempt."""
+
+        mock_get_connection.return_value.send_messages.side_effect = SMTPException('Test error')
+        OutboxMessage.objects.update(attempts=1)
+
+        start = timezone.now()
+        send_outbox()
+
+        for message in OutboxMessage.objects.all():
+            self.assertEqual(2, message.attempts)
+            self.assertGreaterEqual(message.next_attempt, start + timedelta(seconds=120))
+            self.assertLess(message.next_attempt, start + timedelta(seconds=180))
+
+    @patch('apps.notifications.tasks.get_connection')
+    def test_dead_letter(self, mock_get_connection: MagicMock) -> None:
+        """Test messages are dead lettered after the maximum number of attempts."""
+
+        mock_get_connection.return_value.send_messages.side_effect = SMTPException('Test error')
+        OutboxMessage.objects.update(attempts=2)
+
+        results = send_outbox()
+        self.assertEqual({'sent': 0, 'retried': 0, 'dead': 5}, results)
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.StatusChoices.DEAD).exists())
+
+        # Dead lettered messages are not attempted again
+        mock_get_connection.return_value.send_messages.reset_mock()
+        send_outbox()
+        mock_get_connection.return_value.send_messages.assert_not_called()
+
+    @patch('apps.notifications.tasks.get_connection')
+    def test_connection_failure(self, mock_get_connection: MagicMock) -> None:
+        """Test the current batch is retried and delivery stops when the mail server is unreachable."""
+
+        connection = mock_get_connection.return_value
+        connection.open.side_effect = SMTPException('Connection refused')
+
+        results = send_outbox(batch_size=2)
+        self.assertEqual({'sent': 0, 'retried': 2, 'dead': 0}, results)
+        connection.send_messages.assert_not_called()
+
+        retried = OutboxMessage.objects.filter(attempts=1)
+        self.assertEqual(2, retried.count())
+        self.assertTrue(all(message.last_error == 'Connection refused' for message in retried))
+        self.assertEqual(3, OutboxMessage.objects.filter(attempts=0).count())
+
+    @patch('apps.notifications.tasks.get_connection')
+    def test_reconnect_failure(self, mock_get_connection: MagicMock) -> None:
+        """Test messages after a failed reconnect are retried instead of left pending."""
+
+        connection = mock_get_connection.return_value
+        connection.open.side_effect = [None, SMTPException('Connection refused')]
+        connection.send_messages.side_effect = [1, SMTPException('Test error')]
+
+        results = send_outbox(batch_size=3)
+        self.assertEqual({'sent': 1, 'retried': 2, 'dead': 0}, results)
+        self.assertEqual(1, OutboxMessage.objects.filter(last_error='Test error').count())
+        self.assertEqual(1, OutboxMessage.objects.filter(last_error='Connection refused').count())
+        self.assertEqual(2, OutboxMessage.objects.filter(attempts=0).count())
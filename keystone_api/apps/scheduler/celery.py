@@ -24,16 +24,52 @@ celery_app.conf.beat_schedule = {
         'schedule': crontab(hour='0', minute='0'),
         'description': 'This task deletes old log entries according to application settings.'
     },
+    'apps.notifications.tasks.send_outbox': {
+        'task': 'apps.notifications.tasks.send_outbox',
+        'schedule': crontab(),
+        'description': 'This task delivers pending notification emails from the email outbox.'
+    },
+    'apps.allocations.tasks.accounts.sync_slurm_accounts': {
+        'task': 'apps.allocations.tasks.accounts.sync_slurm_accounts',
+        'schedule': crontab(minute='50'),
+        'description': 'This task creates teams and team memberships reflecting Slurm accounts and associations.'
+    },
     'apps.allocations.tasks.limits.update_limits': {
         'task': 'apps.allocations.tasks.limits.update_limits',
         'schedule': crontab(minute='0'),
-        'description': 'This task updates all Slurm clusters with the latest user allocation limits.'
+        'kwargs': {'incremental': True},
+        'description': 'This task updates Slurm clusters with allocation limits for accounts with pending changes.'
+    },
+    'apps.allocations.tasks.limits.update_limits.reconcile': {
+        'task': 'apps.allocations.tasks.limits.update_limits',
+        'schedule': crontab(hour='0', minute='30'),
+        'description': 'This task reconciles all Slurm clusters against the latest user allocation limits.'
+    },
+    'apps.allocations.tasks.usage.ingest_job_usage': {
+        'task': 'apps.allocations.tasks.usage.ingest_job_usage',
+        'schedule': crontab(minute='15'),
+        'description': 'This task records per-user resource usage from Slurm job accounting records.'
+    },
+    'apps.allocations.tasks.usage.rollup_usage_snapshots': {
+        'task': 'apps.allocations.tasks.usage.rollup_usage_snapshots',
+        'schedule': crontab(hour='1', minute='0'),
+        'description': 'This task downsamples historical usage snapshots according to application settings.'
+    },
+    'apps.allocations.tasks.usage.update_exhaustion_forecasts': {
+        'task': 'apps.allocations.tasks.usage.update_exhaustion_forecasts',
+        'schedule': crontab(minute='30'),
+        'description': 'This task forecasts when active allocations will run out of service units.'
     },
     'apps.allocations.tasks.notifications.notify_upcoming_expirations': {
         'task': 'apps.allocations.tasks.notifications.notify_upcoming_expirations',
         'schedule': crontab(hour='0', minute='0'),
         'description': 'This task issues notifications informing users of upcoming expirations.'
     },
+    'apps.allocations.tasks.notifications.notify_usage_thresholds': {
+        'task': 'apps.allocations.tasks.notifications.notify_usage_thresholds',
+        'schedule': crontab(minute='45'),
+        'description': 'This task issues notifications informing users when their allocations cross a usage threshold.'
+    },
     'apps.allocations.tasks.notifications.notify_past_expirations': {
         'task': 'apps.allocations.tasks.notifications.notify_past_expirations',
         'schedule': crontab(hour='0', minute='0'),
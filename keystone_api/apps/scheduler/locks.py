@@ -0,0 +1,189 @@
+"""Distributed lease locks for coordinating tasks across Celery workers.
+
+Leases are stored in the ``locks`` cache backend, which is shared by all
+workers. A lease expires automatically if its holder dies, and is kept alive
+by a background heartbeat while the holder is running. Each lease is tagged
+with a random token so that only the holder can renew or release it. On Redis
+backends, the token comparison and the renewal or release are performed
+atomically by a Lua script.
+
+The lock backend uses the same Redis server as the Celery broker. If the
+server is unreachable, no other worker can be dispatched tasks either, so
+leases are treated as acquired and a warning is logged.
+"""
+
+import logging
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from redis.exceptions import RedisError
+
+__all__ = ['LeaseLock']
+
+log = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'locks'
+
+# Lua scripts for updating a lease only if it is still tagged with the given token
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaseLock:
+    """A time limited lock renewed by a background heartbeat while held.
+
+    Locks are intended for use as a context manager after a successful call to `acquire`:
+
+        lock = LeaseLock('update_limits:1')
+        if lock.acquire():
+            with lock:
+                ...
+
+    Leaving the context stops the heartbeat and releases the lease.
+    Long-running holders should check the `lost` property before
+    performing work that must not overlap with another holder.
+    """
+
+    def __init__(self, name: str, ttl: int | None = None) -> None:
+        """Initialize a new lock without acquiring it.
+
+        Args:
+            name: Unique name of the locked resource.
+            ttl: Lease duration in seconds. Defaults to the `LOCK_LEASE_TTL` setting.
+        """
+
+        self.key = f'lease:{name}'
+        self.ttl = ttl or settings.LOCK_LEASE_TTL
+        self.token = uuid.uuid4().hex
+        self._held = False
+        self._unlocked = False
+        self._lost = threading.Event()
+        self._stopped = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    @property
+    def lost(self) -> bool:
+        """Whether the lease expired or was taken by another holder while the lock was held."""
+
+        return self._lost.is_set()
+
+    def acquire(self) -> bool:
+        """Attempt to acquire the lease without blocking.
+
+        Returns:
+            Whether the lease was acquired.
+        """
+
+        try:
+            self._held = caches[CACHE_ALIAS].add(self.key, self.token, timeout=self.ttl)
+
+        except RedisError as error:
+            log.warning(f"Could not reach lock backend, proceeding without lock {self.key}: {error}")
+            self._held = self._unlocked = True
+
+        return self._held
+
+    def renew(self) -> bool:
+        """Extend the lease by another full lease duration if it is still held by this lock.
+
+        Returns:
+            Whether the lease was renewed.
+        """
+
+        try:
+            cache = caches[CACHE_ALIAS]
+            if isinstance(cache, RedisCache):
+                renewed = bool(self._eval(cache, RENEW_SCRIPT, self.ttl))
+
+            else:
+                renewed = cache.get(self.key) == self.token and cache.touch(self.key, timeout=self.ttl)
+
+        except RedisError as error:
+            log.warning(f"Could not renew lock {self.key}: {error}")
+            return False
+
+        if not renewed:
+            self._lost.set()
+
+        return renewed
+
+    def release(self) -> None:
+        """Stop the heartbeat and release the lease if it is still held by this lock."""
+
+        self._stopped.set()
+        if self._heartbeat is not None and self._heartbeat is not threading.current_thread():
+            self._heartbeat.join()
+
+        if not self._held or self._unlocked:
+            self._held = False
+            return
+
+        self._held = False
+        try:
+            cache = caches[CACHE_ALIAS]
+            if isinstance(cache, RedisCache):
+                self._eval(cache, RELEASE_SCRIPT)
+
+            elif cache.get(self.key) == self.token:
+                cache.delete(self.key)
+
+        except RedisError as error:
+            log.warning(f"Could not release lock {self.key}, lease will expire in at most {self.ttl} seconds: {error}")
+
+    def _eval(self, cache: RedisCache, script: str, *args) -> int:
+        """Run a Lua script against the lease with the cache key and serialized token as arguments.
+
+        Args:
+            cache: The Redis cache storing the lease.
+            script: The Lua script to run.
+            *args: Additional script arguments following the token.
+
+        Returns:
+            The value returned by the script.
+        """
+
+        key = cache.make_and_validate_key(self.key)
+        client = cache._cache.get_client(key, write=True)
+        return client.eval(script, 1, key, cache._cache._serializer.dumps(self.token), *args)
+
+    def _beat(self) -> None:
+        """Renew the lease at regular intervals until the lock is released or lost."""
+
+        if self._unlocked:
+            return
+
+        interval = self.ttl / 3
+        while not self._stopped.wait(interval):
+            if not self.renew() and self.lost:
+                log.error(f"Lost lock {self.key} while it was still in use")
+                return
+
+    def __enter__(self) -> 'LeaseLock':
+        """Start renewing the lease in the background."""
+
+        if not self._held:
+            raise RuntimeError(f'Lock {self.key} must be acquired before entering its context')
+
+        self._stopped.clear()
+        self._heartbeat = threading.Thread(target=self._beat, name=f'heartbeat-{self.key}', daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop renewing the lease and release it."""
+
+        self.release()
@@ -0,0 +1,145 @@
+"""Unit tests for the `LeaseLock` class."""
+
+import pickle
+import time
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import caches
+from django.test import override_settings, TestCase
+from redis.exceptions import RedisError
+
+from apps.scheduler.locks import CACHE_ALIAS, LeaseLock, RELEASE_SCRIPT, RENEW_SCRIPT
+from tests.utils import LOCMEM_CACHES
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class Acquisition(TestCase):
+    """Test acquiring and releasing leases."""
+
+    def setUp(self) -> None:
+        """Clear any existing leases."""
+
+        caches[CACHE_ALIAS].clear()
+
+    def test_lock_is_exclusive(self) -> None:
+        """Test a lease cannot be acquired while it is held by another lock."""
+
+        first, second = LeaseLock('resource', ttl=60), LeaseLock('resource', ttl=60)
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+
+        first.release()
+        self.assertTrue(second.acquire())
+
+    def test_independent_resources(self) -> None:
+        """Test leases for different resources do not conflict."""
+
+        self.assertTrue(LeaseLock('resource1', ttl=60).acquire())
+        self.assertTrue(LeaseLock('resource2', ttl=60).acquire())
+
+    def test_release_requires_ownership(self) -> None:
+        """Test releasing a lock does not remove a lease taken over by another holder."""
+
+        first, second = LeaseLock('resource', ttl=60), LeaseLock('resource', ttl=60)
+        first.acquire()
+        caches[CACHE_ALIAS].delete(first.key)  # Simulate an expired lease
+        second.acquire()
+
+        first.release()
+        self.assertEqual(second.token, caches[CACHE_ALIAS].get(second.key))
+
+    def test_context_requires_acquisition(self) -> None:
+        """Test entering the lock context without acquiring the lease raises an error."""
+
+        with self.assertRaises(RuntimeError):
+            with LeaseLock('resource', ttl=60):
+                pass
+
+    def test_context_releases_lease(self) -> None:
+        """Test the lease is released when exiting the lock context."""
+
+        lock = LeaseLock('resource', ttl=60)
+        lock.acquire()
+        with lock:
+            self.assertFalse(LeaseLock('resource', ttl=60).acquire())
+
+        self.assertTrue(LeaseLock('resource', ttl=60).acquire())
+
+    def test_unreachable_backend(self) -> None:
+        """Test leases are treated as acquired when the lock backend cannot be reached."""
+
+        lock = LeaseLock('resource', ttl=60)
+        with patch.object(caches[CACHE_ALIAS], 'add', side_effect=RedisError('unreachable')):
+            self.assertTrue(lock.acquire())
+
+        with lock:
+            self.assertFalse(lock.lost)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class Heartbeat(TestCase):
+    """Test leases are renewed while the lock is held."""
+
+    def setUp(self) -> None:
+        """Clear any existing leases."""
+
+        caches[CACHE_ALIAS].clear()
+
+    def test_lease_is_renewed(self) -> None:
+        """Test the lease outlives its original duration while the lock is held."""
+
+        lock = LeaseLock('resource', ttl=1)
+        lock.acquire()
+        with lock:
+            time.sleep(1.5)
+            self.assertFalse(LeaseLock('resource', ttl=1).acquire())
+            self.assertFalse(lock.lost)
+
+    def test_lost_lease(self) -> None:
+        """Test a lease taken over by another holder is reported as lost."""
+
+        lock = LeaseLock('resource', ttl=60)
+        lock.acquire()
+        caches[CACHE_ALIAS].set(lock.key, 'other-token')
+
+        self.assertFalse(lock.renew())
+        self.assertTrue(lock.lost)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:1/0'},
+})
+@patch('django.core.cache.backends.redis.RedisCacheClient.get_client')
+class RedisScripts(TestCase):
+    """Test leases are renewed and released atomically on Redis backends."""
+
+    def test_renew(self, mock_get_client: MagicMock) -> None:
+        """Test renewing a lease compares the token and extends the lease in a single script."""
+
+        lock = LeaseLock('resource', ttl=60)
+        client = mock_get_client.return_value
+        client.eval.return_value = 1
+
+        self.assertTrue(lock.renew())
+        client.eval.assert_called_once_with(RENEW_SCRIPT, 1, ':1:lease:resource', pickle.dumps(lock.token, pickle.HIGHEST_PROTOCOL), 60)
+
+    def test_renew_lost(self, mock_get_client: MagicMock) -> None:
+        """Test a lease is reported as lost when the script finds a different token."""
+
+        lock = LeaseLock('resource', ttl=60)
+        mock_get_client.return_value.eval.return_value = 0
+
+        self.assertFalse(lock.renew())
+        self.assertTrue(lock.lost)
+
+    def test_release(self, mock_get_client: MagicMock) -> None:
+        """Test releasing a lease compares the token and deletes the lease in a single script."""
+
+        lock = LeaseLock('resource', ttl=60)
+        client = mock_get_client.return_value
+        self.assertTrue(lock.acquire())
+
+        lock.release()
+        client.eval.assert_called_once_with(RELEASE_SCRIPT, 1, ':1:lease:resource', pickle.dumps(lock.token, pickle.HIGHEST_PROTOCOL))
+        client.delete.assert_not_called()
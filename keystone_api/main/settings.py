@@ -8,7 +8,7 @@ from pathlib import Path
 
 import environ
 from django.core.management.utils import get_random_secret_key
-from jinja2 import StrictUndefined
+from jinja2 import FileSystemBytecodeCache, StrictUndefined
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(BASE_DIR))
@@ -137,6 +137,7 @@ TEMPLATES = [
         'APP_DIRS': True,
         "OPTIONS": {
             "undefined": StrictUndefined,
+            "bytecode_cache": FileSystemBytecodeCache(),
         },
     },
 ]
@@ -209,10 +210,56 @@ CELERY_BROKER_URL = REDIS_URL + f'/{_redis_db}'
 CELERY_CACHE_BACKEND = 'django-cache'
 CELERY_RESULT_BACKEND = 'django-db'
 CELERY_RESULT_EXTENDED = True
+CELERY_TASK_ROUTES = {'apps.notifications.tasks.*': {'queue': 'email'}}
+
+LIMITS_MAX_CONCURRENCY = env.int('CONFIG_LIMITS_CONCURRENCY', 4)
+LOCK_LEASE_TTL = env.int('CONFIG_LOCK_TTL', 60)
+SNAPSHOT_HOURLY_AFTER = env.int('CONFIG_SNAPSHOT_HOURLY', 7)
+SNAPSHOT_DAILY_AFTER = env.int('CONFIG_SNAPSHOT_DAILY', 90)
+FORECAST_WINDOW = env.int('CONFIG_FORECAST_WINDOW', 14)
+USAGE_INGEST_DELAY = env.int('CONFIG_USAGE_DELAY', 3600)
+SCHEDULER_BACKEND = env.str('CONFIG_SCHEDULER_BACKEND', 'plugins.scheduler.SlurmCLIBackend')
+SLURM_MAX_CONCURRENCY = env.int('CONFIG_SLURM_CONCURRENCY', 8)
+SLURM_COMMAND_TIMEOUT = env.int('CONFIG_SLURM_TIMEOUT', 120)
+SLURM_MAX_RETRIES = env.int('CONFIG_SLURM_RETRIES', 2)
+SLURM_RETRY_BACKOFF = env.float('CONFIG_SLURM_RETRY_BACKOFF', 1.0)
+SLURM_CIRCUIT_THRESHOLD = env.int('CONFIG_SLURM_CIRCUIT_THRESHOLD', 5)
+SLURM_CIRCUIT_COOLDOWN = env.int('CONFIG_SLURM_CIRCUIT_COOLDOWN', 300)
+SLURMRESTD_URL = env.str('SLURMRESTD_URL', 'http://localhost:6820')
+SLURMRESTD_USER = env.str('SLURMRESTD_USER', '')
+SLURMRESTD_TOKEN = env.str('SLURMRESTD_TOKEN', '')
+SLURMRESTD_API_VERSION = env.str('SLURMRESTD_API_VERSION', 'v0.0.40')
+SLURMRESTD_POOL_SIZE = env.int('SLURMRESTD_POOL_SIZE', 4)
+SLURM_CACHE_TTL = {
+    'get_slurm_account_names': env.int('CONFIG_SLURM_CACHE_ACCOUNTS', 300),
+    'get_slurm_account_users': env.int('CONFIG_SLURM_CACHE_USERS', 300),
+    'get_slurm_account_principal_investigator': env.int('CONFIG_SLURM_CACHE_PI', 3600),
+    'get_cluster_limit': env.int('CONFIG_SLURM_CACHE_LIMITS', 60),
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'slurm': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL + f'/{_redis_db}',
+        'KEY_PREFIX': 'slurm',
+    },
+    'locks': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL + f'/{_redis_db}',
+        'KEY_PREFIX': 'locks',
+    },
+}
 
 # Email server
 
 EMAIL_FROM_ADDRESS = env.str('EMAIL_FROM_ADDRESS', 'noreply@keystone.bot')
+EMAIL_BATCH_SIZE = env.int('EMAIL_BATCH_SIZE', 100)
+EMAIL_RATE_LIMIT = env.float('EMAIL_RATE_LIMIT', 10)
+EMAIL_MAX_ATTEMPTS = env.int('EMAIL_MAX_ATTEMPTS', 5)
+EMAIL_RETRY_BACKOFF = env.int('EMAIL_RETRY_BACKOFF', 60)
 if _email_path := env.get_value('DEBUG_EMAIL_DIR', default=None):
     EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
     EMAIL_FILE_PATH = _email_path
@@ -293,6 +340,12 @@ STATIC_ROOT.mkdir(parents=True, exist_ok=True)
 MEDIA_ROOT = Path(env.path('CONFIG_UPLOAD_DIR', BASE_DIR / 'media'))
 MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
 
+# Prometheus metrics
+
+# Metrics recorded by Celery workers are only exported by the API server when both share a multiprocess directory
+if PROMETHEUS_MULTIPROC_DIR := env.str('PROMETHEUS_MULTIPROC_DIR', ''):
+    Path(PROMETHEUS_MULTIPROC_DIR).mkdir(parents=True, exist_ok=True)
+
 # Timezones
 
 USE_TZ = True
@@ -0,0 +1,397 @@
+"""Pluggable interface for interacting with HPC job schedulers
+
+Scheduler backends expose a common interface for querying accounts, usage limits, and
+usage values from an HPC job scheduler. The active backend is configured using the
+``SCHEDULER_BACKEND`` setting and is accessed via the `get_scheduler_backend` function.
+
+Two implementations are provided:
+
+- `SlurmCLIBackend`: Communicates with a local Slurm installation via command line utilities.
+- `InMemoryBackend`: Simulates a scheduler in memory for testing and benchmarking purposes.
+"""
+
+import abc
+from functools import cache
+from typing import Iterable
+
+import numpy as np
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from plugins import slurm
+
+__all__ = ['get_scheduler_backend', 'InMemoryBackend', 'SchedulerBackend', 'SlurmCLIBackend']
+
+
+@cache
+def get_scheduler_backend() -> 'SchedulerBackend':
+    """Return the scheduler backend configured by the ``SCHEDULER_BACKEND`` setting
+
+    The backend is instantiated on first use and the same instance is returned by subsequent calls.
+
+    Returns:
+        A scheduler backend instance
+    """
+
+    return import_string(settings.SCHEDULER_BACKEND)()
+
+
+@receiver(setting_changed)
+def _reset_scheduler_backend(setting: str, **kwargs) -> None:
+    """Discard the cached scheduler backend when the ``SCHEDULER_BACKEND`` setting changes"""
+
+    if setting == 'SCHEDULER_BACKEND':
+        get_scheduler_backend.cache_clear()
+
+
+class SchedulerBackend(abc.ABC):
+    """Abstract interface for an HPC job scheduler
+
+    All limit and usage values are expressed in TRES billing hours.
+    """
+
+    @abc.abstractmethod
+    def get_account_names(self, cluster_name: str) -> set[str]:
+        """Return the names of all accounts on a given cluster
+
+        Args:
+            cluster_name: The name of the cluster
+
+        Returns:
+            A set of unique account names
+        """
+
+    @abc.abstractmethod
+    def get_associations(self, cluster_name: str) -> dict[str, set[str]]:
+        """Return the users associated with every account on a given cluster
+
+        Accounts without any associated users are included with an empty set of users.
+
+        Args:
+            cluster_name: The name of the cluster
+
+        Returns:
+            A dictionary mapping account names to the usernames associated with each account
+        """
+
+    @abc.abstractmethod
+    def get_principal_investigators(self, cluster_name: str) -> dict[str, str]:
+        """Return the Principal Investigator (PI) username for every account on a given cluster
+
+        Accounts without a PI are omitted.
+
+        Args:
+            cluster_name: The name of the cluster
+
+        Returns:
+            A dictionary mapping account names to PI usernames
+        """
+
+    @abc.abstractmethod
+    def get_limit(self, account_name: str, cluster_name: str) -> int:
+        """Return the current usage limit for a given account and cluster
+
+        Args:
+            account_name: The name of the account
+            cluster_name: The name of the cluster
+
+        Returns:
+            The current usage limit in hours
+        """
+
+    @abc.abstractmethod
+    def get_limits(self, cluster_name: str) -> dict[str, int]:
+        """Return the current usage limits for all accounts on a given cluster
+
+        Args:
+            cluster_name: The name of the cluster
+
+        Returns:
+            A dictionary mapping account names to their usage limit in hours
+        """
+
+    @abc.abstractmethod
+    def set_limit(self, account_name: str, cluster_name: str, limit: int) -> None:
+        """Update the usage limit for a given account and cluster
+
+        Args:
+            account_name: The name of the account
+            cluster_name: The name of the cluster
+            limit: The new usage limit in hours
+
+        Raises:
+            RuntimeError: If the limit could not be updated
+        """
+
+    @abc.abstractmethod
+    def set_limits(self, cluster_name: str, limits: dict[str, int]) -> dict[str, bool]:
+        """Update the usage limits for multiple accounts on a given cluster
+
+        Args:
+            cluster_name: The name of the cluster
+            limits: A dictionary mapping account names to their new usage limit in hours
+
+        Returns:
+            A dictionary mapping each account name to whether the new limit was applied successfully
+        """
+
+    @abc.abstractmethod
+    def get_usage(self, account_name: str, cluster_name: str) -> int:
+        """Return the total usage for a given account and cluster
+
+        Args:
+            account_name: The name of the account
+            cluster_name: The name of the cluster
+
+        Returns:
+            The total (historical + current) usage in hours
+        """
+
+    @abc.abstractmethod
+    def get_usages(self, cluster_name: str) -> dict[str, int]:
+        """Return the total usage for all accounts on a given cluster
+
+        Args:
+            cluster_name: The name of the cluster
+
+        Returns:
+            A dictionary mapping account names to their total (historical + current) usage in hours
+        """
+
+
+class SlurmCLIBackend(SchedulerBackend):
+    """Scheduler backend for a local Slurm installation using the `plugins.slurm` command line wrappers"""
+
+    def get_account_names(self, cluster_name: str) -> set[str]:
+        return slurm.get_slurm_account_names(cluster_name)
+
+    def get_associations(self, cluster_name: str) -> dict[str, set[str]]:
+        return slurm.get_cluster_associations(cluster_name)
+
+    def get_principal_investigators(self, cluster_name: str) -> dict[str, str]:
+        # Account descriptions are stored by slurmdbd and shared by all clusters
+        return slurm.get_slurm_account_principal_investigators()
+
+    def get_limit(self, account_name: str, cluster_name: str) -> int:
+        return slurm.get_cluster_limit(account_name, cluster_name)
+
+    def get_limits(self, cluster_name: str) -> dict[str, int]:
+        return slurm.get_cluster_limits(cluster_name)
+
+    def set_limit(self, account_name: str, cluster_name: str, limit: int) -> None:
+        slurm.set_cluster_limit(account_name, cluster_name, limit)
+
+    def set_limits(self, cluster_name: str, limits: dict[str, int]) -> dict[str, bool]:
+        return slurm.set_cluster_limits(cluster_name, limits)
+
+    def get_usage(self, account_name: str, cluster_name: str) -> int:
+        return slurm.get_cluster_usage(account_name, cluster_name)
+
+    def get_usages(self, cluster_name: str) -> dict[str, int]:
+        return slurm.get_cluster_usages(cluster_name)
+
+
+class _SimulatedCluster:
+    """Account records for a single simulated cluster stored as parallel arrays"""
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.index: dict[str, int] = dict()
+        self.limits = np.zeros(0, dtype=np.int64)
+        self.usage = np.zeros(0, dtype=np.int64)
+        self.users: dict[str, set[str]] = dict()
+
+    def lookup(self, account_names: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return array positions for the given account names and a mask of which names exist"""
+
+        positions = np.fromiter((self.index.get(name, -1) for name in account_names), dtype=np.int64)
+        return positions, positions >= 0
+
+
+class InMemoryBackend(SchedulerBackend):
+    """Scheduler backend that simulates accounts in memory
+
+    Account limits and usage values are stored in NumPy arrays so that hundreds of thousands
+    of accounts can be simulated, populated, and updated using vectorized operations.
+    This backend is intended for tests and for benchmarking the limits pipeline without
+    access to a real scheduler. Data is not shared between processes.
+    """
+
+    def __init__(self) -> None:
+        self._clusters: dict[str, _SimulatedCluster] = dict()
+        self._pis: dict[str, str] = dict()
+
+    @classmethod
+    def generate(
+        cls,
+        num_clusters: int,
+        accounts_per_cluster: int,
+        max_limit: int = 100_000,
+        seed: int | None = None
+    ) -> 'InMemoryBackend':
+        """Create a backend populated with randomly generated accounts
+
+        Clusters are named `cluster0`, `cluster1`, etc. and accounts are named `account0`, `account1`, etc.
+        Every account is assigned a random limit and a random usage value not exceeding that limit.
+
+        Args:
+            num_clusters: The number of clusters to simulate
+            accounts_per_cluster: The number of accounts to simulate on each cluster
+            max_limit: The maximum randomly assigned usage limit in hours
+            seed: Optional seed for the random number generator
+
+        Returns:
+            A populated backend instance
+        """
+
+        rng = np.random.default_rng(seed)
+        backend = cls()
+        names = [f'account{i}' for i in range(accounts_per_cluster)]
+        for cluster_index in range(num_clusters):
+            limits = rng.integers(0, max_limit, size=accounts_per_cluster, endpoint=True)
+            usage = (limits * rng.random(accounts_per_cluster)).astype(np.int64)
+            backend.add_accounts(f'cluster{cluster_index}', names, limits, usage)
+
+        return backend
+
+    def add_accounts(
+        self,
+        cluster_name: str,
+        account_names: list[str],
+        limits: Iterable[int] | None = None,
+        usage: Iterable[int] | None = None
+    ) -> None:
+        """Add accounts to a simulated cluster, creating the cluster if necessary
+
+        Values for accounts that already exist are overwritten.
+
+        Args:
+            cluster_name: The name of the cluster
+            account_names: The names of the accounts to add
+            limits: Optional usage limits in hours for each account (defaults to zero)
+            usage: Optional usage values in hours for each account (defaults to zero)
+        """
+
+        count = len(account_names)
+        limits = np.zeros(count, dtype=np.int64) if limits is None else np.asarray(limits, dtype=np.int64)
+        usage = np.zeros(count, dtype=np.int64) if usage is None else np.asarray(usage, dtype=np.int64)
+        if limits.shape != (count,) or usage.shape != (count,):
+            raise ValueError('Limit and usage values must match the number of account names.')
+
+        cluster = self._clusters.setdefault(cluster_name, _SimulatedCluster())
+        positions, exists = cluster.lookup(account_names)
+
+        # Overwrite values for existing accounts
+        cluster.limits[positions[exists]] = limits[exists]
+        cluster.usage[positions[exists]] = usage[exists]
+
+        # Append new accounts, keeping the first occurrence of any duplicate names
+        new_names = dict()
+        for position, name in enumerate(account_names):
+            if not exists[position]:
+                new_names.setdefault(name, position)
+
+        new_positions = np.fromiter(new_names.values(), dtype=np.int64, count=len(new_names))
+        cluster.index.update((name, len(cluster.names) + i) for i, name in enumerate(new_names))
+        cluster.names.extend(new_names)
+        cluster.limits = np.concatenate((cluster.limits, limits[new_positions]))
+        cluster.usage = np.concatenate((cluster.usage, usage[new_positions]))
+
+    def add_users(self, cluster_name: str, account_name: str, usernames: Iterable[str], pi: str | None = None) -> None:
+        """Associate users with an existing account on a simulated cluster
+
+        Args:
+            cluster_name: The name of the cluster
+            account_name: The name of the account
+            usernames: The usernames to associate with the account
+            pi: Optionally set the PI username of the account
+
+        Raises:
+            KeyError: If the account does not exist on the given cluster
+        """
+
+        cluster = self._clusters.get(cluster_name)
+        if cluster is None or account_name not in cluster.index:
+            raise KeyError(f'Account {account_name} does not exist on cluster {cluster_name}.')
+
+        cluster.users.setdefault(account_name, set()).update(usernames)
+        if pi is not None:
+            self._pis[account_name] = pi
+
+    def simulate_usage(self, cluster_name: str, max_hours: int, seed: int | None = None) -> None:
+        """Increase the usage of every account on a simulated cluster by a random amount
+
+        Args:
+            cluster_name: The name of the cluster
+            max_hours: The maximum number of hours to add to each account
+            seed: Optional seed for the random number generator
+        """
+
+        cluster = self._clusters[cluster_name]
+        rng = np.random.default_rng(seed)
+        cluster.usage += rng.integers(0, max_hours, size=len(cluster.names), endpoint=True)
+
+    def _get_value(self, account_name: str, cluster_name: str, field: str) -> int:
+        """Return a single value from the given array field, defaulting to zero for missing accounts"""
+
+        cluster = self._clusters.get(cluster_name)
+        if cluster is None or account_name not in cluster.index:
+            return 0
+
+        return int(getattr(cluster, field)[cluster.index[account_name]])
+
+    def get_account_names(self, cluster_name: str) -> set[str]:
+        if cluster_name not in self._clusters:
+            return set()
+
+        return set(self._clusters[cluster_name].names)
+
+    def get_associations(self, cluster_name: str) -> dict[str, set[str]]:
+        if cluster_name not in self._clusters:
+            return dict()
+
+        cluster = self._clusters[cluster_name]
+        return {name: set(cluster.users.get(name, ())) for name in cluster.names}
+
+    def get_principal_investigators(self, cluster_name: str) -> dict[str, str]:
+        if cluster_name not in self._clusters:
+            return dict()
+
+        index = self._clusters[cluster_name].index
+        return {name: pi for name, pi in self._pis.items() if name in index}
+
+    def get_limit(self, account_name: str, cluster_name: str) -> int:
+        return self._get_value(account_name, cluster_name, 'limits')
+
+    def get_limits(self, cluster_name: str) -> dict[str, int]:
+        if cluster_name not in self._clusters:
+            return dict()
+
+        cluster = self._clusters[cluster_name]
+        return dict(zip(cluster.names, cluster.limits.tolist()))
+
+    def set_limit(self, account_name: str, cluster_name: str, limit: int) -> None:
+        if not self.set_limits(cluster_name, {account_name: limit})[account_name]:
+            raise RuntimeError(f'Account {account_name} does not exist on cluster {cluster_name}.')
+
+    def set_limits(self, cluster_name: str, limits: dict[str, int]) -> dict[str, bool]:
+        if cluster_name not in self._clusters:
+            return {account_name: False for account_name in limits}
+
+        cluster = self._clusters[cluster_name]
+        positions, exists = cluster.lookup(limits.keys())
+        values = np.fromiter(limits.values(), dtype=np.int64, count=len(limits))
+        cluster.limits[positions[exists]] = values[exists]
+        return dict(zip(limits.keys(), exists.tolist()))
+
+    def get_usage(self, account_name: str, cluster_name: str) -> int:
+        return self._get_value(account_name, cluster_name, 'usage')
+
+    def get_usages(self, cluster_name: str) -> dict[str, int]:
+        if cluster_name not in self._clusters:
+            return dict()
+
+        cluster = self._clusters[cluster_name]
+        return dict(zip(cluster.names, cluster.usage.tolist()))
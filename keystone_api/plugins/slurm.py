@@ -1,43 +1,726 @@
-"""Plugin providing wrappers around command line calls to a local Slurm installation"""
+"""Plugin providing wrappers around command line calls to a local Slurm installation
 
+Every public function is provided in both a blocking and an asynchronous form.
+Asynchronous variants share the same name prefixed with an ``a`` (e.g., ``aget_cluster_limits``)
+and execute commands via asyncio subprocesses. The number of concurrently running Slurm
+commands is bounded by the ``SLURM_MAX_CONCURRENCY`` setting.
+
+Results from read-only account queries are cached in the ``slurm`` cache backend for the
+duration configured in the ``SLURM_CACHE_TTL`` setting. Cached limits are invalidated
+whenever a new limit is written for the corresponding account and cluster.
+
+Commands failing with transient errors (timeouts or lost connections to the Slurm daemons)
+are retried using jittered exponential backoff. Each cluster is protected by a circuit
+breaker that rejects commands without executing them for ``SLURM_CIRCUIT_COOLDOWN`` seconds
+after ``SLURM_CIRCUIT_THRESHOLD`` consecutive transient failures. Circuit state is stored
+in the ``slurm`` cache backend so it is shared between worker processes.
+"""
+
+import asyncio
+import inspect
 import logging
-import re
+import random
+import threading
+import time
+from asyncio.subprocess import PIPE as ASYNC_PIPE
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
 from shlex import split
-from subprocess import PIPE, Popen
+from subprocess import PIPE, Popen, TimeoutExpired
+from tempfile import TemporaryFile
+from typing import Any, Callable, Iterator
+from weakref import WeakKeyDictionary
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from prometheus_client import Counter
+from redis.exceptions import RedisError
 
 log = logging.getLogger(__name__)
 
 __all__ = [
+    'SlurmCircuitOpenError',
+    'SlurmTransientError',
+    'aget_cluster_associations',
+    'aget_cluster_limit',
+    'aget_cluster_limits',
+    'aget_cluster_usage',
+    'aget_cluster_usages',
+    'aget_slurm_account_names',
+    'aget_slurm_account_principal_investigator',
+    'aget_slurm_account_principal_investigators',
+    'aget_slurm_account_users',
+    'aset_cluster_limit',
+    'aset_cluster_limits',
+    'get_cluster_associations',
     'get_cluster_limit',
+    'get_cluster_limits',
     'get_cluster_usage',
+    'get_cluster_usages',
     'get_slurm_account_names',
     'get_slurm_account_principal_investigator',
+    'get_slurm_account_principal_investigators',
     'get_slurm_account_users',
+    'iter_job_records',
     'set_cluster_limit',
+    'set_cluster_limits',
 ]
 
+# Semaphores are bound to the event loop they are first used in
+_semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = WeakKeyDictionary()
+
+CACHE_ALIAS = 'slurm'
+
+# Set while a guarded query is running so nested queries are not retried a second time
+_guard_active: ContextVar[bool] = ContextVar('slurm_guard_active', default=False)
+_MISSING = object()
+
+cache_hits = Counter('keystone_slurm_cache_hits', 'Number of Slurm queries served from the cache', ['function'])
+cache_misses = Counter('keystone_slurm_cache_misses', 'Number of Slurm queries not served from the cache', ['function'])
+circuit_opened = Counter('keystone_slurm_circuit_opened', 'Number of times a Slurm circuit breaker was opened', ['cluster'])
+circuit_rejected = Counter('keystone_slurm_circuit_rejected', 'Number of Slurm queries rejected by an open circuit breaker', ['cluster'])
+command_retries = Counter('keystone_slurm_command_retries', 'Number of Slurm queries retried after a transient error', ['function'])
+
+# Fragments of error messages indicating the Slurm daemons are temporarily unreachable
+TRANSIENT_ERRORS = (
+    'connection refused',
+    'connection timed out',
+    'problem talking to the database',
+    'persistent connection',
+    'resource temporarily unavailable',
+    'socket timed out',
+    'unable to contact',
+)
+
+
+class SlurmTransientError(RuntimeError):
+    """Raised when a Slurm command fails with an error that may resolve on its own"""
+
+
+class SlurmCircuitOpenError(RuntimeError):
+    """Raised when a Slurm command is rejected because the circuit breaker for its cluster is open"""
+
+
+def _cache_key(function_name: str, *args: Any) -> str:
+    """Return the cache key for a Slurm query with the given arguments"""
+
+    return ':'.join((function_name, *(str(arg) for arg in args)))
+
+
+def _cache_get(function_name: str, key: str) -> Any:
+    """Fetch a cached query result and record the cache hit/miss
+
+    Cache backend errors are logged and treated as a cache miss.
+    """
+
+    try:
+        value = caches[CACHE_ALIAS].get(key, _MISSING)
+
+    except RedisError as error:
+        log.debug(f"Could not read Slurm query cache: {error}")
+        value = _MISSING
+
+    counter = cache_misses if value is _MISSING else cache_hits
+    counter.labels(function=function_name).inc()
+    return value
+
+
+def _cache_set(key: str, value: Any, timeout: int) -> None:
+    """Cache a query result, ignoring any cache backend errors"""
+
+    try:
+        caches[CACHE_ALIAS].set(key, value, timeout)
+
+    except RedisError as error:
+        log.debug(f"Could not write Slurm query cache: {error}")
+
+
+def _cache_delete(*keys: str) -> None:
+    """Remove cached query results, ignoring any cache backend errors"""
+
+    try:
+        caches[CACHE_ALIAS].delete_many(keys)
+
+    except RedisError as error:
+        log.debug(f"Could not invalidate Slurm query cache: {error}")
+
+
+def _cached(function_name: str) -> Callable:
+    """Decorator for caching the return value of a read-only Slurm query
+
+    Values are cached for the number of seconds configured for `function_name` in the
+    ``SLURM_CACHE_TTL`` setting. Caching is disabled for functions with a TTL of zero.
+    Blocking and asynchronous versions of the same query share cache entries.
+
+    Args:
+        function_name: The name of the blocking query function used to build cache keys and metric labels
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def build_key(args: tuple, kwargs: dict) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return _cache_key(function_name, *bound.arguments.values())
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                timeout = settings.SLURM_CACHE_TTL.get(function_name, 0)
+                if not timeout:
+                    return await func(*args, **kwargs)
+
+                key = build_key(args, kwargs)
+                value = await sync_to_async(_cache_get)(function_name, key)
+                if value is _MISSING:
+                    value = await func(*args, **kwargs)
+                    await sync_to_async(_cache_set)(key, value, timeout)
+
+                return value
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            timeout = settings.SLURM_CACHE_TTL.get(function_name, 0)
+            if not timeout:
+                return func(*args, **kwargs)
+
+            key = build_key(args, kwargs)
+            value = _cache_get(function_name, key)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                _cache_set(key, value, timeout)
+
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _circuit_keys(cluster_name: str | None) -> tuple[str, str]:
+    """Return the cache keys storing the failure count and open state of a cluster's circuit breaker"""
+
+    cluster_name = cluster_name or 'default'
+    return f'circuit:{cluster_name}:failures', f'circuit:{cluster_name}:open'
+
+
+def _circuit_check(cluster_name: str | None) -> None:
+    """Raise an error if the circuit breaker for the given cluster is open
+
+    Cache backend errors are logged and treated as a closed circuit.
+
+    Raises:
+        SlurmCircuitOpenError: If the circuit breaker is open
+    """
+
+    _, open_key = _circuit_keys(cluster_name)
+    try:
+        is_open = caches[CACHE_ALIAS].get(open_key, False)
+
+    except RedisError as error:
+        log.debug(f"Could not read Slurm circuit state: {error}")
+        return
+
+    if is_open:
+        circuit_rejected.labels(cluster=cluster_name or 'default').inc()
+        raise SlurmCircuitOpenError(f"Circuit breaker is open for Slurm cluster {cluster_name or 'default'}")
+
+
+def _circuit_success(cluster_name: str | None) -> None:
+    """Reset the consecutive failure count for a cluster's circuit breaker"""
+
+    failures_key, _ = _circuit_keys(cluster_name)
+    try:
+        caches[CACHE_ALIAS].delete(failures_key)
+
+    except RedisError as error:
+        log.debug(f"Could not write Slurm circuit state: {error}")
+
+
+def _circuit_failure(cluster_name: str | None) -> None:
+    """Record a transient failure and open the cluster's circuit breaker if the failure threshold is reached
+
+    After the cool-down period expires, the circuit allows a single trial command.
+    The failure count is kept one below the threshold so that a failed trial reopens the circuit.
+    """
+
+    failures_key, open_key = _circuit_keys(cluster_name)
+    threshold = settings.SLURM_CIRCUIT_THRESHOLD
+    if threshold <= 0:
+        return
+
+    try:
+        cache = caches[CACHE_ALIAS]
+        cache.add(failures_key, 0, timeout=None)
+        failures = cache.incr(failures_key)
+        if failures >= threshold:
+            cache.set(open_key, True, timeout=settings.SLURM_CIRCUIT_COOLDOWN)
+            cache.set(failures_key, threshold - 1, timeout=None)
+            circuit_opened.labels(cluster=cluster_name or 'default').inc()
+            log.warning(
+                f"Opened circuit breaker for Slurm cluster {cluster_name or 'default'} after {failures} consecutive "
+                f"failures, rejecting commands for {settings.SLURM_CIRCUIT_COOLDOWN} seconds"
+            )
+
+    except (RedisError, ValueError) as error:
+        log.debug(f"Could not write Slurm circuit state: {error}")
+
+
+def _retry_delay(attempt: int) -> float:
+    """Return a jittered exponential backoff delay in seconds for the given retry attempt (starting from zero)"""
+
+    return random.uniform(0, settings.SLURM_RETRY_BACKOFF * 2 ** attempt)
+
+
+def _guarded(function_name: str) -> Callable:
+    """Decorator for retrying a Slurm query on transient errors and applying per-cluster circuit breaking
+
+    The cluster is determined from the `cluster_name` argument of the decorated function.
+    Transient failures are retried up to ``SLURM_MAX_RETRIES`` times. Failures remaining after
+    all retries count toward opening the cluster's circuit breaker. Any other outcome, including
+    non-transient errors, shows the cluster is reachable and resets the failure count.
+    Guarded queries called from within another guarded query are executed directly.
+
+    Args:
+        function_name: The name of the blocking query function used for metric labels
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def get_cluster(args: tuple, kwargs: dict) -> str | None:
+            bound = signature.bind(*args, **kwargs)
+            return bound.arguments.get('cluster_name')
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                if _guard_active.get():
+                    return await func(*args, **kwargs)
+
+                cluster_name = get_cluster(args, kwargs)
+                await sync_to_async(_circuit_check)(cluster_name)
+                token = _guard_active.set(True)
+                try:
+                    for attempt in range(settings.SLURM_MAX_RETRIES + 1):
+                        try:
+                            result = await func(*args, **kwargs)
+                            break
+
+                        except SlurmTransientError:
+                            if attempt >= settings.SLURM_MAX_RETRIES:
+                                await sync_to_async(_circuit_failure)(cluster_name)
+                                raise
+
+                            command_retries.labels(function=function_name).inc()
+                            await asyncio.sleep(_retry_delay(attempt))
+
+                        except RuntimeError:
+                            await sync_to_async(_circuit_success)(cluster_name)
+                            raise
+
+                finally:
+                    _guard_active.reset(token)
+
+                await sync_to_async(_circuit_success)(cluster_name)
+                return result
 
-def subprocess_call(args: list[str]) -> str:
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            if _guard_active.get():
+                return func(*args, **kwargs)
+
+            cluster_name = get_cluster(args, kwargs)
+            _circuit_check(cluster_name)
+            token = _guard_active.set(True)
+            try:
+                for attempt in range(settings.SLURM_MAX_RETRIES + 1):
+                    try:
+                        result = func(*args, **kwargs)
+                        break
+
+                    except SlurmTransientError:
+                        if attempt >= settings.SLURM_MAX_RETRIES:
+                            _circuit_failure(cluster_name)
+                            raise
+
+                        command_retries.labels(function=function_name).inc()
+                        time.sleep(_retry_delay(attempt))
+
+                    except RuntimeError:
+                        _circuit_success(cluster_name)
+                        raise
+
+            finally:
+                _guard_active.reset(token)
+
+            _circuit_success(cluster_name)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _command_error(args: list[str], err: str) -> RuntimeError:
+    """Return the exception to raise for a failed Slurm command based on its error output"""
+
+    message = f"Error executing shell command: {' '.join(args)} \n {err}"
+    if any(fragment in err.lower() for fragment in TRANSIENT_ERRORS):
+        return SlurmTransientError(message)
+
+    return RuntimeError(message)
+
+
+def subprocess_call(args: list[str], stdin: str | None = None, timeout: float | None = None) -> str:
     """Wrapper method for executing shell commands via ``Popen.communicate``
 
+    Processes are killed if they exceed the timeout.
+
     Args:
         args: A sequence of program arguments
+        stdin: Optional text to pipe into the process via STDIN
+        timeout: Maximum runtime in seconds. Defaults to the ``SLURM_COMMAND_TIMEOUT`` setting.
 
     Returns:
         The piped output to STDOUT
+
+    Raises:
+        SlurmTransientError: If the command times out or cannot reach the Slurm daemons
+        RuntimeError: If the command exits with any other error
     """
 
-    process = Popen(args, stdout=PIPE, stderr=PIPE)
-    out, err = process.communicate()
+    timeout = settings.SLURM_COMMAND_TIMEOUT if timeout is None else timeout
+    process = Popen(args, stdin=PIPE if stdin is not None else None, stdout=PIPE, stderr=PIPE)
+    try:
+        out, err = process.communicate(stdin.encode('utf-8') if stdin is not None else None, timeout=timeout or None)
+
+    except TimeoutExpired as error:
+        process.kill()
+        process.communicate()
+        message = f"Timed out after {timeout} seconds executing shell command: {' '.join(args)}"
+        log.error(message)
+        raise SlurmTransientError(message) from error
 
     if process.returncode != 0:
-        message = f"Error executing shell command: {' '.join(args)} \n {err.decode('utf-8').strip()}"
-        log.error(message)
-        raise RuntimeError(message)
+        error = _command_error(args, err.decode('utf-8').strip())
+        log.error(str(error))
+        raise error
 
     return out.decode("utf-8").strip()
 
 
+def subprocess_stream(args: list[str], timeout: float | None = None) -> Iterator[str]:
+    """Execute a shell command and yield lines written to STDOUT as they are produced
+
+    Output is consumed incrementally so that arbitrarily large command output is never held in memory.
+    Processes are killed by a watchdog thread if they exceed the timeout or if the iterator is closed early.
+
+    Args:
+        args: A sequence of program arguments
+        timeout: Maximum runtime in seconds. Defaults to the ``SLURM_COMMAND_TIMEOUT`` setting.
+
+    Returns:
+        An iterator over lines written to STDOUT without trailing newlines
+
+    Raises:
+        SlurmTransientError: If the command times out or cannot reach the Slurm daemons
+        RuntimeError: If the command exits with any other error
+    """
+
+    timeout = settings.SLURM_COMMAND_TIMEOUT if timeout is None else timeout
+    with TemporaryFile() as stderr, Popen(args, stdout=PIPE, stderr=stderr, text=True) as process:
+        # Reads from STDOUT block indefinitely, so the process is killed from a separate thread
+        expired = threading.Event()
+        watchdog = threading.Timer(timeout, lambda: (expired.set(), process.kill()))
+        watchdog.daemon = True
+        if timeout:
+            watchdog.start()
+
+        try:
+            for line in process.stdout:
+                yield line.rstrip('\n')
+
+            process.wait()
+
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+
+        if expired.is_set():
+            message = f"Timed out after {timeout} seconds executing shell command: {' '.join(args)}"
+            log.error(message)
+            raise SlurmTransientError(message)
+
+        if process.returncode != 0:
+            stderr.seek(0)
+            error = _command_error(args, stderr.read().decode('utf-8').strip())
+            log.error(str(error))
+            raise error
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore limiting concurrent Slurm commands in the running event loop"""
+
+    loop = asyncio.get_running_loop()
+    if loop not in _semaphores:
+        _semaphores[loop] = asyncio.Semaphore(settings.SLURM_MAX_CONCURRENCY)
+
+    return _semaphores[loop]
+
+
+async def async_subprocess_call(args: list[str], stdin: str | None = None, timeout: float | None = None) -> str:
+    """Asynchronous wrapper method for executing shell commands via ``asyncio.create_subprocess_exec``
+
+    The number of concurrently running commands is limited by the ``SLURM_MAX_CONCURRENCY`` setting.
+    Processes are killed if they exceed the timeout or if the calling task is cancelled.
+
+    Args:
+        args: A sequence of program arguments
+        stdin: Optional text to pipe into the process via STDIN
+        timeout: Maximum runtime in seconds. Defaults to the ``SLURM_COMMAND_TIMEOUT`` setting.
+
+    Returns:
+        The piped output to STDOUT
+
+    Raises:
+        SlurmTransientError: If the command times out or cannot reach the Slurm daemons
+        RuntimeError: If the command exits with any other error
+    """
+
+    timeout = settings.SLURM_COMMAND_TIMEOUT if timeout is None else timeout
+    async with _get_semaphore():
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=ASYNC_PIPE if stdin is not None else None,
+            stdout=ASYNC_PIPE,
+            stderr=ASYNC_PIPE
+        )
+
+        try:
+            out, err = await asyncio.wait_for(
+                process.communicate(stdin.encode('utf-8') if stdin is not None else None),
+                timeout=timeout or None
+            )
+
+        except asyncio.TimeoutError as error:
+            process.kill()
+            await process.wait()
+            message = f"Timed out after {timeout} seconds executing shell command: {' '.join(args)}"
+            await sync_to_async(log.error)(message)
+            raise SlurmTransientError(message) from error
+
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+    if process.returncode != 0:
+        error = _command_error(args, err.decode('utf-8').strip())
+        await sync_to_async(log.error)(str(error))
+        raise error
+
+    return out.decode("utf-8").strip()
+
+
+def parse_tres(tres_string: str) -> dict[str, str]:
+    """Parse a comma delimited string of TRES values into a dictionary
+
+    Args:
+        tres_string: A TRES string as returned by Slurm (e.g., ``cpu=10,billing=600``)
+
+    Returns:
+        A dictionary mapping TRES names to their string values
+    """
+
+    tres = dict()
+    for item in tres_string.split(','):
+        name, _, value = item.partition('=')
+        if name:
+            tres[name.strip()] = value.strip()
+
+    return tres
+
+
+def get_billing_minutes(tres_string: str) -> int:
+    """Return the billing value from a TRES string in minutes
+
+    Missing or non-numeric billing values are treated as zero.
+
+    Args:
+        tres_string: A TRES string as returned by Slurm (e.g., ``cpu=10,billing=600``)
+
+    Returns:
+        The integer billing value
+    """
+
+    billing = parse_tres(tres_string).get('billing', '')
+    return int(billing) if billing.isnumeric() else 0
+
+
+def _parse_billing_hours(output: str, cmd: list[str]) -> int:
+    """Return the first billing value found in command output converted from minutes to hours
+
+    Args:
+        output: Command output with one TRES string per line
+        cmd: The command that generated the output
+
+    Returns:
+        The billing value in hours, or zero if no billing value is found
+    """
+
+    for line in output.splitlines():
+        if 'billing' in parse_tres(line):
+            return get_billing_minutes(line) // 60  # convert from minutes to hours
+
+    log.debug(f"'billing' value not found in command output from {cmd}, assuming zero")
+    return 0
+
+
+def _parse_account_records(output: str) -> dict[str, int]:
+    """Parse account level ``Account|User|TRES`` records into billing values converted to hours
+
+    User level records and lines not matching the expected format are ignored.
+
+    Args:
+        output: Parsable command output from `sacctmgr` or `sshare`
+
+    Returns:
+        A dictionary mapping Slurm account names to billing values in hours
+    """
+
+    records = dict()
+    for line in output.splitlines():
+        fields = line.split('|')
+        if len(fields) != 3:
+            continue  # Skip cluster headers and other non-tabular output
+
+        account_name, user_name, tres = (field.strip() for field in fields)
+        if account_name and not user_name:
+            records[account_name] = get_billing_minutes(tres) // 60  # convert from minutes to hours
+
+    return records
+
+
+def _account_names_cmd(cluster_name: str | None) -> list[str]:
+    cmd = split("sacctmgr show -nP account withassoc where parents=root format=Account")
+    if cluster_name:
+        cmd.append(f"cluster={cluster_name}")
+
+    return cmd
+
+
+def _account_pi_cmd(account_name: str) -> list[str]:
+    return split(f"sacctmgr show -nP account where account={account_name} format=Descr")
+
+
+def _account_users_cmd(account_name: str, cluster_name: str | None) -> list[str]:
+    cmd = split(f"sacctmgr show -nP association where account={account_name} format=user")
+    if cluster_name:
+        cmd.append(f"cluster={cluster_name}")
+
+    return cmd
+
+
+def _associations_cmd(cluster_name: str) -> list[str]:
+    return split(f"sacctmgr show -nP association where cluster={cluster_name} format=Account,User")
+
+
+def _account_pis_cmd() -> list[str]:
+    return split("sacctmgr show -nP account format=Account,Descr")
+
+
+def _parse_associations(output: str) -> dict[str, set[str]]:
+    """Parse ``Account|User`` association records into a mapping of account names to usernames
+
+    Accounts without any user level associations are included with an empty set of users.
+    The `root` account and lines not matching the expected format are ignored.
+
+    Args:
+        output: Parsable command output from `sacctmgr`
+
+    Returns:
+        A dictionary mapping Slurm account names to the usernames associated with each account
+    """
+
+    associations = dict()
+    for line in output.splitlines():
+        fields = line.split('|')
+        if len(fields) != 2:
+            continue
+
+        account_name, user_name = (field.strip() for field in fields)
+        if not account_name or account_name == 'root':
+            continue
+
+        users = associations.setdefault(account_name, set())
+        if user_name:
+            users.add(user_name)
+
+    return associations
+
+
+def _parse_account_pis(output: str) -> dict[str, str]:
+    """Parse ``Account|Descr`` records into a mapping of account names to PI usernames, skipping empty descriptions"""
+
+    pis = dict()
+    for line in output.splitlines():
+        account_name, _, description = line.partition('|')
+        if account_name.strip() and description.strip():
+            pis[account_name.strip()] = description.strip()
+
+    return pis
+
+
+def _set_limit_cmd(account_name: str, cluster_name: str, limit: int) -> list[str]:
+    limit *= 60  # Convert the input hours to minutes
+    return split(f"sacctmgr modify -i account where account={account_name} cluster={cluster_name} set GrpTresMins=billing={limit}")
+
+
+def _set_limits_stdin(cluster_name: str, limits: dict[str, int], chunk_size: int) -> str:
+    accounts_by_limit = defaultdict(list)
+    for account_name, limit in limits.items():
+        accounts_by_limit[limit].append(account_name)
+
+    statements = []
+    for limit, account_names in accounts_by_limit.items():
+        for i in range(0, len(account_names), chunk_size):
+            accounts = ','.join(account_names[i:i + chunk_size])
+            statements.append(
+                f"modify account where account={accounts} cluster={cluster_name} set GrpTresMins=billing={limit * 60}"
+            )
+
+    return '\n'.join(statements) + '\n'
+
+
+def _get_limit_cmd(account_name: str, cluster_name: str) -> list[str]:
+    return split(f"sacctmgr show -nP association where account={account_name} cluster={cluster_name} format=GrpTRESMins")
+
+
+def _get_limits_cmd(cluster_name: str) -> list[str]:
+    return split(f"sacctmgr show -nP association where cluster={cluster_name} format=Account,User,GrpTRESMins")
+
+
+def _get_usage_cmd(account_name: str, cluster_name: str) -> list[str]:
+    return split(f"sshare -nP -A {account_name} -M {cluster_name} --format=GrpTRESRaw")
+
+
+def _get_usages_cmd(cluster_name: str) -> list[str]:
+    return split(f"sshare -nP -a -M {cluster_name} --format=Account,User,GrpTRESRaw")
+
+
+@_cached('get_slurm_account_names')
+@_guarded('get_slurm_account_names')
 def get_slurm_account_names(cluster_name: str | None = None) -> set[str]:
     """Return a list of Slurm account names from `sacctmgr`
 
@@ -48,13 +731,19 @@ def get_slurm_account_names(cluster_name: str | None = None) -> set[str]:
         A set of unique Slurm account names
     """
 
-    cmd = split("sacctmgr show -nP account withassoc where parents=root format=Account")
-    if cluster_name:
-        cmd.append(f"cluster={cluster_name}")
+    return set(subprocess_call(_account_names_cmd(cluster_name)).split())
+
+
+@_cached('get_slurm_account_names')
+@_guarded('get_slurm_account_names')
+async def aget_slurm_account_names(cluster_name: str | None = None) -> set[str]:
+    """Asynchronous version of `get_slurm_account_names`"""
 
-    return set(subprocess_call(cmd).split())
+    return set((await async_subprocess_call(_account_names_cmd(cluster_name))).split())
 
 
+@_cached('get_slurm_account_principal_investigator')
+@_guarded('get_slurm_account_principal_investigator')
 def get_slurm_account_principal_investigator(account_name: str) -> str:
     """Return the Principal Investigator (PI) username (Slurm account description field) for a Slurm account given the
     account name
@@ -66,10 +755,19 @@ def get_slurm_account_principal_investigator(account_name: str) -> str:
         The Slurm account PI username (description field)
     """
 
-    cmd = split(f"sacctmgr show -nP account where account={account_name} format=Descr")
-    return subprocess_call(cmd)
+    return subprocess_call(_account_pi_cmd(account_name))
 
 
+@_cached('get_slurm_account_principal_investigator')
+@_guarded('get_slurm_account_principal_investigator')
+async def aget_slurm_account_principal_investigator(account_name: str) -> str:
+    """Asynchronous version of `get_slurm_account_principal_investigator`"""
+
+    return await async_subprocess_call(_account_pi_cmd(account_name))
+
+
+@_cached('get_slurm_account_users')
+@_guarded('get_slurm_account_users')
 def get_slurm_account_users(account_name: str, cluster_name: str | None = None) -> set[str]:
     """Return all usernames tied to a Slurm account
 
@@ -81,13 +779,63 @@ def get_slurm_account_users(account_name: str, cluster_name: str | None = None)
         The account owner username
     """
 
-    cmd = split(f"sacctmgr show -nP association where account={account_name} format=user")
-    if cluster_name:
-        cmd.append(f"cluster={cluster_name}")
+    return set(subprocess_call(_account_users_cmd(account_name, cluster_name)).split())
+
+
+@_cached('get_slurm_account_users')
+@_guarded('get_slurm_account_users')
+async def aget_slurm_account_users(account_name: str, cluster_name: str | None = None) -> set[str]:
+    """Asynchronous version of `get_slurm_account_users`"""
+
+    return set((await async_subprocess_call(_account_users_cmd(account_name, cluster_name))).split())
+
+
+@_guarded('get_cluster_associations')
+def get_cluster_associations(cluster_name: str) -> dict[str, set[str]]:
+    """Return the users associated with every Slurm account on a given cluster
 
-    return set(subprocess_call(cmd).split())
+    Associations are fetched using a single `sacctmgr` call.
+    The `root` account is ignored.
 
+    Args:
+        cluster_name: The name of the Slurm cluster
+
+    Returns:
+        A dictionary mapping Slurm account names to the usernames associated with each account
+    """
+
+    return _parse_associations(subprocess_call(_associations_cmd(cluster_name)))
+
+
+@_guarded('get_cluster_associations')
+async def aget_cluster_associations(cluster_name: str) -> dict[str, set[str]]:
+    """Asynchronous version of `get_cluster_associations`"""
+
+    return _parse_associations(await async_subprocess_call(_associations_cmd(cluster_name)))
+
+
+@_guarded('get_slurm_account_principal_investigators')
+def get_slurm_account_principal_investigators() -> dict[str, str]:
+    """Return the Principal Investigator (PI) username (Slurm account description field) for every Slurm account
+
+    PI usernames are fetched using a single `sacctmgr` call.
+    Accounts with an empty description are omitted.
 
+    Returns:
+        A dictionary mapping Slurm account names to PI usernames
+    """
+
+    return _parse_account_pis(subprocess_call(_account_pis_cmd()))
+
+
+@_guarded('get_slurm_account_principal_investigators')
+async def aget_slurm_account_principal_investigators() -> dict[str, str]:
+    """Asynchronous version of `get_slurm_account_principal_investigators`"""
+
+    return _parse_account_pis(await async_subprocess_call(_account_pis_cmd()))
+
+
+@_guarded('set_cluster_limit')
 def set_cluster_limit(account_name: str, cluster_name: str, limit: int) -> None:
     """Update the TRES Billing usage limit for a given Slurm account and cluster
 
@@ -99,16 +847,82 @@ def set_cluster_limit(account_name: str, cluster_name: str, limit: int) -> None:
         limit: The new TRES usage limit in hours
     """
 
-    limit *= 60  # Convert the input hours to minutes
-    cmd = split(f"sacctmgr modify -i account where account={account_name} cluster={cluster_name} set GrpTresMins=billing={limit}")
-    subprocess_call(cmd)
+    subprocess_call(_set_limit_cmd(account_name, cluster_name, limit))
+    _cache_delete(_cache_key('get_cluster_limit', account_name, cluster_name))
+
+
+@_guarded('set_cluster_limit')
+async def aset_cluster_limit(account_name: str, cluster_name: str, limit: int) -> None:
+    """Asynchronous version of `set_cluster_limit`"""
 
+    await async_subprocess_call(_set_limit_cmd(account_name, cluster_name, limit))
+    await sync_to_async(_cache_delete)(_cache_key('get_cluster_limit', account_name, cluster_name))
 
+
+@_guarded('set_cluster_limits')
+def set_cluster_limits(cluster_name: str, limits: dict[str, int], chunk_size: int = 250) -> dict[str, bool]:
+    """Update the TRES Billing usage limits for multiple Slurm accounts on a given cluster
+
+    Accounts sharing the same limit are grouped into multi-account `modify` statements
+    (at most `chunk_size` accounts per statement) and all statements are submitted through
+    a single `sacctmgr` process. The applied limits are verified using a single follow-up query.
+
+    The default expected limit unit is Hours, and a conversion takes place as Slurm uses minutes.
+
+    Args:
+        cluster_name: The name of the Slurm cluster
+        limits: A dictionary mapping Slurm account names to their new TRES usage limit in hours
+        chunk_size: The maximum number of accounts to include in a single `modify` statement
+
+    Returns:
+        A dictionary mapping each Slurm account name to whether the new limit was applied successfully
+    """
+
+    if not limits:
+        return dict()
+
+    try:
+        subprocess_call(split("sacctmgr -i"), stdin=_set_limits_stdin(cluster_name, limits, chunk_size))
+
+    except SlurmTransientError:
+        raise
+
+    except RuntimeError:
+        pass  # Individual statements may still have succeeded and are checked below
+
+    _cache_delete(*(_cache_key('get_cluster_limit', account_name, cluster_name) for account_name in limits))
+    applied_limits = get_cluster_limits(cluster_name)
+    return {account_name: applied_limits.get(account_name) == limit for account_name, limit in limits.items()}
+
+
+@_guarded('set_cluster_limits')
+async def aset_cluster_limits(cluster_name: str, limits: dict[str, int], chunk_size: int = 250) -> dict[str, bool]:
+    """Asynchronous version of `set_cluster_limits`"""
+
+    if not limits:
+        return dict()
+
+    try:
+        await async_subprocess_call(split("sacctmgr -i"), stdin=_set_limits_stdin(cluster_name, limits, chunk_size))
+
+    except SlurmTransientError:
+        raise
+
+    except RuntimeError:
+        pass  # Individual statements may still have succeeded and are checked below
+
+    keys = [_cache_key('get_cluster_limit', account_name, cluster_name) for account_name in limits]
+    await sync_to_async(_cache_delete)(*keys)
+    applied_limits = await aget_cluster_limits(cluster_name)
+    return {account_name: applied_limits.get(account_name) == limit for account_name, limit in limits.items()}
+
+
+@_cached('get_cluster_limit')
+@_guarded('get_cluster_limit')
 def get_cluster_limit(account_name: str, cluster_name: str) -> int:
     """Return the current TRES Billing usage limit for a given Slurm account and cluster
 
     The limit unit coming out of Slurm is minutes, and the default behavior is to convert this to hours.
-    This can be skipped with in_hours = False.
 
     Args:
         account_name: The name of the Slurm account
@@ -118,19 +932,20 @@ def get_cluster_limit(account_name: str, cluster_name: str) -> int:
         The current TRES Billing usage limit in hours
     """
 
-    cmd = split(f"sacctmgr show -nP association where account={account_name} cluster={cluster_name} format=GrpTRESMins")
+    cmd = _get_limit_cmd(account_name, cluster_name)
+    return _parse_billing_hours(subprocess_call(cmd), cmd)
 
-    try:
-        limit = re.findall(r'billing=(.*)', subprocess_call(cmd))[0]
 
-    except IndexError:
-        log.debug(f"'billing' limit not found in command output from {cmd}, assuming zero for current limit")
-        return 0
+@_cached('get_cluster_limit')
+@_guarded('get_cluster_limit')
+async def aget_cluster_limit(account_name: str, cluster_name: str) -> int:
+    """Asynchronous version of `get_cluster_limit`"""
 
-    limit = int(limit) if limit.isnumeric() else 0
-    return limit // 60  # convert from minutes to hours
+    cmd = _get_limit_cmd(account_name, cluster_name)
+    return _parse_billing_hours(await async_subprocess_call(cmd), cmd)
 
 
+@_guarded('get_cluster_usage')
 def get_cluster_usage(account_name: str, cluster_name: str) -> int:
     """Return the total billable usage in hours for a given Slurm account
 
@@ -142,14 +957,163 @@ def get_cluster_usage(account_name: str, cluster_name: str) -> int:
         An integer representing the total (historical + current) billing TRES hours usage from sshare
     """
 
-    cmd = split(f"sshare -nP -A {account_name} -M {cluster_name} --format=GrpTRESRaw")
+    cmd = _get_usage_cmd(account_name, cluster_name)
+    return _parse_billing_hours(subprocess_call(cmd), cmd)
+
+
+@_guarded('get_cluster_usage')
+async def aget_cluster_usage(account_name: str, cluster_name: str) -> int:
+    """Asynchronous version of `get_cluster_usage`"""
+
+    cmd = _get_usage_cmd(account_name, cluster_name)
+    return _parse_billing_hours(await async_subprocess_call(cmd), cmd)
+
+
+@_guarded('get_cluster_limits')
+def get_cluster_limits(cluster_name: str) -> dict[str, int]:
+    """Return the current TRES Billing usage limits for all Slurm accounts on a given cluster
+
+    Limits are fetched using a single `sacctmgr` call and returned in units of hours.
+    User level associations are ignored.
+
+    Args:
+        cluster_name: The name of the Slurm cluster
+
+    Returns:
+        A dictionary mapping Slurm account names to their TRES Billing usage limit in hours
+    """
+
+    return _parse_account_records(subprocess_call(_get_limits_cmd(cluster_name)))
+
+
+@_guarded('get_cluster_limits')
+async def aget_cluster_limits(cluster_name: str) -> dict[str, int]:
+    """Asynchronous version of `get_cluster_limits`"""
+
+    return _parse_account_records(await async_subprocess_call(_get_limits_cmd(cluster_name)))
+
+
+@_guarded('get_cluster_usages')
+def get_cluster_usages(cluster_name: str) -> dict[str, int]:
+    """Return the total billable usage in hours for all Slurm accounts on a given cluster
+
+    Usage values are fetched using a single `sshare` call.
+    User level usage records are ignored.
+
+    Args:
+        cluster_name: The name of the cluster to get usage on
+
+    Returns:
+        A dictionary mapping Slurm account names to their total (historical + current) billing TRES hours usage
+    """
+
+    return _parse_account_records(subprocess_call(_get_usages_cmd(cluster_name)))
+
+
+@_guarded('get_cluster_usages')
+async def aget_cluster_usages(cluster_name: str) -> dict[str, int]:
+    """Asynchronous version of `get_cluster_usages`"""
+
+    return _parse_account_records(await async_subprocess_call(_get_usages_cmd(cluster_name)))
+
+
+def _parse_sacct_time(value: str) -> datetime | None:
+    """Parse a timestamp from `sacct` output into a timezone aware datetime"""
+
+    try:
+        return timezone.make_aware(datetime.fromisoformat(value))
+
+    except ValueError:  # Covers placeholder values like `Unknown` and `None`
+        return None
+
+
+def _parse_count(value: str) -> int:
+    """Parse an integer TRES count, treating missing or non-numeric values as zero"""
+
+    return int(value) if value.isnumeric() else 0
+
+
+def parse_memory(value: str) -> int:
+    """Parse a TRES memory value with an optional unit suffix into megabytes
+
+    Missing or non-numeric values are treated as zero.
+
+    Args:
+        value: A memory value as reported by Slurm (e.g., ``8G`` or ``512M``)
+
+    Returns:
+        The memory value in megabytes
+    """
+
+    multipliers = {'K': 1 / 1024, 'M': 1, 'G': 1024, 'T': 1024 ** 2, 'P': 1024 ** 3}
+    if value and value[-1].upper() in multipliers:
+        number, multiplier = value[:-1], multipliers[value[-1].upper()]
+
+    else:
+        number, multiplier = value, 1
 
     try:
-        usage = re.findall(r'billing=(.*),fs', subprocess_call(cmd))[0]
+        return int(float(number) * multiplier)
 
-    except IndexError:
-        log.debug(f"'billing' usage not found in command output from {cmd}, assuming zero for current usage")
+    except ValueError:
         return 0
 
-    usage = int(usage) if usage.isnumeric() else 0
-    return usage // 60  # convert from minutes to hours
+
+def iter_job_records(cluster_name: str, start: datetime, end: datetime) -> Iterator[dict]:
+    """Stream accounting records for jobs running on a cluster within a given time window
+
+    Records are read from `sacct` line by line and yielded one at a time.
+    Only job allocations are included, individual job steps are ignored.
+    The `sacct` process is killed if it runs longer than ``SLURM_COMMAND_TIMEOUT`` seconds.
+
+    Args:
+        cluster_name: The name of the Slurm cluster
+        start: Only include jobs running at or after this time
+        end: Only include jobs running at or before this time
+
+    Returns:
+        An iterator over job records with the keys `job_id`, `user`, `account`, `end`, `elapsed`, `billing`,
+        `cpu`, `mem`, and `gpu`. Memory is returned in megabytes.
+    """
+
+    time_format = '%Y-%m-%dT%H:%M:%S'
+    cmd = split(
+        f"sacct -nP -X --allusers --clusters={cluster_name} "
+        f"--starttime={timezone.localtime(start).strftime(time_format)} "
+        f"--endtime={timezone.localtime(end).strftime(time_format)} "
+        f"--format=JobIDRaw,User,Account,End,ElapsedRaw,AllocTRES"
+    )
+
+    # Streamed output cannot be safely retried, but failures still count toward the circuit breaker
+    _circuit_check(cluster_name)
+    try:
+        yield from _iter_job_fields(subprocess_stream(cmd))
+
+    except SlurmTransientError:
+        _circuit_failure(cluster_name)
+        raise
+
+    _circuit_success(cluster_name)
+
+
+def _iter_job_fields(lines: Iterator[str]) -> Iterator[dict]:
+    """Parse lines of `sacct` output into job records, skipping lines not matching the expected format"""
+
+    for line in lines:
+        fields = line.split('|')
+        if len(fields) != 6:
+            continue
+
+        job_id, user, account, end_time, elapsed, tres = fields
+        tres = parse_tres(tres)
+        yield {
+            'job_id': job_id,
+            'user': user,
+            'account': account,
+            'end': _parse_sacct_time(end_time),
+            'elapsed': int(elapsed) if elapsed.isnumeric() else 0,
+            'billing': _parse_count(tres.get('billing', '')),
+            'cpu': _parse_count(tres.get('cpu', '')),
+            'mem': parse_memory(tres.get('mem', '')),
+            'gpu': _parse_count(tres.get('gres/gpu', '')),
+        }
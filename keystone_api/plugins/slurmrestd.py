@@ -0,0 +1,311 @@
+"""Scheduler backend for the Slurm REST API (`slurmrestd`)
+
+Requests are issued over persistent HTTP/1.1 connections that are pooled and reused
+between calls, avoiding the cost of forking a command line process for every query.
+Limits and usage values for an entire cluster are fetched using a single request.
+
+The `SLURMRESTD_URL` setting may include a ``{cluster}`` placeholder for sites running a
+separate `slurmrestd` instance per cluster (e.g., ``https://{cluster}-rest.example.com``).
+Usage values are only reported by the controller of a single cluster, so the placeholder
+is required to query usage on more than one cluster.
+"""
+
+import json
+import logging
+import queue
+import threading
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+
+from plugins.scheduler import SchedulerBackend
+
+__all__ = ['ConnectionPool', 'SlurmRestBackend']
+
+log = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """Thread safe pool of persistent HTTP connections to a single host
+
+    Connections are created on demand and returned to the pool after each request.
+    At most `size` idle connections are retained, additional connections are closed.
+    """
+
+    def __init__(self, url: str, size: int = 4, timeout: float | None = None) -> None:
+        """Initialize the connection pool
+
+        Args:
+            url: Base URL of the remote host including the scheme
+            size: Maximum number of idle connections to retain
+            timeout: Socket timeout in seconds
+        """
+
+        parsed = urlsplit(url)
+        self._connection_class = HTTPSConnection if parsed.scheme == 'https' else HTTPConnection
+        self._host = parsed.hostname
+        self._port = parsed.port
+        self._base_path = parsed.path.rstrip('/')
+        self._timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _get_connection(self) -> HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+
+        except queue.Empty:
+            return self._connection_class(self._host, self._port, timeout=self._timeout)
+
+    def _release_connection(self, connection: HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(connection)
+
+        except queue.Full:
+            connection.close()
+
+    def request(self, method: str, path: str, body: bytes | None = None, headers: dict | None = None) -> tuple[int, bytes]:
+        """Submit an HTTP request using a pooled connection
+
+        Requests failing on a reused connection are retried once on a new connection,
+        since the remote host may have closed the idle connection in the meantime.
+
+        Args:
+            method: The HTTP request method
+            path: The request path relative to the pool's base URL
+            body: Optional request body
+            headers: Optional request headers
+
+        Returns:
+            The response status code and response body
+        """
+
+        for attempt in range(2):
+            connection = self._get_connection()
+            is_reused = connection.sock is not None
+            try:
+                connection.request(method, self._base_path + path, body=body, headers=headers or dict())
+                response = connection.getresponse()
+                content = response.read()
+
+            except (HTTPException, OSError) as error:
+                connection.close()
+                if is_reused and attempt == 0:
+                    continue
+
+                raise RuntimeError(f'Error communicating with {self._host}: {error}') from error
+
+            if response.will_close:
+                connection.close()
+
+            else:
+                self._release_connection(connection)
+
+            return response.status, content
+
+    def close(self) -> None:
+        """Close all idle connections"""
+
+        while True:
+            try:
+                self._idle.get_nowait().close()
+
+            except queue.Empty:
+                return
+
+
+class SlurmRestBackend(SchedulerBackend):
+    """Scheduler backend communicating with Slurm via the `slurmrestd` REST API
+
+    Configuration is loaded from the `SLURMRESTD_URL`, `SLURMRESTD_USER`, `SLURMRESTD_TOKEN`,
+    `SLURMRESTD_API_VERSION`, and `SLURMRESTD_POOL_SIZE` settings.
+    """
+
+    def __init__(self) -> None:
+        self._pools: dict[str, ConnectionPool] = dict()
+        self._lock = threading.Lock()
+
+    def _get_pool(self, cluster_name: str) -> ConnectionPool:
+        """Return the connection pool for the `slurmrestd` instance serving a given cluster"""
+
+        url = settings.SLURMRESTD_URL.format(cluster=cluster_name)
+        with self._lock:
+            if url not in self._pools:
+                self._pools[url] = ConnectionPool(url, settings.SLURMRESTD_POOL_SIZE, settings.SLURM_COMMAND_TIMEOUT or None)
+
+            return self._pools[url]
+
+    def _request(self, method: str, cluster_name: str, path: str, params: dict | None = None, data: dict | None = None) -> dict:
+        """Submit an API request and return the decoded JSON response
+
+        Raises:
+            RuntimeError: If the request fails or the API reports an error
+        """
+
+        path = path.format(version=settings.SLURMRESTD_API_VERSION)
+        if params:
+            path += '?' + urlencode(params)
+
+        headers = {
+            'Accept': 'application/json',
+            'X-SLURM-USER-NAME': settings.SLURMRESTD_USER,
+            'X-SLURM-USER-TOKEN': settings.SLURMRESTD_TOKEN,
+        }
+
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        status, content = self._get_pool(cluster_name).request(method, path, body, headers)
+        try:
+            response = json.loads(content) if content else dict()
+
+        except ValueError:
+            response = dict()
+
+        if status >= 400 or response.get('errors'):
+            message = f"slurmrestd request failed: {method} {path} ({status}) {response.get('errors', '')}"
+            log.error(message)
+            raise RuntimeError(message)
+
+        return response
+
+    @staticmethod
+    def _get_billing(tres_list: list[dict], key: str) -> int:
+        """Return the billing value from a list of TRES records converted from minutes to hours"""
+
+        for tres in tres_list or []:
+            if tres.get('type') == 'billing' or tres.get('name') == 'billing':
+                value = tres.get(key)
+                if isinstance(value, dict):  # Newer API versions wrap numbers in an object
+                    value = value.get('number') if value.get('set', True) else 0
+
+                return int(value or 0) // 60
+
+        return 0
+
+    def _get_all_associations(self, cluster_name: str, account_name: str | None = None) -> list[dict]:
+        """Return account and user level associations on a given cluster"""
+
+        params = {'cluster': cluster_name}
+        if account_name:
+            params['account'] = account_name
+
+        response = self._request('GET', cluster_name, '/slurmdb/{version}/associations', params)
+        return response.get('associations', [])
+
+    def _get_associations(self, cluster_name: str, account_name: str | None = None) -> list[dict]:
+        """Return account level associations on a given cluster, excluding user associations"""
+
+        return [assoc for assoc in self._get_all_associations(cluster_name, account_name) if not assoc.get('user')]
+
+    def _association_limit(self, association: dict) -> int:
+        minutes = association.get('max', {}).get('tres', {}).get('group', {}).get('minutes', [])
+        return self._get_billing(minutes, 'count')
+
+    def _get_shares(self, cluster_name: str, account_name: str | None = None) -> dict[str, int]:
+        """Return raw billing usage for account level share records
+
+        Share records are served by the `slurmctld` instance behind the configured URL and
+        cannot be filtered by cluster. Records are only trusted if they report the requested
+        cluster, or if the URL includes a ``{cluster}`` placeholder when no cluster is reported.
+
+        Raises:
+            RuntimeError: If the share records cannot be attributed to the requested cluster
+        """
+
+        params = {'accounts': account_name} if account_name else None
+        response = self._request('GET', cluster_name, '/slurm/{version}/shares', params)
+        shares = response.get('shares', {})
+        if isinstance(shares, dict):
+            shares = shares.get('shares', [])
+
+        usages = dict()
+        for share in shares:
+            if 'USER' in share.get('type', []):
+                continue
+
+            reported_cluster = share.get('cluster') or None
+            if reported_cluster != cluster_name and (reported_cluster or '{cluster}' not in settings.SLURMRESTD_URL):
+                message = (
+                    f"slurmrestd share records for {reported_cluster or 'an unknown cluster'} cannot be used as "
+                    f"usage for {cluster_name}. Include a {{cluster}} placeholder in SLURMRESTD_URL to query "
+                    f"the slurmrestd instance of each cluster."
+                )
+                log.error(message)
+                raise RuntimeError(message)
+
+            usages[share['name']] = self._get_billing(share.get('tres', {}).get('usage', []), 'value')
+
+        return usages
+
+    def get_account_names(self, cluster_name: str) -> set[str]:
+        return {
+            assoc['account'] for assoc in self._get_associations(cluster_name)
+            if assoc.get('parent_account') == 'root'
+        }
+
+    def get_associations(self, cluster_name: str) -> dict[str, set[str]]:
+        associations = dict()
+        for assoc in self._get_all_associations(cluster_name):
+            account_name = assoc.get('account')
+            if not account_name or account_name == 'root':
+                continue
+
+            users = associations.setdefault(account_name, set())
+            if assoc.get('user'):
+                users.add(assoc['user'])
+
+        return associations
+
+    def get_principal_investigators(self, cluster_name: str) -> dict[str, str]:
+        # PI usernames are stored in the account description field
+        response = self._request('GET', cluster_name, '/slurmdb/{version}/accounts')
+        return {
+            account['name']: account['description'].strip()
+            for account in response.get('accounts', []) if (account.get('description') or '').strip()
+        }
+
+    def get_limit(self, account_name: str, cluster_name: str) -> int:
+        for association in self._get_associations(cluster_name, account_name):
+            if association.get('account') == account_name:
+                return self._association_limit(association)
+
+        return 0
+
+    def get_limits(self, cluster_name: str) -> dict[str, int]:
+        return {assoc['account']: self._association_limit(assoc) for assoc in self._get_associations(cluster_name)}
+
+    def set_limit(self, account_name: str, cluster_name: str, limit: int) -> None:
+        if not self.set_limits(cluster_name, {account_name: limit})[account_name]:
+            raise RuntimeError(f'Failed to update limit for {account_name} on {cluster_name}.')
+
+    def set_limits(self, cluster_name: str, limits: dict[str, int]) -> dict[str, bool]:
+        if not limits:
+            return dict()
+
+        associations = [
+            {
+                'account': account_name,
+                'cluster': cluster_name,
+                'user': '',
+                'max': {'tres': {'group': {'minutes': [{'type': 'billing', 'count': limit * 60}]}}},
+            }
+            for account_name, limit in limits.items()
+        ]
+
+        try:
+            self._request('POST', cluster_name, '/slurmdb/{version}/associations', data={'associations': associations})
+
+        except RuntimeError:
+            pass  # Individual updates may still have succeeded and are checked below
+
+        applied_limits = self.get_limits(cluster_name)
+        return {account_name: applied_limits.get(account_name) == limit for account_name, limit in limits.items()}
+
+    def get_usage(self, account_name: str, cluster_name: str) -> int:
+        return self._get_shares(cluster_name, account_name).get(account_name, 0)
+
+    def get_usages(self, cluster_name: str) -> dict[str, int]:
+        return self._get_shares(cluster_name)
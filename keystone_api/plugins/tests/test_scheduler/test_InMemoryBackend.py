@@ -0,0 +1,131 @@
+"""Unit tests for the `InMemoryBackend` class."""
+
+from django.test import TestCase
+
+from plugins.scheduler import InMemoryBackend
+
+
+class AddAccounts(TestCase):
+    """Test the population of simulated accounts."""
+
+    def setUp(self) -> None:
+        """Create a backend with a single simulated cluster."""
+
+        self.backend = InMemoryBackend()
+        self.backend.add_accounts('cluster1', ['account1', 'account2'], limits=[10, 20], usage=[1, 2])
+
+    def test_accounts_are_added(self) -> None:
+        """Test account names, limits, and usage values are stored."""
+
+        self.assertEqual({'account1', 'account2'}, self.backend.get_account_names('cluster1'))
+        self.assertDictEqual({'account1': 10, 'account2': 20}, self.backend.get_limits('cluster1'))
+        self.assertDictEqual({'account1': 1, 'account2': 2}, self.backend.get_usages('cluster1'))
+
+    def test_existing_accounts_are_overwritten(self) -> None:
+        """Test values for existing accounts are replaced and new accounts are appended."""
+
+        self.backend.add_accounts('cluster1', ['account2', 'account3'], limits=[25, 30])
+        self.assertDictEqual({'account1': 10, 'account2': 25, 'account3': 30}, self.backend.get_limits('cluster1'))
+        self.assertDictEqual({'account1': 1, 'account2': 0, 'account3': 0}, self.backend.get_usages('cluster1'))
+
+    def test_mismatched_lengths(self) -> None:
+        """Test a `ValueError` is raised when value arrays do not match the account names."""
+
+        with self.assertRaises(ValueError):
+            self.backend.add_accounts('cluster1', ['account3'], limits=[1, 2])
+
+    def test_unknown_cluster(self) -> None:
+        """Test empty values are returned for clusters that do not exist."""
+
+        self.assertEqual(set(), self.backend.get_account_names('cluster2'))
+        self.assertDictEqual(dict(), self.backend.get_limits('cluster2'))
+        self.assertEqual(0, self.backend.get_limit('account1', 'cluster2'))
+
+
+class AddUsers(TestCase):
+    """Test the association of simulated users with accounts."""
+
+    def setUp(self) -> None:
+        """Create a backend with a single simulated cluster."""
+
+        self.backend = InMemoryBackend()
+        self.backend.add_accounts('cluster1', ['account1', 'account2'])
+
+    def test_users_are_associated(self) -> None:
+        """Test users and PIs are returned for each account."""
+
+        self.backend.add_users('cluster1', 'account1', ['user1', 'user2'], pi='user1')
+        self.assertDictEqual({'account1': {'user1', 'user2'}, 'account2': set()}, self.backend.get_associations('cluster1'))
+        self.assertDictEqual({'account1': 'user1'}, self.backend.get_principal_investigators('cluster1'))
+
+    def test_missing_account(self) -> None:
+        """Test a `KeyError` is raised when associating users with an account that does not exist."""
+
+        with self.assertRaises(KeyError):
+            self.backend.add_users('cluster1', 'account3', ['user1'])
+
+    def test_unknown_cluster(self) -> None:
+        """Test empty values are returned for clusters that do not exist."""
+
+        self.assertDictEqual(dict(), self.backend.get_associations('cluster2'))
+        self.assertDictEqual(dict(), self.backend.get_principal_investigators('cluster2'))
+
+
+class SetLimits(TestCase):
+    """Test updating simulated account limits."""
+
+    def setUp(self) -> None:
+        """Create a backend with a single simulated cluster."""
+
+        self.backend = InMemoryBackend()
+        self.backend.add_accounts('cluster1', ['account1', 'account2'], limits=[10, 20])
+
+    def test_set_limit(self) -> None:
+        """Test the limit is updated for a single account."""
+
+        self.backend.set_limit('account1', 'cluster1', 15)
+        self.assertEqual(15, self.backend.get_limit('account1', 'cluster1'))
+        self.assertEqual(20, self.backend.get_limit('account2', 'cluster1'))
+
+    def test_set_limit_missing_account(self) -> None:
+        """Test a `RuntimeError` is raised for accounts that do not exist."""
+
+        with self.assertRaises(RuntimeError):
+            self.backend.set_limit('account3', 'cluster1', 15)
+
+    def test_set_limits(self) -> None:
+        """Test limits are updated in bulk and missing accounts are reported as failures."""
+
+        results = self.backend.set_limits('cluster1', {'account1': 11, 'account2': 22, 'account3': 33})
+        self.assertDictEqual({'account1': True, 'account2': True, 'account3': False}, results)
+        self.assertDictEqual({'account1': 11, 'account2': 22}, self.backend.get_limits('cluster1'))
+
+
+class Generate(TestCase):
+    """Test the generation of randomly populated backends."""
+
+    def test_accounts_are_generated(self) -> None:
+        """Test the requested number of clusters and accounts are created with usage within limits."""
+
+        backend = InMemoryBackend.generate(num_clusters=3, accounts_per_cluster=1000, seed=42)
+        for cluster_name in ('cluster0', 'cluster1', 'cluster2'):
+            limits = backend.get_limits(cluster_name)
+            usages = backend.get_usages(cluster_name)
+            self.assertEqual(1000, len(limits))
+            self.assertTrue(all(usages[name] <= limits[name] for name in limits))
+
+    def test_generation_is_reproducible(self) -> None:
+        """Test backends generated with the same seed contain the same values."""
+
+        backend1 = InMemoryBackend.generate(num_clusters=1, accounts_per_cluster=100, seed=1)
+        backend2 = InMemoryBackend.generate(num_clusters=1, accounts_per_cluster=100, seed=1)
+        self.assertDictEqual(backend1.get_limits('cluster0'), backend2.get_limits('cluster0'))
+
+    def test_simulate_usage(self) -> None:
+        """Test simulated usage only increases account usage values."""
+
+        backend = InMemoryBackend.generate(num_clusters=1, accounts_per_cluster=100, seed=1)
+        before = backend.get_usages('cluster0')
+        backend.simulate_usage('cluster0', max_hours=10, seed=1)
+        after = backend.get_usages('cluster0')
+        self.assertTrue(all(0 <= after[name] - before[name] <= 10 for name in before))
@@ -0,0 +1,26 @@
+"""Unit tests for the `get_scheduler_backend` function."""
+
+from django.test import override_settings, TestCase
+
+from plugins.scheduler import get_scheduler_backend, InMemoryBackend, SlurmCLIBackend
+
+
+class BackendSelection(TestCase):
+    """Test the scheduler backend is selected using application settings."""
+
+    def test_default_backend(self) -> None:
+        """Test the Slurm CLI backend is used by default."""
+
+        self.assertIsInstance(get_scheduler_backend(), SlurmCLIBackend)
+
+    @override_settings(SCHEDULER_BACKEND='plugins.scheduler.InMemoryBackend')
+    def test_configured_backend(self) -> None:
+        """Test the backend class is loaded from the `SCHEDULER_BACKEND` setting."""
+
+        self.assertIsInstance(get_scheduler_backend(), InMemoryBackend)
+
+    @override_settings(SCHEDULER_BACKEND='plugins.scheduler.InMemoryBackend')
+    def test_instance_is_reused(self) -> None:
+        """Test the same backend instance is returned by repeated calls."""
+
+        self.assertIs(get_scheduler_backend(), get_scheduler_backend())
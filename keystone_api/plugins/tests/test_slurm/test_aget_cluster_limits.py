@@ -0,0 +1,26 @@
+"""Unit tests for the `aget_cluster_limits` function."""
+
+from unittest.mock import AsyncMock, patch
+
+from django.test import SimpleTestCase
+
+from plugins.slurm import aget_cluster_limits
+
+
+class ParseCommandOutput(SimpleTestCase):
+    """Test the parsing of `sacctmgr` association records."""
+
+    @patch('plugins.slurm.async_subprocess_call', new_callable=AsyncMock)
+    async def test_account_limits_are_parsed(self, mock_call: AsyncMock) -> None:
+        """Test account level limits are returned in hours and user level records are ignored."""
+
+        mock_call.return_value = (
+            "root||\n"
+            "account1||billing=600\n"
+            "account1|user1|\n"
+            "account2||cpu=10,billing=120\n"
+        )
+
+        limits = await aget_cluster_limits('cluster1')
+        self.assertDictEqual({'root': 0, 'account1': 10, 'account2': 2}, limits)
+        mock_call.assert_awaited_once()
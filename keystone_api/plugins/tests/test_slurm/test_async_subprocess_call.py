@@ -0,0 +1,71 @@
+"""Unit tests for the `async_subprocess_call` function."""
+
+import asyncio
+import time
+
+from django.test import override_settings, SimpleTestCase, TestCase
+
+from plugins.slurm import async_subprocess_call
+
+
+class CommandExecution(TestCase):
+    """Test the execution of shell commands."""
+
+    async def test_stdout_is_returned(self) -> None:
+        """Test command output is returned as a stripped string."""
+
+        self.assertEqual('hello world', await async_subprocess_call(['echo', 'hello world']))
+
+    async def test_stdin_is_piped(self) -> None:
+        """Test input text is piped to the process."""
+
+        self.assertEqual('some input', await async_subprocess_call(['cat'], stdin='some input\n'))
+
+    async def test_nonzero_exit_raises_error(self) -> None:
+        """Test a `RuntimeError` is raised for commands with a nonzero exit code."""
+
+        with self.assertRaises(RuntimeError):
+            await async_subprocess_call(['false'])
+
+
+class CommandTimeout(TestCase):
+    """Test commands are killed after exceeding their timeout."""
+
+    async def test_explicit_timeout(self) -> None:
+        """Test a `RuntimeError` is raised when the given timeout is exceeded."""
+
+        with self.assertRaisesRegex(RuntimeError, 'Timed out'):
+            await async_subprocess_call(['sleep', '5'], timeout=0.1)
+
+    @override_settings(SLURM_COMMAND_TIMEOUT=0.1)
+    async def test_default_timeout(self) -> None:
+        """Test the timeout defaults to the `SLURM_COMMAND_TIMEOUT` setting."""
+
+        with self.assertRaisesRegex(RuntimeError, 'Timed out'):
+            await async_subprocess_call(['sleep', '5'])
+
+
+class BoundedConcurrency(SimpleTestCase):
+    """Test the number of concurrent commands is limited."""
+
+    @override_settings(SLURM_MAX_CONCURRENCY=1)
+    def test_commands_run_sequentially(self) -> None:
+        """Test commands are run one at a time when the concurrency limit is one."""
+
+        async def run_commands() -> None:
+            await asyncio.gather(*(async_subprocess_call(['sleep', '0.2']) for _ in range(3)))
+
+        start = time.monotonic()
+        asyncio.run(run_commands())
+        self.assertGreaterEqual(time.monotonic() - start, 0.6)
+
+    @override_settings(SLURM_MAX_CONCURRENCY=3)
+    def test_commands_run_concurrently(self) -> None:
+        """Test commands are run in parallel up to the concurrency limit."""
+
+        async def run_commands() -> None:
+            await asyncio.gather(*(async_subprocess_call(['sleep', '0.2']) for _ in range(3)))
+
+        start = time.monotonic()
+        asyncio.run(run_commands())
+        self.assertLess(time.monotonic() - start, 0.6)
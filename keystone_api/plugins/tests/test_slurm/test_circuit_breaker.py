@@ -0,0 +1,164 @@
+"""Unit tests for retrying Slurm queries and per-cluster circuit breaking."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+from django.core.cache import caches
+from django.test import override_settings, TestCase
+
+from plugins import slurm
+from plugins.slurm import SlurmCircuitOpenError, SlurmTransientError
+from tests.utils import LOCMEM_CACHES
+
+CIRCUIT_SETTINGS = dict(
+    SLURM_MAX_RETRIES=2,
+    SLURM_RETRY_BACKOFF=0,
+    SLURM_CIRCUIT_THRESHOLD=2,
+    SLURM_CIRCUIT_COOLDOWN=60,
+    CACHES=LOCMEM_CACHES,
+)
+
+
+@override_settings(**CIRCUIT_SETTINGS)
+class Retries(TestCase):
+    """Test transient errors are retried."""
+
+    def setUp(self) -> None:
+        """Clear any stored circuit state."""
+
+        caches[slurm.CACHE_ALIAS].clear()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_transient_errors_are_retried(self, mock_call: Mock) -> None:
+        """Test a query succeeds if a retry succeeds."""
+
+        mock_call.side_effect = [SlurmTransientError('timeout'), 'account1||billing=600']
+        self.assertEqual({'account1': 10}, slurm.get_cluster_usages('cluster1'))
+        self.assertEqual(2, mock_call.call_count)
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_retries_are_limited(self, mock_call: Mock) -> None:
+        """Test the error is raised once all retries are exhausted."""
+
+        mock_call.side_effect = SlurmTransientError('timeout')
+        with self.assertRaises(SlurmTransientError):
+            slurm.get_cluster_usages('cluster1')
+
+        self.assertEqual(3, mock_call.call_count)
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_other_errors_are_not_retried(self, mock_call: Mock) -> None:
+        """Test non-transient errors are raised immediately."""
+
+        mock_call.side_effect = RuntimeError('invalid account')
+        with self.assertRaises(RuntimeError):
+            slurm.get_cluster_usages('cluster1')
+
+        mock_call.assert_called_once()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_nested_queries_are_retried_once(self, mock_call: Mock) -> None:
+        """Test queries called by another guarded query do not multiply the number of retries."""
+
+        mock_call.side_effect = SlurmTransientError('timeout')
+        with self.assertRaises(SlurmTransientError):
+            slurm.set_cluster_limits('cluster1', {'account1': 10})
+
+        self.assertEqual(3, mock_call.call_count)
+
+    @patch('plugins.slurm.async_subprocess_call', new_callable=AsyncMock)
+    async def test_async_transient_errors_are_retried(self, mock_call: AsyncMock) -> None:
+        """Test asynchronous queries are also retried."""
+
+        mock_call.side_effect = [SlurmTransientError('timeout'), 'account1||billing=600']
+        self.assertEqual({'account1': 10}, await slurm.aget_cluster_usages('cluster1'))
+        self.assertEqual(2, mock_call.call_count)
+
+
+@override_settings(**CIRCUIT_SETTINGS)
+class CircuitBreaker(TestCase):
+    """Test commands are rejected for clusters with repeated transient failures."""
+
+    def setUp(self) -> None:
+        """Clear any stored circuit state."""
+
+        caches[slurm.CACHE_ALIAS].clear()
+
+    def fail(self, cluster_name: str) -> None:
+        """Execute a query that fails with a transient error after all retries."""
+
+        with patch('plugins.slurm.subprocess_call', side_effect=SlurmTransientError('timeout')):
+            with self.assertRaises(SlurmTransientError):
+                slurm.get_cluster_usages(cluster_name)
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_circuit_opens_after_threshold(self, mock_call: Mock) -> None:
+        """Test commands are rejected without execution once the failure threshold is reached."""
+
+        self.fail('cluster1')
+        self.fail('cluster1')
+
+        with self.assertRaises(SlurmCircuitOpenError):
+            slurm.get_cluster_usages('cluster1')
+
+        with self.assertRaises(SlurmCircuitOpenError):
+            slurm.set_cluster_limit('account1', 'cluster1', 100)
+
+        mock_call.assert_not_called()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_clusters_are_independent(self, mock_call: Mock) -> None:
+        """Test an open circuit does not affect other clusters."""
+
+        self.fail('cluster1')
+        self.fail('cluster1')
+
+        mock_call.return_value = ''
+        self.assertEqual(dict(), slurm.get_cluster_usages('cluster2'))
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_success_resets_failures(self, mock_call: Mock) -> None:
+        """Test failures must be consecutive to open the circuit."""
+
+        self.fail('cluster1')
+        mock_call.return_value = ''
+        slurm.get_cluster_usages('cluster1')
+        self.fail('cluster1')
+
+        self.assertEqual(dict(), slurm.get_cluster_usages('cluster1'))
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_failed_trial_reopens_circuit(self, mock_call: Mock) -> None:
+        """Test a single failure after the cool-down period reopens the circuit."""
+
+        self.fail('cluster1')
+        self.fail('cluster1')
+
+        _, open_key = slurm._circuit_keys('cluster1')
+        caches[slurm.CACHE_ALIAS].delete(open_key)  # Simulate the end of the cool-down period
+
+        self.fail('cluster1')
+        with self.assertRaises(SlurmCircuitOpenError):
+            slurm.get_cluster_usages('cluster1')
+
+    @override_settings(SLURM_CIRCUIT_THRESHOLD=0)
+    @patch('plugins.slurm.subprocess_call')
+    def test_circuit_disabled(self, mock_call: Mock) -> None:
+        """Test the circuit never opens when the threshold is zero."""
+
+        for _ in range(3):
+            self.fail('cluster1')
+
+        mock_call.return_value = ''
+        self.assertEqual(dict(), slurm.get_cluster_usages('cluster1'))
+
+    @patch('plugins.slurm.subprocess_stream')
+    def test_streamed_queries(self, mock_stream: Mock) -> None:
+        """Test streamed job records are rejected by an open circuit."""
+
+        self.fail('cluster1')
+        self.fail('cluster1')
+
+        with self.assertRaises(SlurmCircuitOpenError):
+            list(slurm.iter_job_records('cluster1', Mock(), Mock()))
+
+        mock_stream.assert_not_called()
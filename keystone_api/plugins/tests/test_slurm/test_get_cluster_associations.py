@@ -0,0 +1,33 @@
+"""Unit tests for the `get_cluster_associations` function."""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from plugins.slurm import get_cluster_associations
+
+
+class ParseAssociations(TestCase):
+    """Test the parsing of account associations."""
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_associations_are_grouped_by_account(self, mock_call: Mock) -> None:
+        """Test user associations are grouped by account and the root account is ignored."""
+
+        mock_call.return_value = '\n'.join([
+            'root|',
+            'root|root',
+            'account1|',
+            'account1|user1',
+            'account1|user2',
+            'account2|',
+            'malformed line',
+        ])
+
+        self.assertDictEqual(
+            {'account1': {'user1', 'user2'}, 'account2': set()},
+            get_cluster_associations('cluster1')
+        )
+
+        mock_call.assert_called_once()
+        self.assertIn('cluster=cluster1', mock_call.call_args.args[0])
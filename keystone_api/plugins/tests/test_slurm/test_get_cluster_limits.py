@@ -0,0 +1,40 @@
+"""Unit tests for the `get_cluster_limits` function."""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from plugins.slurm import get_cluster_limits
+
+
+class ParseCommandOutput(TestCase):
+    """Test the parsing of `sacctmgr` association records."""
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_account_limits_are_parsed(self, mock_call: Mock) -> None:
+        """Test account level limits are returned in hours."""
+
+        mock_call.return_value = (
+            "root||\n"
+            "account1||cpu=10,billing=600\n"
+            "account1|user1|\n"
+            "account2||billing=1200\n"
+        )
+
+        limits = get_cluster_limits('cluster1')
+        self.assertDictEqual({'root': 0, 'account1': 10, 'account2': 20}, limits)
+        mock_call.assert_called_once()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_missing_billing_defaults_to_zero(self, mock_call: Mock) -> None:
+        """Test accounts without a billing limit are assigned a limit of zero."""
+
+        mock_call.return_value = "account1||cpu=10\naccount2||billing=abc"
+        self.assertDictEqual({'account1': 0, 'account2': 0}, get_cluster_limits('cluster1'))
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_malformed_lines_are_ignored(self, mock_call: Mock) -> None:
+        """Test lines not matching the expected format are skipped."""
+
+        mock_call.return_value = "not a record\naccount1||billing=60"
+        self.assertDictEqual({'account1': 1}, get_cluster_limits('cluster1'))
@@ -0,0 +1,34 @@
+"""Unit tests for the `get_cluster_usages` function."""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from plugins.slurm import get_cluster_usages
+
+
+class ParseCommandOutput(TestCase):
+    """Test the parsing of `sshare` usage records."""
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_account_usage_is_parsed(self, mock_call: Mock) -> None:
+        """Test account level usage values are returned in hours."""
+
+        mock_call.return_value = (
+            "CLUSTER: cluster1\n"
+            "root||cpu=0,billing=0,fs/disk=0\n"
+            " account1||cpu=500,mem=100,billing=600,fs/disk=0\n"
+            "  account1|user1|cpu=500,mem=100,billing=600,fs/disk=0\n"
+            " account2||billing=120\n"
+        )
+
+        usages = get_cluster_usages('cluster1')
+        self.assertDictEqual({'root': 0, 'account1': 10, 'account2': 2}, usages)
+        mock_call.assert_called_once()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_missing_billing_defaults_to_zero(self, mock_call: Mock) -> None:
+        """Test accounts without a billing value are assigned zero usage."""
+
+        mock_call.return_value = "account1||cpu=500,fs/disk=0"
+        self.assertDictEqual({'account1': 0}, get_cluster_usages('cluster1'))
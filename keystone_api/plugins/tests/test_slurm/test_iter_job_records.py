@@ -0,0 +1,112 @@
+"""Unit tests for the `iter_job_records` function."""
+
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from django.test import override_settings, TestCase
+from django.utils import timezone
+
+from plugins.slurm import iter_job_records, parse_memory, SlurmTransientError, subprocess_stream
+
+
+class ParseCommandOutput(TestCase):
+    """Test the parsing of `sacct` job records."""
+
+    @patch('plugins.slurm.subprocess_stream')
+    def test_records_are_parsed(self, mock_stream: Mock) -> None:
+        """Test job fields are converted to native types."""
+
+        mock_stream.return_value = iter([
+            '101|user1|account1|2024-01-01T12:00:00|3600|cpu=4,mem=8G,billing=4,node=1,gres/gpu=2',
+            '102|user2|account1|Unknown|60|cpu=1',
+            'malformed line',
+        ])
+
+        start = timezone.make_aware(datetime(2024, 1, 1))
+        records = list(iter_job_records('cluster1', start, start))
+
+        self.assertEqual(2, len(records))
+        self.assertDictEqual({
+            'job_id': '101',
+            'user': 'user1',
+            'account': 'account1',
+            'end': timezone.make_aware(datetime(2024, 1, 1, 12)),
+            'elapsed': 3600,
+            'billing': 4,
+            'cpu': 4,
+            'mem': 8192,
+            'gpu': 2,
+        }, records[0])
+
+        self.assertIsNone(records[1]['end'])
+        self.assertEqual(0, records[1]['billing'])
+
+    @patch('plugins.slurm.subprocess_stream')
+    def test_command_arguments(self, mock_stream: Mock) -> None:
+        """Test the cluster and time window are passed to `sacct`."""
+
+        mock_stream.return_value = iter([])
+        start = timezone.make_aware(datetime(2024, 1, 1))
+        end = timezone.make_aware(datetime(2024, 1, 2))
+        list(iter_job_records('cluster1', start, end))
+
+        args = mock_stream.call_args.args[0]
+        self.assertIn('--clusters=cluster1', args)
+        self.assertIn('--starttime=2024-01-01T00:00:00', args)
+        self.assertIn('--endtime=2024-01-02T00:00:00', args)
+
+
+class ParseMemory(TestCase):
+    """Test the parsing of memory values with unit suffixes."""
+
+    def test_units_are_converted(self) -> None:
+        """Test memory values are converted to megabytes."""
+
+        self.assertEqual(512, parse_memory('512M'))
+        self.assertEqual(8192, parse_memory('8G'))
+        self.assertEqual(2 * 1024 ** 2, parse_memory('2T'))
+        self.assertEqual(1, parse_memory('1024K'))
+        self.assertEqual(100, parse_memory('100'))
+
+    def test_invalid_values(self) -> None:
+        """Test missing and non-numeric values are treated as zero."""
+
+        self.assertEqual(0, parse_memory(''))
+        self.assertEqual(0, parse_memory('abcG'))
+
+
+class StreamOutput(TestCase):
+    """Test command output is streamed line by line."""
+
+    def test_lines_are_streamed(self) -> None:
+        """Test output lines are yielded lazily from the running process."""
+
+        lines = subprocess_stream(['printf', 'a\\nb\\n'])
+        self.assertEqual('a', next(lines))
+        self.assertEqual(['b'], list(lines))
+
+    def test_nonzero_exit_raises_error(self) -> None:
+        """Test a `RuntimeError` is raised once the failed command output is exhausted."""
+
+        with self.assertRaises(RuntimeError):
+            list(subprocess_stream(['sh', '-c', 'echo a; echo failure >&2; exit 1']))
+
+    def test_explicit_timeout(self) -> None:
+        """Test a `SlurmTransientError` is raised when the given timeout is exceeded."""
+
+        with self.assertRaisesRegex(SlurmTransientError, 'Timed out'):
+            list(subprocess_stream(['sleep', '5'], timeout=0.1))
+
+    @override_settings(SLURM_COMMAND_TIMEOUT=0.1)
+    def test_default_timeout(self) -> None:
+        """Test the timeout defaults to the `SLURM_COMMAND_TIMEOUT` setting."""
+
+        with self.assertRaisesRegex(SlurmTransientError, 'Timed out'):
+            list(subprocess_stream(['sleep', '5']))
+
+    def test_closed_iterator_kills_process(self) -> None:
+        """Test the process is killed when the iterator is closed before the output is exhausted."""
+
+        lines = subprocess_stream(['sh', '-c', 'echo a; exec sleep 5'], timeout=0)
+        self.assertEqual('a', next(lines))
+        lines.close()
@@ -0,0 +1,41 @@
+"""Unit tests for exporting Slurm Prometheus metrics across processes."""
+
+import os
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import TestCase
+
+INCREMENT_COUNTER = (
+    "import django; django.setup(); "
+    "from plugins import slurm; "
+    "slurm.cache_hits.labels(function='get_cluster_limit').inc(3); "
+    "slurm.circuit_opened.labels(cluster='cluster1').inc()"
+)
+
+
+class MultiprocessMetrics(TestCase):
+    """Test metrics recorded by a separate worker process are exported by the API."""
+
+    def setUp(self) -> None:
+        """Create a shared metrics directory."""
+
+        self.metrics_dir = TemporaryDirectory()
+        self.addCleanup(self.metrics_dir.cleanup)
+
+    def test_worker_metrics_are_exported(self) -> None:
+        """Test counters incremented in another process are reported by the metrics endpoint."""
+
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'main.settings', 'PROMETHEUS_MULTIPROC_DIR': self.metrics_dir.name}
+        subprocess.run([sys.executable, '-c', INCREMENT_COUNTER], cwd=settings.BASE_DIR, env=env, check=True)
+
+        with patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': self.metrics_dir.name}):
+            response = self.client.get('/metrics/')
+
+        content = response.content.decode()
+        self.assertEqual(200, response.status_code)
+        self.assertIn('keystone_slurm_cache_hits_total{function="get_cluster_limit"} 3.0', content)
+        self.assertIn('keystone_slurm_circuit_opened_total{cluster="cluster1"} 1.0', content)
@@ -0,0 +1,140 @@
+"""Unit tests for caching of read-only Slurm queries."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.test import override_settings, TestCase
+
+from plugins import slurm
+from tests.utils import LOCMEM_CACHES
+
+CACHE_TTL = {
+    'get_slurm_account_names': 60,
+    'get_slurm_account_users': 60,
+    'get_slurm_account_principal_investigator': 60,
+    'get_cluster_limit': 60,
+}
+
+
+@override_settings(SLURM_CACHE_TTL=CACHE_TTL, CACHES=LOCMEM_CACHES)
+class CachedQueries(TestCase):
+    """Test query results are cached and invalidated."""
+
+    def setUp(self) -> None:
+        """Clear any cached query results."""
+
+        caches[slurm.CACHE_ALIAS].clear()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_repeated_calls_are_cached(self, mock_call: Mock) -> None:
+        """Test repeated calls with the same arguments only execute a single command."""
+
+        mock_call.return_value = 'account1\naccount2'
+        self.assertEqual({'account1', 'account2'}, slurm.get_slurm_account_names('cluster1'))
+        self.assertEqual({'account1', 'account2'}, slurm.get_slurm_account_names('cluster1'))
+        mock_call.assert_called_once()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_arguments_are_cached_separately(self, mock_call: Mock) -> None:
+        """Test calls with different arguments are cached under different keys."""
+
+        mock_call.side_effect = ['user1', 'user2']
+        self.assertEqual({'user1'}, slurm.get_slurm_account_users('account1'))
+        self.assertEqual({'user2'}, slurm.get_slurm_account_users('account2'))
+        self.assertEqual({'user1'}, slurm.get_slurm_account_users(account_name='account1'))
+        self.assertEqual(2, mock_call.call_count)
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_set_limit_invalidates_cache(self, mock_call: Mock) -> None:
+        """Test setting a limit invalidates the cached limit for the same account and cluster."""
+
+        mock_call.side_effect = ['billing=600', 'billing=600', '', 'billing=1200']
+        self.assertEqual(10, slurm.get_cluster_limit('account1', 'cluster1'))
+        self.assertEqual(10, slurm.get_cluster_limit('account1', 'cluster2'))
+
+        slurm.set_cluster_limit('account1', 'cluster1', 20)
+        self.assertEqual(20, slurm.get_cluster_limit('account1', 'cluster1'))
+        self.assertEqual(10, slurm.get_cluster_limit('account1', 'cluster2'))
+        self.assertEqual(4, mock_call.call_count)
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_set_limits_invalidates_cache(self, mock_call: Mock) -> None:
+        """Test setting limits in bulk invalidates the cached limits for all updated accounts."""
+
+        mock_call.side_effect = ['billing=600', '', 'account1||billing=1200', 'billing=1200']
+        self.assertEqual(10, slurm.get_cluster_limit('account1', 'cluster1'))
+
+        slurm.set_cluster_limits('cluster1', {'account1': 20})
+        self.assertEqual(20, slurm.get_cluster_limit('account1', 'cluster1'))
+        self.assertEqual(4, mock_call.call_count)
+
+    @override_settings(SLURM_CACHE_TTL={})
+    @patch('plugins.slurm.subprocess_call')
+    def test_zero_ttl_disables_cache(self, mock_call: Mock) -> None:
+        """Test queries are not cached when no TTL is configured."""
+
+        mock_call.return_value = 'pi_user'
+        slurm.get_slurm_account_principal_investigator('account1')
+        slurm.get_slurm_account_principal_investigator('account1')
+        self.assertEqual(2, mock_call.call_count)
+
+    @patch('plugins.slurm.async_subprocess_call', new_callable=AsyncMock)
+    @patch('plugins.slurm.subprocess_call')
+    async def test_async_shares_cache(self, mock_call: Mock, mock_async_call: AsyncMock) -> None:
+        """Test async query variants share cache entries with their blocking counterparts."""
+
+        mock_call.return_value = 'pi_user'
+        await sync_to_async(slurm.get_slurm_account_principal_investigator)('account1')
+
+        self.assertEqual('pi_user', await slurm.aget_slurm_account_principal_investigator('account1'))
+        mock_async_call.assert_not_awaited()
+
+
+@override_settings(SLURM_CACHE_TTL=CACHE_TTL, CACHES=LOCMEM_CACHES)
+class CacheMetrics(TestCase):
+    """Test cache hits and misses are recorded as Prometheus metrics."""
+
+    def setUp(self) -> None:
+        """Clear any cached query results."""
+
+        caches[slurm.CACHE_ALIAS].clear()
+
+    @staticmethod
+    def get_count(counter, function: str) -> float:
+        """Return the current value of a labeled counter."""
+
+        return counter.labels(function=function)._value.get()
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_hits_and_misses_are_counted(self, mock_call: Mock) -> None:
+        """Test the first call is counted as a miss and later calls as hits."""
+
+        mock_call.return_value = 'account1'
+        hits = self.get_count(slurm.cache_hits, 'get_slurm_account_names')
+        misses = self.get_count(slurm.cache_misses, 'get_slurm_account_names')
+
+        slurm.get_slurm_account_names()
+        slurm.get_slurm_account_names()
+        slurm.get_slurm_account_names()
+
+        self.assertEqual(hits + 2, self.get_count(slurm.cache_hits, 'get_slurm_account_names'))
+        self.assertEqual(misses + 1, self.get_count(slurm.cache_misses, 'get_slurm_account_names'))
+
+
+@override_settings(SLURM_CACHE_TTL=CACHE_TTL)
+class UnavailableCache(TestCase):
+    """Test queries fall back to Slurm when the cache backend is unavailable."""
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'slurm': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:1/0'},
+    })
+    @patch('plugins.slurm.subprocess_call')
+    def test_errors_are_ignored(self, mock_call: Mock) -> None:
+        """Test cache connection errors are treated as a cache miss."""
+
+        mock_call.return_value = 'account1'
+        self.assertEqual({'account1'}, slurm.get_slurm_account_names())
+        self.assertEqual({'account1'}, slurm.get_slurm_account_names())
+        self.assertEqual(2, mock_call.call_count)
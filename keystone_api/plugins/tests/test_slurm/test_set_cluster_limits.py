@@ -0,0 +1,60 @@
+"""Unit tests for the `set_cluster_limits` function."""
+
+from unittest.mock import Mock, patch
+
+from django.test import TestCase
+
+from plugins.slurm import set_cluster_limits
+
+
+class BatchSubmission(TestCase):
+    """Test limits are submitted to Slurm in a single batch."""
+
+    @patch('plugins.slurm.get_cluster_limits')
+    @patch('plugins.slurm.subprocess_call')
+    def test_statements_grouped_by_limit(self, mock_call: Mock, mock_limits: Mock) -> None:
+        """Test accounts sharing a limit are combined into a single statement."""
+
+        mock_limits.return_value = {'account1': 10, 'account2': 10, 'account3': 20}
+        set_cluster_limits('cluster1', {'account1': 10, 'account2': 10, 'account3': 20})
+
+        mock_call.assert_called_once()
+        statements = mock_call.call_args.kwargs['stdin'].splitlines()
+        self.assertListEqual([
+            'modify account where account=account1,account2 cluster=cluster1 set GrpTresMins=billing=600',
+            'modify account where account=account3 cluster=cluster1 set GrpTresMins=billing=1200',
+        ], statements)
+
+    @patch('plugins.slurm.get_cluster_limits')
+    @patch('plugins.slurm.subprocess_call')
+    def test_statements_are_chunked(self, mock_call: Mock, mock_limits: Mock) -> None:
+        """Test large groups of accounts are split into multiple statements."""
+
+        limits = {f'account{i}': 10 for i in range(5)}
+        mock_limits.return_value = limits
+
+        set_cluster_limits('cluster1', limits, chunk_size=2)
+        statements = mock_call.call_args.kwargs['stdin'].splitlines()
+        self.assertEqual(3, len(statements))
+
+    @patch('plugins.slurm.subprocess_call')
+    def test_empty_limits(self, mock_call: Mock) -> None:
+        """Test no command is executed when there are no limits to set."""
+
+        self.assertDictEqual(dict(), set_cluster_limits('cluster1', dict()))
+        mock_call.assert_not_called()
+
+
+class ResultVerification(TestCase):
+    """Test per-account results are determined from the applied limits."""
+
+    @patch('plugins.slurm.get_cluster_limits')
+    @patch('plugins.slurm.subprocess_call')
+    def test_per_account_results(self, mock_call: Mock, mock_limits: Mock) -> None:
+        """Test accounts are marked as failed when the applied limit does not match."""
+
+        mock_call.side_effect = RuntimeError('sacctmgr error')
+        mock_limits.return_value = {'account1': 10, 'account2': 0}
+
+        results = set_cluster_limits('cluster1', {'account1': 10, 'account2': 20, 'account3': 30})
+        self.assertDictEqual({'account1': True, 'account2': False, 'account3': False}, results)
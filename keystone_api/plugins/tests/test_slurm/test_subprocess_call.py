@@ -0,0 +1,50 @@
+"""Unit tests for the `subprocess_call` function."""
+
+from django.test import override_settings, TestCase
+
+from plugins.slurm import subprocess_call, SlurmTransientError
+
+
+class CommandExecution(TestCase):
+    """Test the execution of shell commands."""
+
+    def test_stdout_is_returned(self) -> None:
+        """Test command output is returned as a stripped string."""
+
+        self.assertEqual('hello world', subprocess_call(['echo', 'hello world']))
+
+    def test_stdin_is_piped(self) -> None:
+        """Test input text is piped to the process."""
+
+        self.assertEqual('some input', subprocess_call(['cat'], stdin='some input\n'))
+
+    def test_nonzero_exit_raises_error(self) -> None:
+        """Test a `RuntimeError` is raised for commands with a nonzero exit code."""
+
+        with self.assertRaises(RuntimeError) as context:
+            subprocess_call(['false'])
+
+        self.assertNotIsInstance(context.exception, SlurmTransientError)
+
+    def test_connection_errors_are_transient(self) -> None:
+        """Test errors reporting an unreachable Slurm daemon raise a `SlurmTransientError`."""
+
+        with self.assertRaises(SlurmTransientError):
+            subprocess_call(['sh', '-c', 'echo "sacctmgr: error: Problem talking to the database" >&2; exit 1'])
+
+
+class CommandTimeout(TestCase):
+    """Test commands are killed after exceeding their timeout."""
+
+    def test_explicit_timeout(self) -> None:
+        """Test a `SlurmTransientError` is raised when the given timeout is exceeded."""
+
+        with self.assertRaisesRegex(SlurmTransientError, 'Timed out'):
+            subprocess_call(['sleep', '5'], timeout=0.1)
+
+    @override_settings(SLURM_COMMAND_TIMEOUT=0.1)
+    def test_default_timeout(self) -> None:
+        """Test the timeout defaults to the `SLURM_COMMAND_TIMEOUT` setting."""
+
+        with self.assertRaisesRegex(SlurmTransientError, 'Timed out'):
+            subprocess_call(['sleep', '5'])
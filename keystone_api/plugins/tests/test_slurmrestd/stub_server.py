@@ -0,0 +1,144 @@
+"""Local stub implementation of the `slurmrestd` API used for testing."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Serve account, association, and share records from the parent server's in-memory state."""
+
+    protocol_version = 'HTTP/1.1'  # Enable keep-alive connections
+
+    def log_message(self, *args) -> None:
+        """Silence request logging."""
+
+    def send_json(self, data: dict, status: int = 200) -> None:
+        """Send a JSON response."""
+
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def record_request(self) -> tuple[str, dict]:
+        """Record the incoming request on the server and return the parsed path and query."""
+
+        url = urlsplit(self.path)
+        self.server.requests.append({
+            'method': self.command,
+            'path': url.path,
+            'client': self.client_address,
+            'user': self.headers.get('X-SLURM-USER-NAME'),
+            'token': self.headers.get('X-SLURM-USER-TOKEN'),
+        })
+
+        return url.path, {key: values[0] for key, values in parse_qs(url.query).items()}
+
+    def do_GET(self) -> None:
+        """Return account, association, or share records."""
+
+        path, query = self.record_request()
+        if path == '/slurmdb/v0.0.40/associations':
+            associations = [
+                {
+                    'account': 'root', 'cluster': query['cluster'], 'user': '', 'parent_account': '',
+                    'max': {'tres': {'group': {'minutes': []}}}
+                },
+            ]
+            for account, minutes in self.server.limits.items():
+                if query.get('account', account) != account:
+                    continue
+
+                associations.append({
+                    'account': account, 'cluster': query['cluster'], 'user': '', 'parent_account': 'root',
+                    'max': {'tres': {'group': {'minutes': [{'type': 'billing', 'count': minutes}]}}}
+                })
+                associations.append({
+                    'account': account, 'cluster': query['cluster'], 'user': 'user1', 'parent_account': '',
+                    'max': {'tres': {'group': {'minutes': []}}}
+                })
+
+            self.send_json({'associations': associations, 'errors': []})
+
+        elif path == '/slurmdb/v0.0.40/accounts':
+            accounts = [{'name': 'root', 'description': 'default root account'}]
+            accounts.extend({'name': account, 'description': self.server.pis.get(account, '')} for account in self.server.limits)
+            self.send_json({'accounts': accounts, 'errors': []})
+
+        elif path == '/slurm/v0.0.40/shares':
+            shares = []
+            for account, minutes in self.server.usage.items():
+                if query.get('accounts', account) != account:
+                    continue
+
+                tres = {'usage': [{'name': 'cpu', 'value': 1}, {'name': 'billing', 'value': minutes}]}
+                shares.append({'name': account, 'cluster': self.server.cluster, 'type': ['ASSOCIATION'], 'tres': tres})
+                shares.append({'name': 'user1', 'cluster': self.server.cluster, 'type': ['USER'], 'tres': tres})
+
+            self.send_json({'shares': {'shares': shares}, 'errors': []})
+
+        else:
+            self.send_json({'errors': [{'error': 'Not found'}]}, status=404)
+
+    def do_POST(self) -> None:
+        """Update association limits for existing accounts."""
+
+        self.record_request()
+        data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        errors = []
+        for association in data['associations']:
+            if association['account'] not in self.server.limits:
+                errors.append({'error': f"Unknown account {association['account']}"})
+                continue
+
+            minutes = association['max']['tres']['group']['minutes']
+            self.server.limits[association['account']] = minutes[0]['count']
+
+        self.send_json({'errors': errors}, status=500 if errors else 200)
+
+
+class StubServer(ThreadingHTTPServer):
+    """A `slurmrestd` stub server running in a background thread."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        usage: dict[str, int],
+        pis: dict[str, str] | None = None,
+        cluster: str | None = 'cluster1'
+    ) -> None:
+        """Start the server on a random local port.
+
+        Args:
+            limits: Account limits in minutes
+            usage: Account usage in minutes
+            pis: Optional PI usernames stored in the account descriptions
+            cluster: The cluster reported in share records
+        """
+
+        super().__init__(('127.0.0.1', 0), StubRequestHandler)
+        self.limits = limits
+        self.usage = usage
+        self.pis = pis or dict()
+        self.cluster = cluster
+        self.requests = []
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the running server."""
+
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def stop(self) -> None:
+        """Shut down the server."""
+
+        self.shutdown()
+        self.server_close()
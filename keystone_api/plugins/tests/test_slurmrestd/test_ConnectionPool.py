@@ -0,0 +1,50 @@
+"""Unit tests for the `ConnectionPool` class."""
+
+import socket
+
+from django.test import TestCase
+
+from plugins.slurmrestd import ConnectionPool
+from .stub_server import StubServer
+
+ASSOCIATIONS_PATH = '/slurmdb/v0.0.40/associations?cluster=cluster1'
+
+
+class PooledRequests(TestCase):
+    """Test requests are issued over pooled connections."""
+
+    def setUp(self) -> None:
+        """Start a stub server."""
+
+        self.server = StubServer(limits={'account1': 60}, usage=dict())
+        self.pool = ConnectionPool(self.server.url, size=2)
+
+    def tearDown(self) -> None:
+        """Close pooled connections and stop the stub server."""
+
+        self.pool.close()
+        self.server.stop()
+
+    def test_connection_is_returned_to_pool(self) -> None:
+        """Test connections are retained after a successful request."""
+
+        status, _ = self.pool.request('GET', ASSOCIATIONS_PATH)
+        self.assertEqual(200, status)
+        self.assertEqual(1, self.pool._idle.qsize())
+
+    def test_stale_connection_is_replaced(self) -> None:
+        """Test requests are retried on a new connection when a pooled connection was closed remotely."""
+
+        self.pool.request('GET', ASSOCIATIONS_PATH)
+        self.pool._idle.queue[0].sock.shutdown(socket.SHUT_RDWR)
+
+        status, _ = self.pool.request('GET', ASSOCIATIONS_PATH)
+        self.assertEqual(200, status)
+        self.assertEqual(2, len({request['client'] for request in self.server.requests}))
+
+    def test_unreachable_host(self) -> None:
+        """Test a `RuntimeError` is raised when the host cannot be reached."""
+
+        pool = ConnectionPool('http://127.0.0.1:1', size=1, timeout=1)
+        with self.assertRaises(RuntimeError):
+            pool.request('GET', ASSOCIATIONS_PATH)
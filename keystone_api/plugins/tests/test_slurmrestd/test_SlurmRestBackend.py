@@ -0,0 +1,151 @@
+"""Unit tests for the `SlurmRestBackend` class."""
+
+from django.test import override_settings, TestCase
+
+from plugins.slurmrestd import SlurmRestBackend
+from .stub_server import StubServer
+
+
+class BaseStubTest(TestCase):
+    """Base class for running tests against a `slurmrestd` stub server."""
+
+    def setUp(self) -> None:
+        """Start a stub server and point the backend at it."""
+
+        self.server = StubServer(
+            limits={'account1': 600, 'account2': 1200},
+            usage={'account1': 120, 'account2': 300},
+            pis={'account1': 'pi1'}
+        )
+
+        self.settings_override = override_settings(
+            SLURMRESTD_URL=self.server.url,
+            SLURMRESTD_USER='keystone',
+            SLURMRESTD_TOKEN='secret',
+            SLURMRESTD_API_VERSION='v0.0.40'
+        )
+
+        self.settings_override.enable()
+        self.backend = SlurmRestBackend()
+
+    def tearDown(self) -> None:
+        """Stop the stub server."""
+
+        self.settings_override.disable()
+        self.server.stop()
+
+
+class ReadAssociations(BaseStubTest):
+    """Test account names, limits, and usage values are read from the API."""
+
+    def test_get_account_names(self) -> None:
+        """Test account names exclude the root account."""
+
+        self.assertEqual({'account1', 'account2'}, self.backend.get_account_names('cluster1'))
+
+    def test_get_limits(self) -> None:
+        """Test limits for all accounts are fetched with a single request and converted to hours."""
+
+        self.assertDictEqual({'root': 0, 'account1': 10, 'account2': 20}, self.backend.get_limits('cluster1'))
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_get_limit(self) -> None:
+        """Test the limit for a single account is returned in hours."""
+
+        self.assertEqual(20, self.backend.get_limit('account2', 'cluster1'))
+        self.assertEqual(0, self.backend.get_limit('account3', 'cluster1'))
+
+    def test_get_usages(self) -> None:
+        """Test usage for all accounts is fetched with a single request and user records are ignored."""
+
+        self.assertDictEqual({'account1': 2, 'account2': 5}, self.backend.get_usages('cluster1'))
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_get_usage(self) -> None:
+        """Test usage for a single account is returned in hours."""
+
+        self.assertEqual(5, self.backend.get_usage('account2', 'cluster1'))
+
+    def test_get_associations(self) -> None:
+        """Test users are grouped by account and the root account is ignored."""
+
+        self.assertDictEqual({'account1': {'user1'}, 'account2': {'user1'}}, self.backend.get_associations('cluster1'))
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_get_principal_investigators(self) -> None:
+        """Test PI usernames are read from account descriptions and empty descriptions are omitted."""
+
+        pis = self.backend.get_principal_investigators('cluster1')
+        self.assertDictEqual({'root': 'default root account', 'account1': 'pi1'}, pis)
+
+    def test_authentication_headers(self) -> None:
+        """Test requests include the configured authentication headers."""
+
+        self.backend.get_limits('cluster1')
+        self.assertEqual('keystone', self.server.requests[0]['user'])
+        self.assertEqual('secret', self.server.requests[0]['token'])
+
+
+class ShareScope(BaseStubTest):
+    """Test usage values are only returned for the cluster served by the API."""
+
+    def test_other_cluster_raises_error(self) -> None:
+        """Test a `RuntimeError` is raised when share records belong to a different cluster."""
+
+        with self.assertRaisesRegex(RuntimeError, 'placeholder'):
+            self.backend.get_usages('cluster2')
+
+    def test_unknown_cluster_requires_placeholder(self) -> None:
+        """Test share records without a cluster are only trusted when the URL is scoped per cluster."""
+
+        self.server.cluster = None
+        with self.assertRaises(RuntimeError):
+            self.backend.get_usages('cluster1')
+
+        with override_settings(SLURMRESTD_URL=self.server.url + '#{cluster}'):
+            self.assertDictEqual({'account1': 2, 'account2': 5}, self.backend.get_usages('cluster1'))
+
+
+class WriteLimits(BaseStubTest):
+    """Test limits are updated via the API."""
+
+    def test_set_limits(self) -> None:
+        """Test limits are written in a single request and verified with a single follow up request."""
+
+        results = self.backend.set_limits('cluster1', {'account1': 15, 'account2': 25})
+        self.assertDictEqual({'account1': True, 'account2': True}, results)
+        self.assertDictEqual({'account1': 900, 'account2': 1500}, self.server.limits)
+        self.assertEqual(['POST', 'GET'], [request['method'] for request in self.server.requests])
+
+    def test_set_limits_partial_failure(self) -> None:
+        """Test accounts rejected by the API are reported as failures."""
+
+        results = self.backend.set_limits('cluster1', {'account1': 15, 'account3': 25})
+        self.assertDictEqual({'account1': True, 'account3': False}, results)
+
+    def test_set_limit_failure(self) -> None:
+        """Test a `RuntimeError` is raised when a single limit cannot be updated."""
+
+        with self.assertRaises(RuntimeError):
+            self.backend.set_limit('account3', 'cluster1', 10)
+
+
+class ConnectionReuse(BaseStubTest):
+    """Test HTTP connections are pooled and reused between requests."""
+
+    def test_connections_are_reused(self) -> None:
+        """Test consecutive requests are sent over the same keep-alive connection."""
+
+        for _ in range(5):
+            self.backend.get_limits('cluster1')
+
+        self.assertEqual(1, len({request['client'] for request in self.server.requests}))
+
+    def test_cluster_placeholder(self) -> None:
+        """Test the cluster name is substituted into the API URL."""
+
+        with override_settings(SLURMRESTD_URL=self.server.url + '/{cluster}'):
+            with self.assertRaises(RuntimeError):  # The stub only serves paths without a cluster prefix
+                self.backend.get_limits('cluster1')
+
+        self.assertTrue(self.server.requests[0]['path'].startswith('/cluster1/slurmdb/'))
@@ -0,0 +1,139 @@
+"""Function tests for the `/allocations/usage-series/` endpoint."""
+
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.allocations.models import Cluster, UsageSnapshot
+from apps.users.models import Team, User
+from tests.utils import CustomAsserts
+
+
+class EndpointPermissions(APITestCase, CustomAsserts):
+    """Test endpoint user permissions.
+
+    Endpoint permissions are tested against the following matrix of HTTP responses.
+
+    | User Status                | GET | HEAD | OPTIONS | POST | PUT | PATCH | DELETE | TRACE |
+    |----------------------------|-----|------|---------|------|-----|-------|--------|-------|
+    | Unauthenticated User       | 403 | 403  | 403     | 403  | 403 | 403   | 403    | 403   |
+    | Authenticated User         | 200 | 200  | 200     | 405  | 405 | 405   | 405    | 405   |
+    """
+
+    endpoint = '/allocations/usage-series/'
+    fixtures = ['testing_common.yaml']
+
+    def setUp(self) -> None:
+        """Load user accounts from test fixtures."""
+
+        self.generic_user = User.objects.get(username='generic_user')
+
+    def test_unauthenticated_user_permissions(self) -> None:
+        """Test unauthenticated users cannot access resources."""
+
+        self.assert_http_responses(
+            self.endpoint,
+            get=status.HTTP_403_FORBIDDEN,
+            head=status.HTTP_403_FORBIDDEN,
+            options=status.HTTP_403_FORBIDDEN,
+            post=status.HTTP_403_FORBIDDEN,
+            put=status.HTTP_403_FORBIDDEN,
+            patch=status.HTTP_403_FORBIDDEN,
+            delete=status.HTTP_403_FORBIDDEN,
+            trace=status.HTTP_403_FORBIDDEN
+        )
+
+    def test_authenticated_user_permissions(self) -> None:
+        """Test general authenticated users have read-only permissions."""
+
+        self.client.force_authenticate(user=self.generic_user)
+        self.assert_http_responses(
+            self.endpoint,
+            get=status.HTTP_200_OK,
+            head=status.HTTP_200_OK,
+            options=status.HTTP_200_OK,
+            post=status.HTTP_405_METHOD_NOT_ALLOWED,
+            put=status.HTTP_405_METHOD_NOT_ALLOWED,
+            patch=status.HTTP_405_METHOD_NOT_ALLOWED,
+            delete=status.HTTP_405_METHOD_NOT_ALLOWED,
+            trace=status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+
+
+class ColumnarResponse(APITestCase):
+    """Test usage snapshots are returned as filtered columnar arrays."""
+
+    endpoint = '/allocations/usage-series/'
+    fixtures = ['testing_common.yaml']
+
+    def setUp(self) -> None:
+        """Create usage snapshots for two teams."""
+
+        self.team1 = Team.objects.get(name='Team 1')
+        self.team2 = Team.objects.get(name='Team 2')
+        self.cluster = Cluster.objects.first()
+        self.now = timezone.now()
+
+        for team in (self.team1, self.team2):
+            for hours, usage in ((3, 10), (2, 20), (1, 30)):
+                UsageSnapshot.objects.create(
+                    recorded=self.now - timedelta(hours=hours),
+                    team=team,
+                    cluster=self.cluster,
+                    total_usage=usage,
+                    current_usage=usage,
+                    historical_usage=0,
+                    limit=100
+                )
+
+    def test_columns_are_ordered_by_time(self) -> None:
+        """Test each column is an array of values ordered by the recorded time."""
+
+        self.client.force_authenticate(user=User.objects.get(username='member_1'))
+        response = self.client.get(self.endpoint)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual([10, 20, 30], response.json()['total_usage'])
+        self.assertEqual([self.team1.id] * 3, response.json()['team'])
+        self.assertEqual(3, len(response.json()['recorded']))
+
+    def test_time_range_filter(self) -> None:
+        """Test snapshots can be restricted to a time range."""
+
+        self.client.force_authenticate(user=User.objects.get(username='staff_user'))
+        start = (self.now - timedelta(hours=2, minutes=30)).isoformat()
+        response = self.client.get(self.endpoint, {'team': self.team2.id, 'recorded__gte': start})
+
+        self.assertEqual([20, 30], response.json()['total_usage'])
+
+    def test_default_time_range(self) -> None:
+        """Test snapshots are limited to a recent window when no lower bound is given."""
+
+        UsageSnapshot.objects.create(
+            recorded=self.now - timedelta(days=60),
+            team=self.team1,
+            cluster=self.cluster,
+            total_usage=5,
+            current_usage=5,
+            historical_usage=0,
+            limit=100
+        )
+
+        self.client.force_authenticate(user=User.objects.get(username='member_1'))
+        response = self.client.get(self.endpoint)
+        self.assertEqual([10, 20, 30], response.json()['total_usage'])
+
+        start = (self.now - timedelta(days=90)).isoformat()
+        response = self.client.get(self.endpoint, {'recorded__gte': start})
+        self.assertEqual([5, 10, 20, 30], response.json()['total_usage'])
+
+    def test_empty_series(self) -> None:
+        """Test all columns are returned as empty arrays when no snapshots match."""
+
+        self.client.force_authenticate(user=User.objects.get(username='generic_user'))
+        response = self.client.get(self.endpoint)
+
+        self.assertEqual([], response.json()['limit'])
+        self.assertEqual(7, len(response.json()))
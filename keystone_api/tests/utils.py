@@ -3,6 +3,12 @@
 from django.db import transaction
 from django.test import Client
 
+# In-memory replacements for the Redis backed caches configured in the application settings
+LOCMEM_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+    for alias in ('default', 'slurm', 'locks')
+}
+
 
 class CustomAsserts:
     """Custom assert methods for testing responses from REST endpoints."""